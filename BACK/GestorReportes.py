@@ -1,5 +1,123 @@
+import csv
+import io
+import time
+from datetime import datetime, timedelta
+
+from BD.cache import CacheTTL
 from BD.manager.ReporteManager import ReporteManager
 
+try:
+    import numpy as np
+except ImportError:  # sin numpy no hay analítica de período (ver obtener_analitica_periodo)
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional: sin pyarrow solo se exporta a CSV
+    pa = pq = None
+
+# Segundos que se reutilizan los KPIs del tablero antes de recalcularlos
+KPIS_TTL = 30
+_cache_kpis = CacheTTL(ttl=KPIS_TTL)
+
+# Estados que cuentan los KPIs (ReporteManager.obtener_kpis_dashboard), también
+# para la app async: 1 = Disponible (vehículo), 7 = En curso, 8 = Finalizado (alquiler)
+PARAMETROS_KPIS = {'id_disponible': 1, 'id_en_curso': 7, 'id_finalizado': 8}
+
+FORMATOS_EXPORTACION = ('csv', 'parquet')
+
+# Filas por lote al exportar (en Parquet, cada lote es un row group)
+TAMANIO_LOTE_EXPORTACION = 10_000
+
+SEGUNDOS_POR_DIA = 86_400
+
+
+def _esquema_parquet():
+    """Tipos de las columnas de ReporteManager.COLUMNAS_EXPORTACION en Parquet."""
+    tipos = {
+        'ID_ALQUILER': pa.int64(), 'FEC_INICIO': pa.timestamp('s'), 'FEC_FIN': pa.timestamp('s'),
+        'COSTO_TOTAL': pa.decimal128(10, 2), 'ESTADO': pa.string(),
+        'ID_CLIENTE': pa.int64(), 'CLIENTE': pa.string(), 'DNI': pa.string(), 'ID_EMPLEADO': pa.int64(),
+        'ID_VEHICULO': pa.int64(), 'PATENTE': pa.string(), 'MODELO': pa.string(),
+        'ANIO': pa.int32(), 'CATEGORIA': pa.string(),
+    }
+    return pa.schema([(col, tipos[col]) for col in ReporteManager.COLUMNAS_EXPORTACION])
+
+def _porcentaje(parte, total):
+    return round(parte / total * 100, 1) if total > 0 else 0.0
+
+
+def _barrer_intervalos(intervalos):
+    """
+    Barrido (sweep line) sobre [(id_vehiculo, tipo, desde, hasta)], tipo 'A'
+    alquiler o 'M' mantenimiento. Cada intervalo aporta un evento de entrada y
+    uno de salida; se ordenan todos por (vehículo, instante) una sola vez,
+    O(n log n), y se recorren llevando cuántos alquileres y mantenimientos
+    hay abiertos. Retorna {id_vehiculo: (segundos_ocupado, segundos_mantenimiento)}
+    contando la unión de los intervalos (los solapados no suman dos veces).
+    """
+    eventos = []
+    for id_vehiculo, tipo, desde, hasta in intervalos:
+        if hasta > desde:
+            eventos.append((id_vehiculo, desde, 1, tipo))
+            eventos.append((id_vehiculo, hasta, -1, tipo))
+    eventos.sort()
+
+    resultado = {}
+    actual = None
+    for id_vehiculo, instante, cambio, tipo in eventos:
+        if id_vehiculo != actual:
+            # Al terminar cada vehículo los contadores vuelven a cero
+            actual = id_vehiculo
+            anterior = instante
+            alquileres = mantenimientos = 0
+            ocupado = en_mantenimiento = 0
+
+        tramo = instante - anterior
+        if mantenimientos:
+            en_mantenimiento += tramo
+        elif alquileres:
+            ocupado += tramo
+
+        if tipo == 'A':
+            alquileres += cambio
+        else:
+            mantenimientos += cambio
+        anterior = instante
+        resultado[id_vehiculo] = (ocupado, en_mantenimiento)
+
+    return resultado
+
+
+def rango_mes_actual():
+    """[inicio, fin) del mes en curso, el período de los KPIs del tablero."""
+    hoy = datetime.now()
+    inicio_mes = datetime(hoy.year, hoy.month, 1)
+    if hoy.month == 12:
+        fin_mes = datetime(hoy.year + 1, 1, 1)
+    else:
+        fin_mes = datetime(hoy.year, hoy.month + 1, 1)
+    return inicio_mes, fin_mes
+
+
+def formatear_kpis(kpis):
+    """Respuesta del tablero a partir de ReporteManager.obtener_kpis_dashboard (también la usa la app async)."""
+    return {
+        'vehiculos_disponibles': kpis['VEHICULOS_DISPONIBLES'],
+        'alquileres_activos': kpis['ALQUILERES_ACTIVOS'],
+        'ingresos_mes': float(kpis['INGRESOS_MES']),
+        'ultimos': [{
+            'id': u['ID_ALQUILER'],
+            'vehiculo': u['VEHICULO'],
+            'cliente': u['CLIENTE'],
+            'fecha_inicio': u['FEC_INICIO'].strftime('%Y-%m-%d %H:%M'),
+            'estado': u['ESTADO'],
+            'costo_total': float(u['COSTO_TOTAL'])
+        } for u in kpis['ULTIMOS']]
+    }
+
+
 class GestorReportes:
     def __init__(self):
         # Instanciamos el manager de BD que creamos antes
@@ -14,6 +132,252 @@ class GestorReportes:
 
     def obtener_reporte_periodo(self, f_desde, f_hasta):
         return self.reporte_manager.alquileres_por_periodo(f_desde, f_hasta)
+
+    def iterar_reporte_periodo(self, f_desde, f_hasta):
+        """Mismo reporte, fila por fila, para respuestas en streaming."""
+        return self.reporte_manager.iterar_alquileres_por_periodo(f_desde, f_hasta)
     
+    # ----------------------------------------------------------
+    #   EXPORTACIÓN DEL HISTORIAL (CSV / PARQUET)
+    # ----------------------------------------------------------
+    def exportar(self, formato, desde, hasta, destino):
+        """
+        Escribe en destino (ruta o archivo binario) el historial de alquileres
+        iniciados en [desde, hasta) (hasta exclusivo). Lee por lotes con un cursor del servidor,
+        así que la memoria no depende del rango. Retorna un resumen con filas,
+        segundos y filas por segundo.
+        """
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato '{formato}' no soportado. Use: {', '.join(FORMATOS_EXPORTACION)}")
+        if formato == 'parquet' and pq is None:
+            raise ValueError("Para exportar a Parquet hace falta instalar pyarrow")
+
+        resumen = {'formato': formato, 'filas': 0}
+        inicio = time.perf_counter()
+        lotes = self.__contar_filas(
+            self.reporte_manager.iterar_exportacion_alquileres(desde, hasta, TAMANIO_LOTE_EXPORTACION),
+            resumen
+        )
+
+        if formato == 'csv':
+            self.__escribir_csv(lotes, destino)
+        else:
+            self.__escribir_parquet(lotes, destino)
+
+        resumen['segundos'] = round(time.perf_counter() - inicio, 3)
+        resumen['filas_por_segundo'] = round(resumen['filas'] / resumen['segundos']) if resumen['segundos'] else None
+        return resumen
+
+    def iterar_csv(self, desde, hasta):
+        """El historial en CSV, como fragmentos de texto (uno por lote) para streaming."""
+        lotes = self.reporte_manager.iterar_exportacion_alquileres(desde, hasta, TAMANIO_LOTE_EXPORTACION)
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+
+        escritor.writerow(ReporteManager.COLUMNAS_EXPORTACION)
+        for lote in lotes:
+            escritor.writerows(lote)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def __contar_filas(lotes, resumen):
+        for lote in lotes:
+            resumen['filas'] += len(lote)
+            yield lote
+
+    @staticmethod
+    def __escribir_csv(lotes, destino):
+        archivo = open(destino, 'w', newline='', encoding='utf-8') if isinstance(destino, str) \
+            else io.TextIOWrapper(destino, newline='', encoding='utf-8', write_through=True)
+        try:
+            escritor = csv.writer(archivo)
+            escritor.writerow(ReporteManager.COLUMNAS_EXPORTACION)
+            for lote in lotes:
+                escritor.writerows(lote)
+        finally:
+            if isinstance(destino, str):
+                archivo.close()
+            else:
+                archivo.detach()
+
+    @staticmethod
+    def __escribir_parquet(lotes, destino):
+        esquema = _esquema_parquet()
+        with pq.ParquetWriter(destino, esquema) as escritor:
+            for lote in lotes:
+                columnas = list(zip(*lote))
+                escritor.write_table(pa.Table.from_arrays(
+                    [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+                    schema=esquema
+                ))
+
+    # ----------------------------------------------------------
+    #   ANALÍTICA DEL PERÍODO (NUMPY)
+    # ----------------------------------------------------------
+    def obtener_analitica_periodo(self, desde, hasta, ventana=7, top_vehiculos=10):
+        """
+        Series ya agregadas del período (días desde..hasta, ambos incluidos),
+        calculadas con operaciones vectorizadas sobre columnas en vez de
+        recorrer filas: alquileres por día (con media móvil de 'ventana' días)
+        y por semana, ingresos por categoría, duración promedio y utilización
+        de la flota. Se cuentan los alquileres no cancelados que empiezan en el
+        período; la utilización considera también los que lo atraviesan.
+        """
+        if np is None:
+            raise RuntimeError("La analítica de período requiere numpy instalado")
+
+        inicio = datetime.combine(desde.date(), datetime.min.time())
+        fin = datetime.combine(hasta.date(), datetime.min.time()) + timedelta(days=1)
+        dias = (fin - inicio).days
+        segundos_periodo = dias * SEGUNDOS_POR_DIA
+
+        datos = self.reporte_manager.datos_analitica_periodo(inicio, fin)
+        id_vehiculo, id_categoria, seg_inicio, seg_fin, costo = datos['alquileres']
+        id_vehiculo = np.asarray(id_vehiculo, dtype=np.int64)
+        id_categoria = np.asarray(id_categoria, dtype=np.int64)
+        seg_inicio = np.asarray(seg_inicio, dtype=np.int64)
+        seg_fin = np.asarray(seg_fin, dtype=np.int64)
+        costo = np.asarray(costo, dtype=np.float64)
+
+        # Alquileres que empiezan en el período (los demás solo cuentan para utilización)
+        empiezan = seg_inicio >= 0
+        dia = seg_inicio[empiezan] // SEGUNDOS_POR_DIA
+        costo_empiezan = costo[empiezan]
+
+        # --- Serie diaria + media móvil (promedio de los últimos 'ventana' días) ---
+        por_dia = np.bincount(dia, minlength=dias)
+        acumulado = np.cumsum(por_dia)
+        hace_ventana = np.concatenate((np.zeros(min(ventana, dias), dtype=np.int64), acumulado[:-ventana]))
+        media_movil = (acumulado - hace_ventana) / np.minimum(np.arange(1, dias + 1), ventana)
+
+        fechas = np.arange(np.datetime64(inicio.date()), np.datetime64(fin.date()))
+
+        # --- Serie semanal (semanas de lunes a domingo) ---
+        desfase = inicio.weekday()
+        semana = (dia + desfase) // 7
+        semanas = (dias + desfase + 6) // 7
+        por_semana = np.bincount(semana, minlength=semanas)
+        ingresos_semana = np.bincount(semana, weights=costo_empiezan, minlength=semanas)
+        lunes = np.datetime64(inicio.date()) - desfase + 7 * np.arange(semanas)
+
+        # --- Ingresos por categoría ---
+        categorias, cat_indice = np.unique(id_categoria[empiezan], return_inverse=True)
+        cantidad_cat = np.bincount(cat_indice, minlength=len(categorias))
+        ingresos_cat = np.bincount(cat_indice, weights=costo_empiezan, minlength=len(categorias))
+        orden_cat = np.argsort(-ingresos_cat)
+
+        # --- Duración promedio (horas) ---
+        duraciones = (seg_fin[empiezan] - seg_inicio[empiezan]) / 3600
+        duracion_promedio = float(duraciones.mean()) if duraciones.size else 0.0
+
+        # --- Utilización por vehículo: horas ocupadas dentro del período ---
+        ocupado = np.clip(seg_fin, 0, segundos_periodo) - np.clip(seg_inicio, 0, segundos_periodo)
+        flota = np.asarray([v[0] for v in datos['vehiculos']], dtype=np.int64)
+        posicion = np.searchsorted(flota, id_vehiculo)
+        ocupado_vehiculo = np.bincount(posicion, weights=ocupado, minlength=len(flota))
+        utilizacion = np.minimum(ocupado_vehiculo / segundos_periodo * 100, 100)
+        top = np.argsort(-utilizacion, kind='stable')[:top_vehiculos]
+
+        return {
+            'desde': inicio.strftime('%Y-%m-%d'),
+            'hasta': (fin - timedelta(days=1)).strftime('%Y-%m-%d'),
+            'total_alquileres': int(empiezan.sum()),
+            'ingresos_totales': round(float(costo_empiezan.sum()), 2),
+            'duracion_promedio_horas': round(duracion_promedio, 1),
+            'utilizacion_flota': round(float(utilizacion.mean()), 1) if flota.size else 0.0,
+            'serie_diaria': [
+                {'fecha': str(f), 'cantidad': int(c), 'media_movil': round(float(m), 2)}
+                for f, c, m in zip(fechas, por_dia, media_movil)
+            ],
+            'serie_semanal': [
+                {'semana': str(l), 'cantidad': int(c), 'ingresos': round(float(i), 2)}
+                for l, c, i in zip(lunes, por_semana, ingresos_semana)
+            ],
+            'ingresos_por_categoria': [
+                {'categoria': datos['categorias'].get(int(categorias[i]), str(categorias[i])),
+                 'cantidad': int(cantidad_cat[i]), 'ingresos': round(float(ingresos_cat[i]), 2)}
+                for i in orden_cat
+            ],
+            'utilizacion_por_vehiculo': [
+                {'id': int(flota[i]),
+                 'vehiculo': f"{datos['vehiculos'][i][1]} - {datos['vehiculos'][i][2]}",
+                 'utilizacion': round(float(utilizacion[i]), 1)}
+                for i in top
+            ],
+        }
+
+    # ----------------------------------------------------------
+    #   UTILIZACIÓN DE LA FLOTA (BARRIDO DE INTERVALOS)
+    # ----------------------------------------------------------
+    def obtener_utilizacion(self, inicio, fin, id_categoria=None, top_vehiculos=None):
+        """
+        Horas ocupadas / horas disponibles por vehículo, por categoría y de la
+        flota en la ventana [inicio, fin). Las horas en mantenimiento no están
+        disponibles (y un alquiler que se pisa con un mantenimiento no suma
+        como ocupado). Se calcula con un único barrido ordenado de todos los
+        intervalos de ALQUILER y MANTENIMIENTO (ver _barrer_intervalos).
+        """
+        segundos_ventana = int((fin - inicio).total_seconds())
+        datos = self.reporte_manager.intervalos_utilizacion(inicio, fin)
+        barrido = _barrer_intervalos(datos['intervalos'])
+
+        por_vehiculo = []
+        por_categoria = {}
+        for id_vehiculo, patente, modelo, id_cat, categoria in datos['vehiculos']:
+            if id_categoria is not None and id_cat != id_categoria:
+                continue
+            ocupado, mantenimiento = barrido.get(id_vehiculo, (0, 0))
+            disponible = segundos_ventana - mantenimiento
+            por_vehiculo.append({
+                'id': id_vehiculo,
+                'vehiculo': f"{patente} - {modelo}",
+                'categoria': categoria,
+                'horas_ocupadas': round(ocupado / 3600, 1),
+                'horas_mantenimiento': round(mantenimiento / 3600, 1),
+                'horas_disponibles': round(disponible / 3600, 1),
+                'utilizacion': _porcentaje(ocupado, disponible),
+            })
+            totales = por_categoria.setdefault(categoria, [0, 0, 0])
+            totales[0] += 1
+            totales[1] += ocupado
+            totales[2] += disponible
+
+        por_vehiculo.sort(key=lambda v: v['utilizacion'], reverse=True)
+        ocupado_flota = sum(t[1] for t in por_categoria.values())
+        disponible_flota = sum(t[2] for t in por_categoria.values())
+
+        return {
+            'desde': inicio.strftime('%Y-%m-%d %H:%M'),
+            'hasta': fin.strftime('%Y-%m-%d %H:%M'),
+            'horas_ventana': round(segundos_ventana / 3600, 1),
+            'utilizacion_flota': _porcentaje(ocupado_flota, disponible_flota),
+            'por_categoria': sorted((
+                {'categoria': categoria, 'vehiculos': cantidad,
+                 'horas_ocupadas': round(ocupado / 3600, 1),
+                 'horas_disponibles': round(disponible / 3600, 1),
+                 'utilizacion': _porcentaje(ocupado, disponible)}
+                for categoria, (cantidad, ocupado, disponible) in por_categoria.items()
+            ), key=lambda c: c['utilizacion'], reverse=True),
+            'por_vehiculo': por_vehiculo[:top_vehiculos] if top_vehiculos else por_vehiculo,
+        }
+
     def obtener_historial_cliente(self, id_cliente):
-        return self.reporte_manager.historial_cliente_detallado(id_cliente)
\ No newline at end of file
+        return self.reporte_manager.historial_cliente_detallado(id_cliente)
+
+    def obtener_kpis_dashboard(self):
+        """KPIs del tablero (cacheados KPIS_TTL segundos; los alquileres los invalidan)."""
+        return _cache_kpis.obtener('dashboard', self.__calcular_kpis_dashboard)
+
+    @staticmethod
+    def invalidar_kpis():
+        _cache_kpis.invalidar()
+
+    def __calcular_kpis_dashboard(self):
+        inicio_mes, fin_mes = rango_mes_actual()
+        kpis = self.reporte_manager.obtener_kpis_dashboard(inicio_mes, fin_mes, **PARAMETROS_KPIS)
+        return formatear_kpis(kpis)
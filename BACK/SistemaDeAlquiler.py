@@ -1,7 +1,30 @@
+import functools
 from datetime import datetime, timedelta
 from .modelos import Cliente, Vehiculo, Alquiler, Empleado, Estado, Mantenimiento, Incidente, TipoIncidente, Ambito, Categoria, TipoMantenimiento, CaracteristicaVehiculo
+from .GestorReportes import GestorReportes
+from BD.db_conection import DBConnection
+from BD.indice_disponibilidad import indice_disponibilidad
 from BD.manager import CaracteristicaVehiculoManager, ClienteManager, VehiculoManager, AlquilerManager, EmpleadoManager, EstadoManager, MantenimientoManager, IncidenteManager, TipoIncidenteManager, AmbitoManager, CategoriaManager, TipoMantenimientoManager
 
+def transaccional(metodo):
+    """
+    Corre el método del servicio dentro de una unidad de trabajo: todos los
+    managers que llame comparten una conexión y se confirma una sola vez al
+    final. Si el método retorna un valor falso (falló la operación) o el commit
+    falla, no queda nada aplicado a medias.
+    """
+    @functools.wraps(metodo)
+    def envoltorio(*args, **kwargs):
+        with DBConnection.unidad_de_trabajo() as uow:
+            resultado = metodo(*args, **kwargs)
+            if not resultado:
+                DBConnection.marcar_rollback()
+        if uow.confirmada is False:
+            return None
+        return resultado
+    return envoltorio
+
+
 class SistemaDeAlquiler:
     def __init__(self):
         # Inicializamos todos los Managers (la capa de Persistencia)
@@ -18,6 +41,18 @@ class SistemaDeAlquiler:
         self.tipomantenimiento_manager = TipoMantenimientoManager.TipoMantenimientoManager()
         self.caracteristica_vehiculo_manager = CaracteristicaVehiculoManager.CaracteristicaVehiculoManager()
 
+    def precargar_referencias(self):
+        """Carga en memoria las tablas de referencia (estados, ámbitos, categorías y tipos)."""
+        self.ambito_manager.listar_todos()
+        self.estado_manager.listar_todos()
+        self.categoria_manager.listar_todos()
+        self.tipo_incidente_manager.listar_todos()
+        self.tipomantenimiento_manager.listar_todos()
+
+    def precargar_disponibilidad(self):
+        """Carga en memoria la ocupación de toda la flota (alquileres activos y mantenimientos)."""
+        indice_disponibilidad.precargar()
+
     ## ---------------------------------------------
     ## ABM DE CLIENTES Y EMPLEADOS (Ejemplo de delegación pura)
     ## ---------------------------------------------
@@ -46,6 +81,13 @@ class SistemaDeAlquiler:
     def listar_empleados(self):
         return self.empleado_manager.listar_todos()
 
+    # Listados de solo lectura para la API: filas ya serializables, sin objetos
+    def listar_clientes_proyeccion(self):
+        return self.cliente_manager.listar_proyeccion()
+
+    def listar_empleados_proyeccion(self):
+        return self.empleado_manager.listar_proyeccion()
+
     def modificar_cliente(self, id_cliente, data):
         """Lógica de Modificación: Obtener, modificar, delegar actualización."""
         cliente = self.obtener_cliente(id_cliente)
@@ -83,12 +125,21 @@ class SistemaDeAlquiler:
     ## GESTIÓN DE ALQUILERES (Lógica de Negocio Central)
     ## ---------------------------------------------
     
-    def validar_disponibilidad_vehiculo(self, id_vehiculo, fecha_inicio, fecha_fin):
+    def validar_disponibilidad_vehiculo(self, id_vehiculo, fecha_inicio, fecha_fin, vehiculo=None,
+                                        id_alquiler_excluido=None):
         """
         LÓGICA DE NEGOCIO: Verifica si un vehículo está disponible.
         (Esta lógica se movió del Manager a la capa de Servicio).
+        Si el llamador ya tiene el Vehiculo cargado lo pasa para no buscarlo de nuevo.
+        Al modificar un alquiler se pasa su ID para que no choque consigo mismo.
+        La consulta se resuelve con el índice en memoria, pero un conflicto del
+        índice es sólo un indicio (puede estar atrasado: una cancelación hecha
+        en otro worker, o una carga que corría al mismo tiempo) y se confirma
+        contra la BD antes de rechazar. AlquilerManager vuelve a verificar
+        contra la BD al guardar.
         """
-        vehiculo = self.vehiculo_manager.obtener_por_id(id_vehiculo)
+        if vehiculo is None:
+            vehiculo = self.vehiculo_manager.obtener_por_id(id_vehiculo)
         
 
         if not vehiculo:
@@ -101,14 +152,27 @@ class SistemaDeAlquiler:
             return False
 
         
-        esta_disponible = self.alquiler_manager.verificar_disponibilidad_sp(id_vehiculo, fecha_inicio, fecha_fin)
+        excluir = ('A', id_alquiler_excluido) if id_alquiler_excluido else None
+        conflicto = indice_disponibilidad.hay_conflicto(id_vehiculo, fecha_inicio, fecha_fin, excluir)
+
+        if conflicto:
+            conflicto = self.alquiler_manager.hay_superposicion(
+                id_vehiculo, fecha_inicio, fecha_fin, id_alquiler_excluido)
+            if conflicto is False:
+                # El índice tenía datos viejos de este vehículo: se relee
+                indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo)
+
+        if conflicto is None:
+            print(f"❌No se pudo verificar la disponibilidad del vehículo {id_vehiculo}.")
+            return False
 
-        if not esta_disponible:
-            print(f"❌El vehículo {id_vehiculo} ya tiene reservas en esas fechas (Validado por SP).")
+        if conflicto:
+            print(f"❌El vehículo {id_vehiculo} ya tiene reservas o mantenimientos en esas fechas.")
             return False
 
         return True
         
+    @transaccional
     def registrar_alquiler(self, id_vehiculo, id_cliente, id_empleado, fecha_inicio, fecha_fin):
         """Aplica lógica de negocio para crear y persistir un alquiler."""
         
@@ -134,7 +198,7 @@ class SistemaDeAlquiler:
             return None
         
         # 2. LÓGICA CENTRAL: Validar disponibilidad
-        if not self.validar_disponibilidad_vehiculo(id_vehiculo, fecha_inicio, fecha_fin):
+        if not self.validar_disponibilidad_vehiculo(id_vehiculo, fecha_inicio, fecha_fin, vehiculo):
             return None
         
         # 3. Calcular Costo y Crear objeto Alquiler
@@ -157,10 +221,75 @@ class SistemaDeAlquiler:
         alquiler_persistido = self.alquiler_manager.guardar(nuevo_alquiler)
         
         if alquiler_persistido:
+            DBConnection.al_confirmar(GestorReportes.invalidar_kpis)
             return alquiler_persistido
             
         return None
 
+    def registrar_alquileres_lote(self, solicitudes, todo_o_nada=False):
+        """
+        Registra varios alquileres de una vez (reservas corporativas).
+        'solicitudes' es una lista de dicts con id_vehiculo, id_cliente,
+        id_empleado, fecha_inicio y fecha_fin. Las dependencias se buscan una
+        sola vez por ID y la disponibilidad se valida en lote dentro de la
+        transacción de AlquilerManager.guardar_lote.
+        Retorna una lista alineada con 'solicitudes' de (alquiler, error):
+        uno de los dos es None.
+        """
+        ahora = datetime.now()
+
+        vehiculos = self.vehiculo_manager.obtener_por_ids(s['id_vehiculo'] for s in solicitudes)
+        clientes = {i: self.cliente_manager.obtener_por_id(i) for i in {s['id_cliente'] for s in solicitudes}}
+        empleados = {i: self.empleado_manager.obtener_por_id(i) for i in {s['id_empleado'] for s in solicitudes}}
+        estado_activo = self.estado_manager.obtener_por_id(6) # Estado 'Activo'
+
+        resultados = [None] * len(solicitudes)
+        pendientes = []  # (posición, alquiler)
+
+        for i, solicitud in enumerate(solicitudes):
+            fecha_inicio, fecha_fin = solicitud['fecha_inicio'], solicitud['fecha_fin']
+            vehiculo = vehiculos.get(solicitud['id_vehiculo'])
+            cliente = clientes.get(solicitud['id_cliente'])
+            empleado = empleados.get(solicitud['id_empleado'])
+
+            if fecha_inicio < (ahora - timedelta(minutes=1)):
+                resultados[i] = (None, "La fecha de inicio es anterior a la actual.")
+            elif fecha_fin <= fecha_inicio:
+                resultados[i] = (None, "La fecha de fin es anterior o igual a la de inicio.")
+            elif not (vehiculo and cliente and empleado):
+                resultados[i] = (None, "Vehículo, Cliente o Empleado no encontrados.")
+            elif vehiculo.estado.id_estado in [3]:
+                resultados[i] = (None, f"Vehículo en estado no operativo: {vehiculo.estado.estado}")
+            else:
+                alquiler = Alquiler.Alquiler(
+                    id_alquiler=None,
+                    vehiculo=vehiculo,
+                    empleado=empleado,
+                    cliente=cliente,
+                    fecha_inicio=fecha_inicio,
+                    fecha_fin=fecha_fin,
+                    costo_total=0,
+                    estado=estado_activo
+                )
+                alquiler.calcular_costo()
+                pendientes.append((i, alquiler))
+
+        if todo_o_nada and len(pendientes) < len(solicitudes):
+            return [r or (None, "Lote cancelado: otro alquiler del lote fue rechazado.") for r in resultados]
+
+        if pendientes:
+            motivos = self.alquiler_manager.guardar_lote([a for _, a in pendientes], todo_o_nada)
+            if motivos is None:
+                motivos = ["Error al guardar en la base de datos."] * len(pendientes)
+            for (i, alquiler), motivo in zip(pendientes, motivos):
+                resultados[i] = (None, motivo) if motivo else (alquiler, None)
+
+            if any(motivo is None for motivo in motivos):
+                DBConnection.al_confirmar(GestorReportes.invalidar_kpis)
+
+        return resultados
+
+    @transaccional
     def modificar_alquiler(self, id_alquiler, data):
         """
         Modifica un alquiler. Permite actualizaciones parciales (ej: solo cambiar vehículo).
@@ -205,7 +334,7 @@ class SistemaDeAlquiler:
         if recalcular_costo:
             alquiler.calcular_costo()
 
-        if not self.validar_disponibilidad_vehiculo(alquiler.vehiculo.id_vehiculo, alquiler.fecha_inicio, alquiler.fecha_fin):
+        if not self.validar_disponibilidad_vehiculo(alquiler.vehiculo.id_vehiculo, alquiler.fecha_inicio, alquiler.fecha_fin, alquiler.vehiculo, alquiler.id_alquiler):
             return None
 
         # 5. Guardar cambios
@@ -216,6 +345,7 @@ class SistemaDeAlquiler:
         return None
     
 
+    @transaccional
     def finalizar_alquiler(self, id_alquiler, km_final):
         """Proceso de finalización de un alquiler (Lógica de Negocio con transacción)."""
         alquiler = self.alquiler_manager.obtener_por_id(id_alquiler)
@@ -228,10 +358,12 @@ class SistemaDeAlquiler:
         alquiler_actualizado = self.alquiler_manager.finalizar_con_kilometraje(alquiler)
 
         if alquiler_actualizado:
+            DBConnection.al_confirmar(GestorReportes.invalidar_kpis)
             return True
         return False
     
     # el eliminar pasa a ser cancelar, con el estado 5
+    @transaccional
     def cancelar_alquiler(self, id_alquiler):
         """Lógica de Cancelación de un Alquiler (si está en estado 'Activo')."""
         alquiler = self.alquiler_manager.obtener_por_id(id_alquiler)
@@ -249,6 +381,7 @@ class SistemaDeAlquiler:
 
         if exito:
             self.vehiculo_manager.actualizar_estado(alquiler.vehiculo.id_vehiculo, 1)
+            DBConnection.al_confirmar(GestorReportes.invalidar_kpis)
             return True
             
         return False
@@ -276,6 +409,7 @@ class SistemaDeAlquiler:
 
     # --- ABM DE VEHÍCULOS ---
     
+    @transaccional
     def crear_vehiculo(self, modelo, anio, id_categoria, patente, kilometraje, costo_diario, id_estado):
         """
         Lógica de Alta: Crea la característica, luego el vehículo.
@@ -315,6 +449,7 @@ class SistemaDeAlquiler:
         # 4. Persistir el objeto Vehículo
         return self.vehiculo_manager.guardar(vehiculo)
     
+    @transaccional
     def modificar_vehiculo(self, id_vehiculo, data):
         """Edita tanto la tabla VEHICULO como la tabla DETALLE_VEHICULO."""
 
@@ -360,11 +495,34 @@ class SistemaDeAlquiler:
 
         return vehiculo
 
+    def buscar_disponibles(self, fecha_inicio, fecha_fin, categoria=None, max_costo=None,
+                           limite=50, after_id=None):
+        """
+        Vehículos libres para todo el rango [fecha_inicio, fecha_fin), ordenados
+        por costo diario. Retorna (vehiculos, siguiente_after_id).
+        """
+        if fecha_fin <= fecha_inicio:
+            print(f"❌Error: La fecha de fin {fecha_fin} es anterior o igual a la de inicio.")
+            return [], None
+
+        return self.vehiculo_manager.buscar_disponibles(
+            fecha_inicio, fecha_fin,
+            id_categoria=categoria,
+            max_costo=max_costo,
+            limite=limite,
+            after_id=after_id
+        )
+
     def listar_vehiculos(self):
         """Retorna la lista de objetos Vehiculo completos."""
         # Delega al Manager que obtiene los datos e intenta resolver las FKs en el Manager.
         return self.vehiculo_manager.listar_todos()
+
+    def listar_vehiculos_proyeccion(self):
+        """Vehículos como filas con los campos que muestra la API (sin objetos)."""
+        return self.vehiculo_manager.listar_proyeccion()
     
+    @transaccional
     def eliminar_vehiculo(self, id_vehiculo):
         """Lógica de Eliminación de un Vehículo (si no tiene alquileres activos)."""
         vehiculo = self.vehiculo_manager.obtener_por_id(id_vehiculo)
@@ -392,6 +550,7 @@ class SistemaDeAlquiler:
         """Retorna la lista de tipos de mantenimiento."""
         return self.tipomantenimiento_manager.listar_todos()
 
+    @transaccional
     def registrar_mantenimiento(self, id_vehiculo, id_tipo_mantenimiento, tipo,fec_inicio, fec_fin, costo, observacion):
         """Lógica de Negocio para registrar un mantenimiento."""
         vehiculo = self.vehiculo_manager.obtener_por_id(id_vehiculo)
@@ -422,6 +581,7 @@ class SistemaDeAlquiler:
 
         return None
     
+    @transaccional
     def finalizar_mantenimiento(self, id_mantenimiento):
         """Lógica de Negocio para finalizar un mantenimiento."""
         mantenimiento = self.mantenimiento_manager.obtener_por_id(id_mantenimiento)
@@ -439,6 +599,7 @@ class SistemaDeAlquiler:
 
         return False
 
+    @transaccional
     def eliminar_mantenimiento(self, id_mantenimiento, id_vehiculo):
         """Lógica de Negocio para eliminar un mantenimiento."""
         exito = self.mantenimiento_manager.eliminar_mantenimiento(id_mantenimiento)
@@ -456,6 +617,7 @@ class SistemaDeAlquiler:
         """Retorna la lista de mantenimientos para un vehículo dado."""
         return self.mantenimiento_manager.listar_por_vehiculo(id_vehiculo)
     
+    @transaccional
     def modificar_mantenimiento(self, id_mantenimiento, data):
         """Lógica de Negocio para modificar un mantenimiento."""
         mantenimiento = self.mantenimiento_manager.obtener_por_id(id_mantenimiento)
@@ -0,0 +1,205 @@
+"""
+Compresión de respuestas (gzip o brotli) como middleware WSGI.
+
+Se aplica sobre app.wsgi_app, así que cubre todas las rutas, incluidas las
+respuestas en streaming (reporte por período en NDJSON, exportación CSV):
+cada fragmento se comprime y se envía apenas llega, sin juntar la respuesta
+completa en memoria. No se comprimen:
+- respuestas que no son 2xx con cuerpo (304, 204, 206) ni los HEAD;
+- tipos que no ganan con la compresión (sólo JSON, NDJSON, MessagePack y texto);
+- respuestas más chicas que el umbral. En las de largo desconocido se junta
+  hasta el umbral antes de decidir, así un stream corto sale sin comprimir.
+
+Brotli se usa si el cliente lo acepta y el paquete está instalado
+(pip install brotli); si no, gzip. Las respuestas comprimidas llevan
+Vary: Accept-Encoding y su ETag pasa a ser débil (W/"..."), porque los bytes
+ya no son los de la representación original; con_etag compara con
+contains_weak, así que los GET condicionales siguen funcionando.
+
+Configuración por variables de entorno (ver desde_entorno):
+APP_COMPRESION=0 la desactiva (por ejemplo detrás de un proxy que ya comprime),
+APP_COMPRESION_UMBRAL (bytes, 1024), APP_COMPRESION_NIVEL (gzip 1-9, 6) y
+APP_COMPRESION_NIVEL_BROTLI (0-11, 4).
+"""
+import itertools
+import os
+import zlib
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPOS_COMPRIMIBLES = ('application/json', 'application/x-ndjson', 'application/msgpack', 'text/')
+
+
+class _CompresorGzip:
+    def __init__(self, nivel):
+        # wbits=31: formato gzip (cabecera y CRC), no deflate crudo
+        self._compresor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def comprimir(self, datos):
+        # Z_SYNC_FLUSH: lo comprimido sale ya, para que un stream no quede retenido
+        return self._compresor.compress(datos) + self._compresor.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self):
+        return self._compresor.flush(zlib.Z_FINISH)
+
+
+class _CompresorBrotli:
+    def __init__(self, nivel):
+        self._compresor = brotli.Compressor(quality=nivel)
+
+    def comprimir(self, datos):
+        return self._compresor.process(datos) + self._compresor.flush()
+
+    def terminar(self):
+        return self._compresor.finish()
+
+
+class CompresionRespuestas:
+    def __init__(self, app, umbral=1024, nivel_gzip=6, nivel_brotli=4):
+        self.app = app
+        self.umbral = umbral
+        self.nivel_gzip = nivel_gzip
+        self.nivel_brotli = nivel_brotli
+
+    @classmethod
+    def desde_entorno(cls, app):
+        """Envuelve 'app' según las variables APP_COMPRESION*; la retorna tal cual si está desactivada."""
+        if os.environ.get('APP_COMPRESION', '1') == '0':
+            return app
+        return cls(
+            app,
+            umbral=int(os.environ.get('APP_COMPRESION_UMBRAL', 1024)),
+            nivel_gzip=int(os.environ.get('APP_COMPRESION_NIVEL', 6)),
+            nivel_brotli=int(os.environ.get('APP_COMPRESION_NIVEL_BROTLI', 4)),
+        )
+
+    # ----------------------------------------------------------
+    #   NEGOCIACIÓN
+    # ----------------------------------------------------------
+    def _elegir_codificacion(self, environ):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        aceptadas = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING'))
+        if brotli is not None and aceptadas.quality('br') > 0:
+            return 'br'
+        if aceptadas.quality('gzip') > 0:
+            return 'gzip'
+        return None
+
+    def _nuevo_compresor(self, codificacion):
+        if codificacion == 'br':
+            return _CompresorBrotli(self.nivel_brotli)
+        return _CompresorGzip(self.nivel_gzip)
+
+    @staticmethod
+    def _comprimible(status, headers):
+        codigo = int(status.split(' ', 1)[0])
+        if not 200 <= codigo < 300 or codigo in (204, 206):
+            return False
+        tipo = ''
+        for nombre, valor in headers:
+            nombre = nombre.lower()
+            if nombre == 'content-encoding':
+                return False
+            if nombre == 'cache-control' and 'no-transform' in valor.lower():
+                return False
+            if nombre == 'content-type':
+                tipo = valor.lower()
+        return tipo.startswith(TIPOS_COMPRIMIBLES)
+
+    # ----------------------------------------------------------
+    #   WSGI
+    # ----------------------------------------------------------
+    def __call__(self, environ, start_response):
+        codificacion = self._elegir_codificacion(environ)
+        if codificacion is None:
+            return self.app(environ, start_response)
+
+        inicio = {}
+
+        def capturar_inicio(status, headers, exc_info=None):
+            # Se demora el start_response real hasta saber si se comprime
+            inicio['status'], inicio['headers'], inicio['exc_info'] = status, headers, exc_info
+            return self._sin_write
+
+        cuerpo = self.app(environ, capturar_inicio)
+        return self._responder(cuerpo, inicio, codificacion, start_response)
+
+    @staticmethod
+    def _sin_write(datos):
+        raise RuntimeError("CompresionRespuestas no admite el write() de start_response.")
+
+    def _responder(self, cuerpo, inicio, codificacion, start_response):
+        try:
+            fragmentos = iter(cuerpo)
+            if 'status' not in inicio:
+                # La aplicación llama a start_response recién al producir el primer fragmento
+                primero = next(fragmentos, None)
+                fragmentos = itertools.chain([] if primero is None else [primero], fragmentos)
+            status, headers, exc_info = inicio['status'], inicio['headers'], inicio['exc_info']
+
+            if not self._comprimible(status, headers):
+                start_response(status, headers, exc_info)
+                yield from fragmentos
+                return
+
+            largo = next((v for n, v in headers if n.lower() == 'content-length'), None)
+            if largo is not None and int(largo) < self.umbral:
+                start_response(status, headers, exc_info)
+                yield from fragmentos
+                return
+
+            # Largo desconocido (streaming): se junta hasta el umbral antes de decidir
+            pendientes = []
+            if largo is None:
+                juntados = 0
+                for fragmento in fragmentos:
+                    pendientes.append(fragmento)
+                    juntados += len(fragmento)
+                    if juntados >= self.umbral:
+                        break
+                else:
+                    cuerpo_completo = b''.join(pendientes)
+                    start_response(status, headers + [('Content-Length', str(len(cuerpo_completo)))], exc_info)
+                    yield cuerpo_completo
+                    return
+
+            start_response(status, self._headers_comprimidos(headers, codificacion), exc_info)
+            compresor = self._nuevo_compresor(codificacion)
+            for fragmento in pendientes:
+                salida = compresor.comprimir(fragmento)
+                if salida:
+                    yield salida
+            for fragmento in fragmentos:
+                salida = compresor.comprimir(fragmento)
+                if salida:
+                    yield salida
+            yield compresor.terminar()
+
+        finally:
+            if hasattr(cuerpo, 'close'):
+                cuerpo.close()
+
+    @staticmethod
+    def _headers_comprimidos(headers, codificacion):
+        nuevos = []
+        vary = []
+        for nombre, valor in headers:
+            clave = nombre.lower()
+            if clave == 'content-length':
+                continue
+            if clave == 'vary':
+                vary.append(valor)
+                continue
+            if clave == 'etag' and not valor.startswith('W/'):
+                valor = 'W/' + valor
+            nuevos.append((nombre, valor))
+        vary.append('Accept-Encoding')
+        nuevos.append(('Vary', ', '.join(vary)))
+        nuevos.append(('Content-Encoding', codificacion))
+        return nuevos
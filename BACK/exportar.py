@@ -0,0 +1,58 @@
+"""
+Exporta el historial de alquileres (con cliente, vehículo y estado) a CSV o
+Parquet para análisis fuera de línea.
+
+Uso (desde la raíz del proyecto):
+    python -m BACK.exportar --desde 2025-01-01 --hasta 2025-12-31 --salida historial.csv
+    python -m BACK.exportar --formato parquet --desde 2025-01-01 --hasta 2025-12-31 --salida historial.parquet
+
+Si --hasta es solo una fecha, se incluye ese día completo. Con --salida - el
+CSV se escribe por la salida estándar. Parquet requiere pyarrow.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from BACK.GestorReportes import FORMATOS_EXPORTACION, GestorReportes
+
+
+def _parsear_fecha(valor):
+    """'YYYY-MM-DD' o 'YYYY-MM-DD HH:MM'."""
+    try:
+        return datetime.strptime(valor.strip(), '%Y-%m-%d %H:%M')
+    except ValueError:
+        return datetime.strptime(valor.strip(), '%Y-%m-%d')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el historial de alquileres.")
+    parser.add_argument('--formato', choices=FORMATOS_EXPORTACION, default='csv')
+    parser.add_argument('--desde', required=True, help="fecha de inicio mínima (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument('--hasta', required=True,
+                        help="fecha de inicio máxima (YYYY-MM-DD, inclusive) o instante de corte (YYYY-MM-DD HH:MM, exclusivo)")
+    parser.add_argument('--salida', required=True, help="archivo destino, o - para la salida estándar")
+    args = parser.parse_args()
+
+    if args.salida == '-' and args.formato != 'csv':
+        parser.error("Solo el formato CSV se puede escribir por la salida estándar.")
+
+    try:
+        desde = _parsear_fecha(args.desde)
+        hasta = _parsear_fecha(args.hasta)
+    except ValueError as e:
+        parser.error(f"Error de formato de fecha: {e}")
+    if len(args.hasta.strip()) == len('YYYY-MM-DD'):
+        hasta += timedelta(days=1)
+
+    destino = sys.stdout.buffer if args.salida == '-' else args.salida
+    try:
+        resumen = GestorReportes().exportar(args.formato, desde, hasta, destino)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"{resumen['filas']:,} filas exportadas a {args.salida} en {resumen['segundos']:.1f}s "
+          f"({resumen['filas_por_segundo'] or 0:,} filas/s).", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
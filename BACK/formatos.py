@@ -0,0 +1,55 @@
+"""
+Formatos de entrada y salida de las rutas que comparten la app sync
+(BACK/routes.py) y la de lectura asíncrona (BACK/routes_async.py), para que
+las dos respondan igual. Está aparte porque importar cualquiera de las dos
+apps la arranca (pool, caches e índice de disponibilidad).
+"""
+from datetime import datetime, timedelta
+
+
+def parsear_fecha_hora(valor):
+    """Acepta 'YYYY-MM-DDTHH:MM' (como envían los formularios) o 'YYYY-MM-DD'."""
+    try:
+        return datetime.strptime(valor, '%Y-%m-%dT%H:%M')
+    except ValueError:
+        return datetime.strptime(valor, '%Y-%m-%d')
+
+
+def parsear_rango_dias(desde, hasta):
+    """
+    Filtro de fechas 'YYYY-MM-DD' del listado de alquileres: retorna
+    (desde, hasta) como datetime o None si no vinieron. 'hasta' incluye el
+    día completo, así que se devuelve como el comienzo del día siguiente.
+    """
+    inicio = datetime.strptime(desde, '%Y-%m-%d') if desde else None
+    fin = datetime.strptime(hasta, '%Y-%m-%d') + timedelta(days=1) if hasta else None
+    return inicio, fin
+
+
+def vehiculo_a_dict(v):
+    return {
+        'id': v.id_vehiculo,
+        'patente': v.patente,
+        'kilometraje': v.kilometraje,
+        'costo_diario': v.costo_diario,
+        'estado': v.estado.estado,
+        'modelo': v.caracteristica_vehiculo.modelo,
+        'anio': v.caracteristica_vehiculo.anio,
+        'categoria': v.caracteristica_vehiculo.categoria.categoria
+    }
+
+
+def formatear_fila_periodo(d):
+    """Fila del reporte por período (también en streaming), con fecha y hora."""
+    if d.get('FEC_INICIO'):
+        d['FEC_INICIO'] = d['FEC_INICIO'].strftime('%Y-%m-%d %H:%M')
+    if d.get('FEC_FIN'):
+        d['FEC_FIN'] = d['FEC_FIN'].strftime('%Y-%m-%d %H:%M')
+    return d
+
+
+def formatear_fila_historial(d):
+    """Fila del historial de un cliente, sólo con la fecha."""
+    if d['FEC_INICIO']: d['FEC_INICIO'] = d['FEC_INICIO'].strftime('%Y-%m-%d')
+    if d['FEC_FIN']: d['FEC_FIN'] = d['FEC_FIN'].strftime('%Y-%m-%d')
+    return d
@@ -3,6 +3,7 @@ from .Ambito import Ambito
 from .Vehiculo import Vehiculo
 
 class Alquiler:
+    __slots__ = ('id_alquiler', 'vehiculo', 'empleado', 'cliente', 'fecha_inicio', 'fecha_fin', 'costo_total', 'estado')
 
     def __init__(self, id_alquiler, vehiculo : Vehiculo, empleado, cliente, fecha_inicio, fecha_fin, costo_total, estado):
         self.id_alquiler = id_alquiler
@@ -1,6 +1,7 @@
 
 class Ambito:
-    
+    __slots__ = ('id_ambito', 'ambito')
+
     def __init__(self, id_ambito, ambito):
         self.id_ambito = id_ambito
         self.ambito = ambito
@@ -1,6 +1,7 @@
 
 class CaracteristicaVehiculo:
-    
+    __slots__ = ('id_caracteristica', 'modelo', 'anio', 'categoria')
+
     def __init__(self, id_caracteristica, modelo, anio, categoria):
         self.id_caracteristica = id_caracteristica
         self.modelo = modelo
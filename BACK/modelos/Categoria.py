@@ -1,5 +1,6 @@
 
 class Categoria:
+    __slots__ = ('id_categoria', 'categoria')
 
     def __init__(self, id_categoria, categoria):
         self.id_categoria = id_categoria
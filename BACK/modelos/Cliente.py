@@ -1,5 +1,6 @@
 class Cliente:
-    
+    __slots__ = ('id_cliente', 'nombre', 'dni', 'telefono', 'mail')
+
     def __init__(self, nombre, dni, telefono=None, mail=None, id_cliente=None):
         self.id_cliente = id_cliente 
         self.nombre = nombre
@@ -1,5 +1,6 @@
 
 class Empleado:
+    __slots__ = ('id_empleado', 'nombre', 'dni', 'mail')
 
     def __init__(self, id_empleado, nombre, dni, mail):
         self.id_empleado = id_empleado
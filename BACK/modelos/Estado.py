@@ -1,6 +1,7 @@
 
 class Estado:
-    
+    __slots__ = ('id_estado', 'ambito', 'estado')
+
     def __init__(self, id_estado, ambito, estado):
         self.id_estado = id_estado
         self.ambito = ambito
@@ -1,5 +1,6 @@
 
 class Incidente:
+    __slots__ = ('id_incidente', 'tipo_incidente', 'alquiler', 'fecha_incidente', 'descripcion')
 
     def __init__(self, id_incidente, tipo_incidente, alquiler, fecha_incidente, descripcion):
         self.id_incidente = id_incidente
@@ -1,5 +1,6 @@
 
 class Mantenimiento:
+    __slots__ = ('id_mantenimiento', 'vehiculo', 'tipo_mantenimiento', 'fecha_inicio', 'fecha_fin', 'costo', 'observacion')
 
     def __init__(self, id_mantenimiento, vehiculo, tipo_mantenimiento, fecha_inicio, fecha_fin, costo, observacion):
         self.id_mantenimiento = id_mantenimiento
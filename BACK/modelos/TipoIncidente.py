@@ -1,5 +1,6 @@
 
 class TipoIncidente:
+    __slots__ = ('id_tipo_incidente', 'tipo_incidente')
 
     def __init__(self, id_tipo_incidente, tipo_incidente):
         self.id_tipo_incidente = id_tipo_incidente
@@ -1,6 +1,7 @@
 
 class TipoMantenimiento:
-    
+    __slots__ = ('id_tipo_mantenimiento', 'tipo_mantenimiento')
+
     def __init__(self, id_tipo_mantenimiento, tipo_mantenimiento):
         self.id_tipo_mantenimiento = id_tipo_mantenimiento
         self.tipo_mantenimiento = tipo_mantenimiento
@@ -1,6 +1,7 @@
 
 
 class Vehiculo:
+    __slots__ = ('id_vehiculo', 'caracteristica_vehiculo', 'estado', 'patente', 'kilometraje', 'costo_diario')
 
     def __init__(self, id_vehiculo, caracteristica_vehiculo, estado, patente, kilometraje, costo_diario):
         self.id_vehiculo = id_vehiculo
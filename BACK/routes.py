@@ -1,26 +1,155 @@
-from flask import Flask, app, request, jsonify
+import atexit
+import functools
+import os
+
+from flask import Flask, Response, app, make_response, request, jsonify, stream_with_context
 
 from BACK.GestorReportes import GestorReportes 
+from BD import trazas
+from BD.cache import versiones_tablas
+from BD.db_conection import DBConnection
 from .SistemaDeAlquiler import SistemaDeAlquiler
-from datetime import datetime
-
+from .compresion import CompresionRespuestas
+from .formatos import (formatear_fila_historial, formatear_fila_periodo, parsear_fecha_hora,
+                       parsear_rango_dias, vehiculo_a_dict)
+from .serializacion import ProveedorRespuestas, formato_preferido
+from datetime import datetime, timedelta
+
+# Estado del proceso: cada worker del servidor de producción importa este
+# módulo por su cuenta (ver BACK/servidor.py), así que el pool, los caches y
+# el índice de disponibilidad nunca se comparten entre procesos.
 sistema = SistemaDeAlquiler()
 gestor_reportes = GestorReportes()
 app = Flask(__name__)
+# jsonify codifica con orjson si está instalado y negocia MessagePack (BACK/serializacion.py)
+app.json = ProveedorRespuestas(app)
+# gzip/brotli de las respuestas grandes, también en streaming (BACK/compresion.py)
+app.wsgi_app = CompresionRespuestas.desde_entorno(app.wsgi_app)
+
+
+def inicializar_proceso():
+    """Abre las conexiones mínimas del pool y precarga caches e índices del proceso."""
+    DBConnection().precalentar_pool()
+    sistema.precargar_referencias()
+    sistema.precargar_disponibilidad()
+
+
+inicializar_proceso()
+
+
+# Traza de BD de cada request: cantidad de conexiones y consultas y tiempo en
+# la BD (ver BD/trazas.py). Se registra antes que los hooks de conexión para
+# que su after_request corra último y cuente también el commit.
+@app.before_request
+def iniciar_traza_request():
+    trazas.iniciar_traza()
+
+@app.after_request
+def registrar_traza_request(respuesta):
+    traza = trazas.finalizar_traza()
+    if traza is not None:
+        respuesta.headers['X-DB-Queries'] = str(traza.consultas)
+        respuesta.headers['X-DB-Connections'] = str(traza.conexiones)
+        respuesta.headers['X-DB-Time-ms'] = f"{traza.tiempo_bd * 1000:.1f}"
+        if request.url_rule is not None:
+            trazas.metricas.registrar_request(f"{request.method} {request.url_rule.rule}", traza)
+    return respuesta
+
+
+# Cada request usa una única conexión del pool, sin importar cuántos
+# managers intervengan; se devuelve al pool al terminar el request.
+# Los requests que escriben corren en una unidad de trabajo: una conexión y
+# un único commit al final, o rollback si la respuesta es un error.
+METODOS_CON_ESCRITURA = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+@app.before_request
+def abrir_conexion_request():
+    DBConnection.iniciar_prestamo()
+    if request.method in METODOS_CON_ESCRITURA:
+        DBConnection.iniciar_transaccion()
+
+@app.after_request
+def cerrar_transaccion_request(respuesta):
+    if request.method in METODOS_CON_ESCRITURA and DBConnection.en_transaccion():
+        exito = respuesta.status_code < 400
+        confirmada = DBConnection.finalizar_transaccion(confirmar=exito)
+        if exito and confirmada is False:
+            respuesta = jsonify({"error": "No se pudieron guardar los cambios."})
+            respuesta.status_code = 500
+    return respuesta
+
+@app.teardown_request
+def liberar_conexion_request(exc):
+    # Si hubo una excepción sin respuesta, la transacción sigue abierta: se descarta
+    if DBConnection.en_transaccion():
+        DBConnection.finalizar_transaccion(confirmar=False)
+    DBConnection.finalizar_prestamo()
+
+# GET condicionales en los catálogos: el ETag sale de la versión de las tablas
+# de las que depende la respuesta (BD/cache.py, VersionesTablas). Si el
+# cliente ya tiene esa versión, se responde 304 sin ejecutar la vista ni
+# tocar la BD. La versión se lee antes de armar la respuesta, así una
+# escritura concurrente nunca queda tapada por un ETag nuevo con datos viejos.
+# Last-Modified es informativo: tiene resolución de un segundo, así que solo
+# se usa If-None-Match para decidir el 304. JSON y MessagePack son
+# representaciones distintas de la misma versión, así que llevan ETags distintos.
+# Las versiones son por proceso: con varios workers (APP_WORKERS > 1, lo fija
+# BACK/servidor.py) una escritura atendida por un worker no cambia el ETag de
+# los demás, que seguirían respondiendo 304 con datos viejos. Por eso ahí
+# sólo llevan ETag las tablas de referencia (con max_age), que la aplicación
+# no modifica; las demás rutas responden siempre completas.
+_VARIOS_WORKERS = int(os.environ.get('APP_WORKERS', 1)) > 1
+
+def con_etag(*tablas, max_age=0):
+    def decorador(vista):
+        if _VARIOS_WORKERS and not max_age:
+            return vista
+
+        @functools.wraps(vista)
+        def envoltura(*args, **kwargs):
+            etag = versiones_tablas.etag(*tablas)
+            formato = formato_preferido()
+            if formato != 'json':
+                etag = f"{etag}-{formato}"
+
+            if request.if_none_match.contains_weak(etag):
+                respuesta = Response(status=304)
+                respuesta.vary.add('Accept')
+            else:
+                respuesta = make_response(vista(*args, **kwargs))
+                if respuesta.status_code != 200:
+                    return respuesta
+                respuesta.last_modified = versiones_tablas.ultima_modificacion(*tablas)
+
+            respuesta.set_etag(etag)
+            if max_age:
+                respuesta.cache_control.public = True
+                respuesta.cache_control.max_age = max_age
+            else:
+                # Se puede guardar, pero hay que revalidar siempre con el ETag
+                respuesta.cache_control.no_cache = True
+            return respuesta
+        return envoltura
+    return decorador
+
+# Las tablas de referencia no se modifican desde la aplicación
+MAX_AGE_REFERENCIAS = 300
+
+@app.route('/api/_pool', methods=['GET'])
+def estadisticas_pool():
+    """Endpoint de monitoreo del pool de conexiones."""
+    return jsonify(DBConnection.estadisticas_pool())
+
+@app.route('/api/_metrics', methods=['GET'])
+def metricas_requests():
+    """Latencias p50/p95/p99 y consultas por ruta, y las últimas consultas lentas."""
+    return jsonify({**trazas.metricas.resumen(), 'pool': DBConnection.estadisticas_pool()})
 
 @app.route('/api/clientes', methods=['GET'])
 def listar_clientes():
     """Endpoint para obtener la lista de clientes."""
-    clientes = sistema.listar_clientes() # Llama a la capa de servicio
-    
-    clientes_data = [{
-        'id': c.id_cliente, 
-        'nombre': c.nombre, 
-        'dni': c.dni, 
-        'mail': c.mail
-    } for c in clientes]
-    
-    return jsonify(clientes_data) # Devuelve la lista en formato JSON
+    # Las filas ya vienen con los campos de la respuesta (id, nombre, dni, mail)
+    return jsonify(sistema.listar_clientes_proyeccion())
 
 @app.route('/api/clientes', methods=['POST'])
 def alta_cliente():
@@ -67,6 +196,7 @@ def eliminar_cliente(id_cliente):
     return jsonify({"error": "No se pudo eliminar el cliente."}), 400
 
 @app.route('/api/categoria', methods=['GET'])
+@con_etag('CATEGORIA', max_age=MAX_AGE_REFERENCIAS)
 def listar_categorias():
     """Endpoint para obtener las categorías de vehículos (tabla lookup)."""
     # Suponiendo que tienes un Manager llamado CategoriaManager
@@ -80,6 +210,7 @@ def listar_categorias():
     return jsonify(categorias_data)
 
 @app.route('/api/estados/<int:ambito_id>', methods=['GET'])
+@con_etag('ESTADO', max_age=MAX_AGE_REFERENCIAS)
 def listar_estados_por_ambito(ambito_id):
     """Endpoint para obtener los estados válidos para Vehiculos (Ámbito 1)."""
     # El ID de Ámbito para Vehículos es 1 (según tu script SQL)
@@ -93,26 +224,52 @@ def listar_estados_por_ambito(ambito_id):
     return jsonify(estados_data)
 
 @app.route('/api/vehiculos', methods=['GET'])
+@con_etag('VEHICULO', 'DETALLE_VEHICULO', 'ESTADO', 'CATEGORIA')
 def detalle_vehiculo():
     """Endpoint para obtener el detalle de un vehículo por su ID."""
-    vehiculos = sistema.listar_vehiculos()
+    # Filas con id, patente, kilometraje, costo_diario, estado, modelo, anio y categoria
+    vehiculos_data = sistema.listar_vehiculos_proyeccion()
     
-    if not vehiculos:
+    if not vehiculos_data:
         return jsonify({"error": "Vehículo no encontrado."}), 404
     
-    vehiculos_data = [{
-        'id': v.id_vehiculo,
-        'patente': v.patente,
-        'kilometraje': v.kilometraje,
-        'costo_diario': v.costo_diario,
-        'estado': v.estado.estado, # Obtenemos el nombre del estado
-        'modelo': v.caracteristica_vehiculo.modelo, # Obtenemos el modelo
-        'anio': v.caracteristica_vehiculo.anio,
-        'categoria': v.caracteristica_vehiculo.categoria.categoria # Obtenemos la categoría
-    } for v in vehiculos]
-    
     return jsonify(vehiculos_data)
 
+@app.route('/api/vehiculos/disponibles', methods=['GET'])
+def buscar_vehiculos_disponibles():
+    """
+    Vehículos libres en un rango. Parámetros (query string): desde y hasta
+    (obligatorios), categoria, max_costo, limit y after_id.
+    Ordenados por costo diario; el cursor de la página siguiente va en X-Siguiente.
+    """
+    args = request.args
+    if not args.get('desde') or not args.get('hasta'):
+        return jsonify({"error": "Los parámetros 'desde' y 'hasta' son obligatorios."}), 400
+
+    try:
+        desde = parsear_fecha_hora(args['desde'])
+        hasta = parsear_fecha_hora(args['hasta'])
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    if hasta <= desde:
+        return jsonify({"error": "'hasta' debe ser posterior a 'desde'."}), 400
+
+    limite = max(1, min(args.get('limit', 50, type=int), 500))
+
+    vehiculos, siguiente = sistema.buscar_disponibles(
+        desde, hasta,
+        categoria=args.get('categoria', type=int),
+        max_costo=args.get('max_costo', type=float),
+        limite=limite,
+        after_id=args.get('after_id', type=int)
+    )
+
+    respuesta = jsonify([vehiculo_a_dict(v) for v in vehiculos])
+    if siguiente is not None:
+        respuesta.headers['X-Siguiente'] = str(siguiente)
+    return respuesta
+
 #obtener vehiculo por id
 @app.route('/api/vehiculos/<int:id_vehiculo>', methods=['GET'])
 def obtener_vehiculo_por_id(id_vehiculo):
@@ -122,18 +279,7 @@ def obtener_vehiculo_por_id(id_vehiculo):
     if not vehiculo:
         return jsonify({"error": "Vehículo no encontrado."}), 404
     
-    vehiculo_data = {
-        'id': vehiculo.id_vehiculo,
-        'patente': vehiculo.patente,
-        'kilometraje': vehiculo.kilometraje,
-        'costo_diario': vehiculo.costo_diario,
-        'estado': vehiculo.estado.estado, # Obtenemos el nombre del estado
-        'modelo': vehiculo.caracteristica_vehiculo.modelo, # Obtenemos el modelo
-        'anio': vehiculo.caracteristica_vehiculo.anio,
-        'categoria': vehiculo.caracteristica_vehiculo.categoria.categoria # Obtenemos la categoría
-    }
-    
-    return jsonify(vehiculo_data)
+    return jsonify(vehiculo_a_dict(vehiculo))
 
 @app.route('/api/vehiculos', methods=['POST'])
 def alta_vehiculo():
@@ -195,17 +341,8 @@ def actualizar_vehiculo(id_vehiculo):
 @app.route('/api/empleados', methods=['GET'])
 def listar_empleados():
     """Endpoint para obtener la lista de empleados."""
-    empleados = sistema.listar_empleados()
-    
-    # Se retornan todos los datos para la tabla de gestión
-    empleados_data = [{
-        'id': e.id_empleado, 
-        'nombre': e.nombre,
-        'dni': e.dni,
-        'mail': e.mail
-    } for e in empleados]
-    
-    return jsonify(empleados_data)
+    # Se retornan todos los datos para la tabla de gestión (id, nombre, dni, mail)
+    return jsonify(sistema.listar_empleados_proyeccion())
 
 @app.route('/api/empleados', methods=['POST'])
 def alta_empleado():
@@ -256,24 +393,36 @@ def eliminar_empleado(id_empleado):
 # --- RUTAS DE ALQUILERES ---
 @app.route('/api/alquileres', methods=['GET'])
 def listar_alquileres():
-    alquileres = sistema.alquiler_manager.listar_todos()
-    
-    # Serializamos con datos anidados para mostrar nombres en la tabla
-    data = [{
-        'id': a.id_alquiler,
-        'vehiculo': a.vehiculo.patente + ' - ' + a.vehiculo.caracteristica_vehiculo.modelo,
-        'vehiculo_id': a.vehiculo.id_vehiculo, # <--- Nuevo
-        'cliente': a.cliente.nombre,
-        'cliente_id': a.cliente.id_cliente,    # <--- Nuevo
-        'empleado': a.empleado.nombre,
-        'empleado_id': a.empleado.id_empleado, # <--- Nuevo
-        'fecha_inicio': a.fecha_inicio.strftime('%Y-%m-%d %H:%M'),
-        'fecha_fin': a.fecha_fin.strftime('%Y-%m-%d %H:%M'),
-        'costo_total': a.costo_total,
-        'estado': a.estado.estado
-    } for a in alquileres]
-    
-    return jsonify(data)
+    """
+    Lista paginada de alquileres. Parámetros opcionales (query string):
+    limit, after_id, estado, desde, hasta (YYYY-MM-DD), vehiculo_id, cliente_id
+    y orden (id_desc, id_asc, fecha_desc, fecha_asc).
+    El cursor de la página siguiente se devuelve en el header X-Siguiente.
+    """
+    args = request.args
+    limite = max(1, min(args.get('limit', 50, type=int), 500))
+
+    try:
+        desde, hasta = parsear_rango_dias(args.get('desde'), args.get('hasta'))
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    # Filas ya serializadas por la consulta (nombres, modelo y fechas formateadas)
+    data, siguiente = sistema.alquiler_manager.listar_paginado_proyeccion(
+        limite=limite,
+        after_id=args.get('after_id', type=int),
+        id_estado=args.get('estado', type=int),
+        desde=desde,
+        hasta=hasta,
+        id_vehiculo=args.get('vehiculo_id', type=int),
+        id_cliente=args.get('cliente_id', type=int),
+        orden=args.get('orden', 'id_desc')
+    )
+
+    respuesta = jsonify(data)
+    if siguiente is not None:
+        respuesta.headers['X-Siguiente'] = str(siguiente)
+    return respuesta
 
 @app.route('/api/alquileres', methods=['POST'])
 def crear_alquiler():
@@ -303,6 +452,47 @@ def crear_alquiler():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
+# Máximo de alquileres por pedido en /api/alquileres/batch
+MAX_ALQUILERES_POR_LOTE = 200
+
+@app.route('/api/alquileres/batch', methods=['POST'])
+def crear_alquileres_lote():
+    """
+    Alta de varios alquileres en una sola transacción. Recibe
+    {"alquileres": [{vehiculoId, clienteId, empleadoId, fechaInicio, fechaFin}, ...],
+     "todoONada": false} y responde el resultado de cada ítem, en el mismo orden.
+    """
+    data = request.get_json() or {}
+    items = data.get('alquileres') or []
+
+    if not items:
+        return jsonify({"error": "No se recibieron alquileres."}), 400
+    if len(items) > MAX_ALQUILERES_POR_LOTE:
+        return jsonify({"error": f"Se admiten hasta {MAX_ALQUILERES_POR_LOTE} alquileres por lote."}), 400
+
+    try:
+        solicitudes = [{
+            'id_vehiculo': int(item['vehiculoId']),
+            'id_cliente': int(item['clienteId']),
+            'id_empleado': int(item['empleadoId']),
+            'fecha_inicio': datetime.strptime(item['fechaInicio'], '%Y-%m-%dT%H:%M'),
+            'fecha_fin': datetime.strptime(item['fechaFin'], '%Y-%m-%dT%H:%M'),
+        } for item in items]
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Datos de alquiler inválidos: {str(e)}"}), 400
+
+    resultados = sistema.registrar_alquileres_lote(solicitudes, bool(data.get('todoONada', False)))
+
+    data_resultados = [
+        {"indice": i, "ok": True, "id": alquiler.id_alquiler, "costo_total": alquiler.costo_total}
+        if alquiler else
+        {"indice": i, "ok": False, "error": error}
+        for i, (alquiler, error) in enumerate(resultados)
+    ]
+    creados = sum(1 for r in data_resultados if r['ok'])
+
+    return jsonify({"creados": creados, "resultados": data_resultados}), 201 if creados else 400
+
 #Cancelar el alquiler
 @app.route('/api/alquileres/cancelar/<int:id_alquiler>', methods=['PUT'])
 def cancelar_alquiler(id_alquiler):
@@ -443,6 +633,7 @@ def crear_mantenimiento():
         return jsonify({"error": str(e)}), 500
     
 @app.route('/api/tipos_mantenimiento', methods=['GET'])
+@con_etag('TIPO_MANTENIMIENTO', max_age=MAX_AGE_REFERENCIAS)
 def listar_tipos_mantenimiento():
     tipos = sistema.listar_tipo_mantenimientos()
     
@@ -499,6 +690,11 @@ def modificar_mantenimiento(id_mantenimiento):
 
 # --- RUTAS DE REPORTES  ---
 
+@app.route('/api/dashboard/kpis', methods=['GET'])
+def dashboard_kpis():
+    """KPIs del tablero de control, agregados en SQL y cacheados unos segundos."""
+    return jsonify(gestor_reportes.obtener_kpis_dashboard())
+
 @app.route('/api/reportes/ranking', methods=['GET'])
 def reporte_ranking():
     data = gestor_reportes.obtener_ranking_vehiculos()
@@ -512,29 +708,150 @@ def reporte_facturacion(anio):
 @app.route('/api/reportes/cliente/<int:id_cliente>', methods=['GET'])
 def reporte_cliente(id_cliente):
     data = gestor_reportes.obtener_historial_cliente(id_cliente)
-    for d in data:
-        if d['FEC_INICIO']: d['FEC_INICIO'] = d['FEC_INICIO'].strftime('%Y-%m-%d')
-        if d['FEC_FIN']: d['FEC_FIN'] = d['FEC_FIN'].strftime('%Y-%m-%d')
-    return jsonify(data)
+    return jsonify([formatear_fila_historial(d) for d in data])
+
+# Filas que se juntan antes de escribir cada fragmento de una respuesta en streaming
+FILAS_POR_FRAGMENTO = 500
+
+def _stream_filas(filas, formato):
+    """
+    Serializa las filas a medida que llegan: NDJSON (una fila por línea) o un
+    array JSON escrito por partes. Nunca tiene más de un fragmento en memoria.
+    """
+    ndjson = formato == 'ndjson'
+    separador = '\n' if ndjson else ','
+    if not ndjson:
+        yield '['
+
+    fragmento = []
+    primero = True
+    for fila in filas:
+        fragmento.append(app.json.dumps(formatear_fila_periodo(fila)))
+        if len(fragmento) >= FILAS_POR_FRAGMENTO:
+            yield _unir_fragmento(fragmento, separador, primero, ndjson)
+            fragmento = []
+            primero = False
+
+    if fragmento:
+        yield _unir_fragmento(fragmento, separador, primero, ndjson)
+
+    if not ndjson:
+        yield ']'
+
+def _unir_fragmento(fragmento, separador, primero, ndjson):
+    if ndjson:
+        return separador.join(fragmento) + '\n'
+    return ('' if primero else separador) + separador.join(fragmento)
 
 @app.route('/api/reportes/periodo', methods=['POST'])
 def reporte_periodo():
-    """Reporte de alquileres filtrados por rango de fechas."""
+    """
+    Reporte de alquileres filtrados por rango de fechas. Con "formato": "ndjson"
+    o "json-stream" en el body, la respuesta se genera en streaming desde un
+    cursor del servidor (para rangos grandes); si no, se arma completa como antes.
+    """
     body = request.get_json()
     
     if not body or 'desde' not in body or 'hasta' not in body:
         return jsonify({"error": "Faltan parámetros 'desde' y 'hasta'"}), 400
 
+    formato = body.get('formato')
+    if formato in ('ndjson', 'json-stream'):
+        filas = gestor_reportes.iterar_reporte_periodo(body['desde'], body['hasta'])
+        mimetype = 'application/x-ndjson' if formato == 'ndjson' else 'application/json'
+        return Response(stream_with_context(_stream_filas(filas, formato)), mimetype=mimetype)
+
     data = gestor_reportes.obtener_reporte_periodo(body['desde'], body['hasta'])
     
-    for d in data: 
-        if d.get('FEC_INICIO'): 
-            d['FEC_INICIO'] = d['FEC_INICIO'].strftime('%Y-%m-%d %H:%M')
-        if d.get('FEC_FIN'): 
-            d['FEC_FIN'] = d['FEC_FIN'].strftime('%Y-%m-%d %H:%M')
-        
+    for d in data:
+        formatear_fila_periodo(d)
+
+    return jsonify(data)
+
+@app.route('/api/reportes/analitica', methods=['GET'])
+def reporte_analitica():
+    """
+    Series agregadas de un período (desde y hasta, obligatorios): alquileres
+    por día y semana, media móvil ('ventana' días, 7 por defecto), ingresos por
+    categoría, duración promedio y utilización de la flota ('top' vehículos).
+    """
+    args = request.args
+    if not args.get('desde') or not args.get('hasta'):
+        return jsonify({"error": "Los parámetros 'desde' y 'hasta' son obligatorios."}), 400
+
+    try:
+        desde = parsear_fecha_hora(args['desde'])
+        hasta = parsear_fecha_hora(args['hasta'])
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    if hasta < desde:
+        return jsonify({"error": "'hasta' no puede ser anterior a 'desde'."}), 400
+
+    ventana = max(1, min(args.get('ventana', 7, type=int), 90))
+    top = max(1, min(args.get('top', 10, type=int), 100))
+
+    try:
+        data = gestor_reportes.obtener_analitica_periodo(desde, hasta, ventana, top)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 503
+
+    return jsonify(data)
+
+@app.route('/api/reportes/utilizacion', methods=['GET'])
+def reporte_utilizacion():
+    """
+    Utilización de la flota en una ventana: horas ocupadas / horas disponibles
+    (descontando mantenimientos) por vehículo, por categoría y total.
+    Parámetros: desde y hasta (obligatorios; si 'hasta' es solo fecha, incluye
+    ese día), categoria y top (cantidad de vehículos a devolver, 50 por defecto).
+    """
+    args = request.args
+    if not args.get('desde') or not args.get('hasta'):
+        return jsonify({"error": "Los parámetros 'desde' y 'hasta' son obligatorios."}), 400
+
+    try:
+        desde = parsear_fecha_hora(args['desde'])
+        hasta = parsear_fecha_hora(args['hasta'])
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    if 'T' not in args['hasta']:
+        hasta += timedelta(days=1)
+    if hasta <= desde:
+        return jsonify({"error": "'hasta' debe ser posterior a 'desde'."}), 400
+
+    top = max(1, min(args.get('top', 50, type=int), 1000))
+    data = gestor_reportes.obtener_utilizacion(desde, hasta, args.get('categoria', type=int), top)
     return jsonify(data)
 
+@app.route('/api/reportes/exportar', methods=['GET'])
+def exportar_historial():
+    """
+    Historial de alquileres en CSV (parámetros desde y hasta; si 'hasta' es
+    solo fecha, incluye ese día), generado en streaming. Para Parquet o
+    exportaciones grandes usar python -m BACK.exportar.
+    """
+    args = request.args
+    if not args.get('desde') or not args.get('hasta'):
+        return jsonify({"error": "Los parámetros 'desde' y 'hasta' son obligatorios."}), 400
+
+    try:
+        desde = parsear_fecha_hora(args['desde'])
+        hasta = parsear_fecha_hora(args['hasta'])
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    nombre = f"alquileres_{desde:%Y%m%d}_{hasta:%Y%m%d}.csv"
+    if 'T' not in args['hasta']:
+        hasta += timedelta(days=1)
+
+    return Response(
+        stream_with_context(gestor_reportes.iterar_csv(desde, hasta)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{nombre}"'}
+    )
+
 @app.route('/api/alquileres/<int:id_alquiler>', methods=['GET'])
 def obtener_alquiler(id_alquiler):
     alq = sistema.alquiler_manager.obtener_por_id(id_alquiler)
@@ -570,6 +887,7 @@ def listar_incidentes_alquiler(id_alquiler):
 
 # 3. Listar Tipos de Incidente (Lookup)
 @app.route('/api/tipos_incidente', methods=['GET'])
+@con_etag('TIPO_INCIDENTE', max_age=MAX_AGE_REFERENCIAS)
 def listar_tipos_incidente():
     tipos = sistema.listar_tipos_incidentes()
     data = [{'id': t.id_tipo_incidente, 'nombre': t.tipo_incidente} for t in tipos]
@@ -607,9 +925,13 @@ def eliminar_incidente(id_incidente):
 
 
 
+# Servidor de desarrollo (un proceso, con recarga automática si APP_DEBUG=1).
+# Para producción: python -m BACK.servidor
 if __name__ == '__main__':
+    atexit.register(DBConnection.cerrar_pool)
     app.run(
-        host='127.0.0.1',
-        port=5000,
-        debug=True
+        host=os.environ.get('APP_HOST', '127.0.0.1'),
+        port=int(os.environ.get('APP_PORT', 5000)),
+        debug=os.environ.get('APP_DEBUG', '1') == '1',
+        threaded=True
     )
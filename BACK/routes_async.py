@@ -0,0 +1,220 @@
+"""
+API de lectura asíncrona: las consultas de lectura de BACK/routes.py servidas
+con Quart y los managers de BD/manager_async (aiomysql). Mientras un request
+espera a MySQL, el event loop atiende a los demás, así un solo proceso
+sostiene muchos más requests de lectura concurrentes que un worker con hilos.
+
+Las respuestas son las mismas que las de la app sync (mismas rutas, campos y
+formato, orjson y MessagePack incluidos). Diferencias:
+- Sólo lectura: altas, bajas y modificaciones siguen en la app sync
+  (BACK/routes.py o BACK/servidor.py), que es la que mantiene el índice de
+  disponibilidad, el resumen de facturación y las versiones de las tablas.
+- Sin ETags: las versiones de las tablas son por proceso y este proceso no
+  escribe, así que nunca se enteraría de un cambio. Los KPIs del tablero se
+  cachean KPIS_TTL segundos como en la app sync.
+- Sin compresión ni trazas de BD por request (son middleware WSGI de la app
+  sync): comprimir queda a cargo del proxy delante del servidor.
+
+Uso (desde la raíz del proyecto, requiere `pip install aiomysql quart hypercorn`):
+    python -m BACK.routes_async                                        # desarrollo
+    hypercorn --workers 2 --bind 0.0.0.0:5001 BACK.routes_async:app   # producción
+Un proxy delante reparte: GET de las rutas de aquí a este servidor, el resto a la app sync.
+"""
+import os
+
+try:
+    from quart import Quart, jsonify, request
+except ImportError:
+    raise SystemExit("Falta quart: pip install aiomysql quart hypercorn (la app sync es python -m BACK.routes)")
+
+from BACK.GestorReportes import KPIS_TTL, PARAMETROS_KPIS, formatear_kpis, rango_mes_actual
+from BD.cache import CacheTTL
+from BD.db_conection_async import AsyncDBConnection
+from BD.manager_async.AlquilerManager import AlquilerManager
+from BD.manager_async.ReporteManager import ReporteManager
+from BD.manager_async.VehiculoManager import VehiculoManager
+from .SistemaDeAlquiler import SistemaDeAlquiler
+from .formatos import (formatear_fila_historial, formatear_fila_periodo, parsear_fecha_hora,
+                       parsear_rango_dias, vehiculo_a_dict)
+from .serializacion import ProveedorRespuestas
+
+
+class _ProveedorRespuestasQuart(ProveedorRespuestas):
+    peticion = request
+
+
+# Estado del proceso, como en la app sync: cada worker de hypercorn tiene su
+# pool, sus caches de referencia y su cache de KPIs.
+sistema = SistemaDeAlquiler()
+alquiler_manager = AlquilerManager()
+vehiculo_manager = VehiculoManager()
+reporte_manager = ReporteManager()
+_cache_kpis = CacheTTL(ttl=KPIS_TTL)
+
+app = Quart(__name__)
+app.json = _ProveedorRespuestasQuart(app)
+
+
+@app.before_serving
+async def inicializar_proceso():
+    # Estados y categorías los resuelven los mapeos sync desde el cache de
+    # referencias: se cargan una vez aquí para no consultar la BD (bloqueando
+    # el event loop) durante un request.
+    sistema.precargar_referencias()
+    await AsyncDBConnection().precalentar_pool()
+
+@app.after_serving
+async def cerrar_proceso():
+    await AsyncDBConnection.cerrar_pool()
+
+
+@app.route('/api/_pool', methods=['GET'])
+async def estadisticas_pool():
+    """Endpoint de monitoreo del pool de conexiones async."""
+    return jsonify(AsyncDBConnection.estadisticas_pool())
+
+@app.route('/api/categoria', methods=['GET'])
+async def listar_categorias():
+    """Categorías de vehículos (desde el cache de referencias, sin consultar la BD)."""
+    return jsonify([{
+        'id': c.id_categoria,
+        'nombre': c.categoria
+    } for c in sistema.listar_categorias()])
+
+# --- RUTAS DE VEHÍCULOS ---
+@app.route('/api/vehiculos', methods=['GET'])
+async def listar_vehiculos():
+    vehiculos_data = await vehiculo_manager.listar_proyeccion()
+
+    if not vehiculos_data:
+        return jsonify({"error": "Vehículo no encontrado."}), 404
+
+    return jsonify(vehiculos_data)
+
+@app.route('/api/vehiculos/disponibles', methods=['GET'])
+async def buscar_vehiculos_disponibles():
+    """Mismos parámetros que la app sync: desde, hasta, categoria, max_costo, limit y after_id."""
+    args = request.args
+    if not args.get('desde') or not args.get('hasta'):
+        return jsonify({"error": "Los parámetros 'desde' y 'hasta' son obligatorios."}), 400
+
+    try:
+        desde = parsear_fecha_hora(args['desde'])
+        hasta = parsear_fecha_hora(args['hasta'])
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    if hasta <= desde:
+        return jsonify({"error": "'hasta' debe ser posterior a 'desde'."}), 400
+
+    limite = max(1, min(args.get('limit', 50, type=int), 500))
+
+    vehiculos, siguiente = await vehiculo_manager.buscar_disponibles(
+        desde, hasta,
+        id_categoria=args.get('categoria', type=int),
+        max_costo=args.get('max_costo', type=float),
+        limite=limite,
+        after_id=args.get('after_id', type=int)
+    )
+
+    respuesta = jsonify([vehiculo_a_dict(v) for v in vehiculos])
+    if siguiente is not None:
+        respuesta.headers['X-Siguiente'] = str(siguiente)
+    return respuesta
+
+@app.route('/api/vehiculos/<int:id_vehiculo>', methods=['GET'])
+async def obtener_vehiculo_por_id(id_vehiculo):
+    vehiculo = await vehiculo_manager.obtener_por_id(id_vehiculo)
+
+    if not vehiculo:
+        return jsonify({"error": "Vehículo no encontrado."}), 404
+
+    return jsonify(vehiculo_a_dict(vehiculo))
+
+# --- RUTAS DE ALQUILERES ---
+@app.route('/api/alquileres', methods=['GET'])
+async def listar_alquileres():
+    """Mismos filtros y cursor (header X-Siguiente) que la app sync."""
+    args = request.args
+    limite = max(1, min(args.get('limit', 50, type=int), 500))
+
+    try:
+        desde, hasta = parsear_rango_dias(args.get('desde'), args.get('hasta'))
+    except ValueError as e:
+        return jsonify({"error": f"Error de formato de fecha: {str(e)}"}), 400
+
+    data, siguiente = await alquiler_manager.listar_paginado_proyeccion(
+        limite=limite,
+        after_id=args.get('after_id', type=int),
+        id_estado=args.get('estado', type=int),
+        desde=desde,
+        hasta=hasta,
+        id_vehiculo=args.get('vehiculo_id', type=int),
+        id_cliente=args.get('cliente_id', type=int),
+        orden=args.get('orden', 'id_desc')
+    )
+
+    respuesta = jsonify(data)
+    if siguiente is not None:
+        respuesta.headers['X-Siguiente'] = str(siguiente)
+    return respuesta
+
+@app.route('/api/alquileres/<int:id_alquiler>', methods=['GET'])
+async def obtener_alquiler_por_id(id_alquiler):
+    alquiler = await alquiler_manager.obtener_por_id(id_alquiler)
+
+    if not alquiler:
+        return jsonify({"error": "Alquiler no encontrado"}), 404
+
+    return jsonify({
+        'id': alquiler.id_alquiler,
+        'vehiculo': f"{alquiler.vehiculo.patente} - {alquiler.vehiculo.caracteristica_vehiculo.modelo}",
+        'cliente': alquiler.cliente.nombre,
+        'empleado': alquiler.empleado.nombre,
+        'fecha_inicio': alquiler.fecha_inicio.strftime('%Y-%m-%d %H:%M'),
+        'fecha_fin': alquiler.fecha_fin.strftime('%Y-%m-%d %H:%M'),
+        'costo_total': alquiler.costo_total,
+        'estado': alquiler.estado.estado
+    })
+
+# --- RUTAS DE REPORTES ---
+async def _calcular_kpis_dashboard():
+    inicio_mes, fin_mes = rango_mes_actual()
+    kpis = await reporte_manager.obtener_kpis_dashboard(inicio_mes, fin_mes, **PARAMETROS_KPIS)
+    return formatear_kpis(kpis)
+
+@app.route('/api/dashboard/kpis', methods=['GET'])
+async def dashboard_kpis():
+    return jsonify(await _cache_kpis.obtener_async('dashboard', _calcular_kpis_dashboard))
+
+@app.route('/api/reportes/ranking', methods=['GET'])
+async def reporte_ranking():
+    return jsonify(await reporte_manager.obtener_ranking_vehiculos())
+
+@app.route('/api/reportes/facturacion/<int:anio>', methods=['GET'])
+async def reporte_facturacion(anio):
+    return jsonify(await reporte_manager.obtener_facturacion_mensual(anio))
+
+@app.route('/api/reportes/cliente/<int:id_cliente>', methods=['GET'])
+async def reporte_cliente(id_cliente):
+    data = await reporte_manager.historial_cliente_detallado(id_cliente)
+    return jsonify([formatear_fila_historial(d) for d in data])
+
+@app.route('/api/reportes/periodo', methods=['POST'])
+async def reporte_periodo():
+    """Reporte de alquileres por rango de fechas (la versión en streaming queda en la app sync)."""
+    body = await request.get_json()
+
+    if not body or 'desde' not in body or 'hasta' not in body:
+        return jsonify({"error": "Faltan parámetros 'desde' y 'hasta'"}), 400
+
+    data = await reporte_manager.alquileres_por_periodo(body['desde'], body['hasta'])
+    return jsonify([formatear_fila_periodo(d) for d in data])
+
+
+if __name__ == '__main__':
+    app.run(
+        host=os.environ.get('APP_HOST', '127.0.0.1'),
+        port=int(os.environ.get('APP_PORT', 5001)),
+        debug=os.environ.get('APP_DEBUG', '1') == '1'
+    )
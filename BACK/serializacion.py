@@ -0,0 +1,86 @@
+"""
+Codificación de las respuestas de la API.
+
+ProveedorRespuestas reemplaza al proveedor JSON de Flask (app.json), así que
+lo usan jsonify y app.json.dumps sin cambiar las rutas:
+- Con orjson instalado codifica con orjson (varias veces más rápido en listas
+  grandes); si no, usa el json de la biblioteca estándar como Flask.
+- Decimal y fechas salen igual que con el proveedor por defecto de Flask
+  (Decimal como texto, datetime/date como fecha HTTP), para no cambiar el
+  formato que ya consume el frontend.
+- Si el cliente pide Accept: application/msgpack y msgpack está instalado,
+  jsonify responde en MessagePack (para consumidores masivos).
+
+Ambas dependencias son opcionales: pip install orjson msgpack
+"""
+import decimal
+import uuid
+from datetime import date
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MIMETYPE_MSGPACK = 'application/msgpack'
+
+
+def _convertir(obj):
+    """Tipos que ni orjson ni msgpack codifican como Flask: mismo resultado que DefaultJSONProvider."""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def formato_preferido(peticion=request):
+    """'msgpack' si el request lo prefiere a JSON y se puede generar; si no, 'json'."""
+    if msgpack is None:
+        return 'json'
+    mejor = peticion.accept_mimetypes.best_match(['application/json', MIMETYPE_MSGPACK])
+    return 'msgpack' if mejor == MIMETYPE_MSGPACK else 'json'
+
+
+def empaquetar(obj):
+    """Codifica en MessagePack con las mismas conversiones que la respuesta JSON."""
+    return msgpack.packb(obj, default=_convertir, datetime=False)
+
+
+class ProveedorRespuestas(DefaultJSONProvider):
+    # Sin ordenar claves: con orjson el orden es el de los dicts de las vistas
+    sort_keys = False
+
+    # Request del que se lee el Accept; la app Quart (BACK/routes_async.py) pasa el suyo
+    peticion = request
+
+    _OPCIONES_ORJSON = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_convertir, option=self._OPCIONES_ORJSON).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+
+        if formato_preferido(self.peticion) == 'msgpack':
+            respuesta = self._app.response_class(empaquetar(obj), mimetype=MIMETYPE_MSGPACK)
+        elif orjson is not None:
+            cuerpo = orjson.dumps(obj, default=_convertir, option=self._OPCIONES_ORJSON)
+            respuesta = self._app.response_class(cuerpo, mimetype=self.mimetype)
+        else:
+            respuesta = super().response(obj)
+
+        if msgpack is not None:
+            respuesta.vary.add('Accept')
+        return respuesta
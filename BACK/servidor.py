@@ -0,0 +1,80 @@
+"""
+Servidor de producción: gunicorn con varios procesos worker y varios hilos
+por worker, en lugar del servidor de desarrollo de Flask.
+
+Uso (desde la raíz del proyecto, requiere `pip install gunicorn`, no corre en Windows):
+    python -m BACK.servidor --workers 4 --threads 8 --bind 0.0.0.0:5000
+
+Cada opción se puede dar también por variable de entorno (APP_WORKERS,
+APP_THREADS, APP_BIND, APP_GRACEFUL_TIMEOUT). Cada worker importa la
+aplicación después del fork, así que tiene su propio SistemaDeAlquiler, pool
+de conexiones, caches e índice de disponibilidad. Con SIGTERM los workers
+terminan los requests en curso y drenan el pool antes de salir.
+Como las versiones de las tablas también son por worker, con más de un
+worker las rutas de datos que la aplicación modifica (por ejemplo
+/api/vehiculos) se sirven sin ETag; sólo las tablas de referencia lo
+conservan (ver con_etag en BACK/routes.py).
+"""
+import argparse
+import os
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    raise SystemExit("Falta gunicorn: pip install gunicorn (para desarrollo alcanza con python -m BACK.routes)")
+
+
+def _al_terminar_worker(server, worker):
+    # Los requests en curso ya terminaron (o venció graceful_timeout): se
+    # cierran las conexiones del worker en vez de dejarlas colgadas en MySQL
+    from BD.db_conection import DBConnection
+    DBConnection.cerrar_pool(espera=5)
+
+
+class ServidorAlquileres(BaseApplication):
+    def __init__(self, opciones):
+        self.opciones = opciones
+        super().__init__()
+
+    def load_config(self):
+        for clave, valor in self.opciones.items():
+            self.cfg.set(clave, valor)
+
+    def load(self):
+        # Se llama en cada worker, ya forkeado (preload_app = False)
+        from BACK.routes import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de producción de la API.")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('APP_WORKERS', os.cpu_count() or 1)),
+                        help="procesos worker (por defecto, uno por núcleo)")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('APP_THREADS', 4)),
+                        help="hilos por worker")
+    parser.add_argument('--bind', default=os.environ.get('APP_BIND', '127.0.0.1:5000'))
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.environ.get('APP_GRACEFUL_TIMEOUT', 30)),
+                        help="segundos para terminar los requests en curso al apagar")
+    args = parser.parse_args()
+
+    # Cada hilo usa la conexión de su request y, si responde en streaming, una
+    # dedicada más: con el doble de hilos el pool de un worker nunca se agota
+    # (salvo que se configure explícitamente)
+    os.environ.setdefault('DB_POOL_MAX', str(2 * args.threads))
+    # Los workers lo heredan: con_etag lo usa para saber si hay más de uno
+    os.environ['APP_WORKERS'] = str(args.workers)
+
+    ServidorAlquileres({
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread' if args.threads > 1 else 'sync',
+        'preload_app': False,
+        'graceful_timeout': args.graceful_timeout,
+        'worker_exit': _al_terminar_worker,
+        'accesslog': os.environ.get('APP_ACCESSLOG'),
+    }).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+
+
+class CacheReferencias:
+    """
+    Cache de proceso para las tablas de referencia (ESTADO, AMBITO, CATEGORIA,
+    TIPO_INCIDENTE, TIPO_MANTENIMIENTO). Son tablas chicas que casi no cambian,
+    así que cada una se guarda completa como {id: objeto} y se carga una sola vez.
+    Se descarta al invalidarla explícitamente o, si se configuró, al vencer el TTL.
+    """
+
+    # Segundos mínimos entre dos recargas de una tabla por un ID que no estaba
+    INTERVALO_RECARGA_FALTANTE = 5
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._tablas = {}       # tabla -> (mapa {id: objeto}, cargada_en)
+        self._generacion = {}   # tabla -> nro. de invalidaciones
+        self._faltantes = {}    # tabla -> IDs que seguían sin estar después de recargarla
+        self._recargada_en = {} # tabla -> última recarga por un ID faltante
+        self._lock = threading.Lock()
+
+    def _vigente(self, entrada):
+        return self.ttl is None or time.monotonic() - entrada[1] < self.ttl
+
+    def obtener_tabla(self, tabla, cargar):
+        """
+        Retorna el mapa {id: objeto} de la tabla. 'cargar' es la función del
+        manager que lee la tabla completa; si falla (retorna None) no se cachea.
+        """
+        with self._lock:
+            entrada = self._tablas.get(tabla)
+            if entrada is not None and self._vigente(entrada):
+                return entrada[0]
+            generacion = self._generacion.get(tabla, 0)
+
+        mapa = cargar()
+        if mapa is None:
+            return {}
+
+        with self._lock:
+            # Si alguien invalidó la tabla mientras la leíamos, no guardamos datos viejos
+            if self._generacion.get(tabla, 0) == generacion:
+                self._tablas[tabla] = (mapa, time.monotonic())
+                self._faltantes.pop(tabla, None)
+        return mapa
+
+    def obtener(self, tabla, id_registro, cargar):
+        """
+        Busca un registro por ID. Si no está, recarga la tabla (pudo ser un alta
+        hecha por otro proceso), pero no siempre: un ID que siguió faltando tras
+        una recarga no vuelve a recargarla hasta la próxima invalidación, y entre
+        dos recargas por faltantes pasan al menos INTERVALO_RECARGA_FALTANTE
+        segundos. Así un ID inválido repetido no provoca una recarga por llamada.
+        """
+        objeto = self.obtener_tabla(tabla, cargar).get(id_registro)
+        if objeto is not None or not self._puede_recargar(tabla, id_registro):
+            return objeto
+
+        with self._lock:
+            self._tablas.pop(tabla, None)
+            self._generacion[tabla] = self._generacion.get(tabla, 0) + 1
+        objeto = self.obtener_tabla(tabla, cargar).get(id_registro)
+
+        if objeto is None:
+            with self._lock:
+                self._faltantes.setdefault(tabla, set()).add(id_registro)
+        else:
+            # La tabla cambió fuera de la aplicación: vencen los ETags que dependen de ella
+            versiones_tablas.incrementar(tabla)
+        return objeto
+
+    def _puede_recargar(self, tabla, id_registro):
+        with self._lock:
+            if id_registro in self._faltantes.get(tabla, ()):
+                return False
+            ahora = time.monotonic()
+            if ahora - self._recargada_en.get(tabla, float('-inf')) < self.INTERVALO_RECARGA_FALTANTE:
+                return False
+            self._recargada_en[tabla] = ahora
+            return True
+
+    def invalidar(self, tabla=None):
+        """Descarta una tabla (o todas) para que se relea en el próximo acceso."""
+        with self._lock:
+            tablas = [tabla] if tabla else list(self._tablas)
+            for t in tablas:
+                self._tablas.pop(t, None)
+                self._faltantes.pop(t, None)
+                self._recargada_en.pop(t, None)
+                self._generacion[t] = self._generacion.get(t, 0) + 1
+        # Lo que se respondió con la versión anterior ya no vale (ETags de las rutas)
+        versiones_tablas.incrementar(*tablas)
+
+
+class CacheTTL:
+    """Cache clave → valor con vencimiento, para resultados calculados (KPIs, totales)."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._valores = {}   # clave -> (valor, calculado_en)
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, calcular):
+        """Retorna el valor cacheado o lo calcula con 'calcular()' si no está o venció."""
+        with self._lock:
+            entrada = self._valores.get(clave)
+            if entrada is not None and time.monotonic() - entrada[1] < self.ttl:
+                return entrada[0]
+            generacion = self._generacion
+
+        valor = calcular()
+        with self._lock:
+            # Un valor calculado antes de una invalidación no se guarda
+            if self._generacion == generacion:
+                self._valores[clave] = (valor, time.monotonic())
+        return valor
+
+    async def obtener_async(self, clave, calcular):
+        """Como obtener, pero 'calcular' es una corrutina (managers de BD/manager_async)."""
+        with self._lock:
+            entrada = self._valores.get(clave)
+            if entrada is not None and time.monotonic() - entrada[1] < self.ttl:
+                return entrada[0]
+            generacion = self._generacion
+
+        valor = await calcular()
+        with self._lock:
+            if self._generacion == generacion:
+                self._valores[clave] = (valor, time.monotonic())
+        return valor
+
+    def invalidar(self, clave=None):
+        with self._lock:
+            self._generacion += 1
+            if clave is None:
+                self._valores.clear()
+            else:
+                self._valores.pop(clave, None)
+
+
+class InstanciasCompartidas:
+    """
+    Flyweight para una carga: los managers piden cada objeto por su clave
+    natural (por ejemplo ('CLIENTE', id)) y las filas que lo repiten reciben
+    la misma instancia en lugar de una copia. Dura lo que dura la carga, así
+    un resultado no comparte objetos mutables con otro.
+    Estados, ámbitos y categorías ya llegan compartidos desde cache_referencias.
+    """
+
+    __slots__ = ('_instancias',)
+
+    def __init__(self):
+        self._instancias = {}
+
+    def obtener(self, clave, crear):
+        """Retorna la instancia de 'clave', creándola con 'crear()' la primera vez."""
+        obj = self._instancias.get(clave)
+        if obj is None:
+            obj = self._instancias[clave] = crear()
+        return obj
+
+    def __len__(self):
+        return len(self._instancias)
+
+
+class VersionesTablas:
+    """
+    Contador de versión por tabla, que los managers incrementan después de
+    confirmar una escritura (con DBConnection.al_confirmar). Con él las rutas
+    arman ETags sin consultar la BD: mientras la versión no cambie, la
+    respuesta tampoco. El token de arranque evita que un ETag de un proceso
+    anterior coincida con uno nuevo después de reiniciar.
+    Como los demás caches, es por proceso: con varios procesos cada uno
+    conoce sólo las escrituras que hizo él.
+    """
+
+    def __init__(self):
+        self._arranque = time.time()
+        self._token = format(int(self._arranque * 1000), 'x')
+        self._versiones = {}     # tabla -> versión
+        self._modificadas = {}   # tabla -> epoch de la última escritura
+        self._lock = threading.Lock()
+
+    def incrementar(self, *tablas):
+        with self._lock:
+            ahora = time.time()
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+                self._modificadas[tabla] = ahora
+
+    def etag(self, *tablas):
+        """Identificador del estado conjunto de las tablas (sin comillas)."""
+        with self._lock:
+            versiones = ".".join(str(self._versiones.get(t, 0)) for t in tablas)
+        return f"{self._token}-{versiones}"
+
+    def ultima_modificacion(self, *tablas):
+        """Epoch de la última escritura en cualquiera de las tablas (o del arranque)."""
+        with self._lock:
+            return max([self._modificadas.get(t, self._arranque) for t in tablas])
+
+
+versiones_tablas = VersionesTablas()
+
+_ttl = os.environ.get('CACHE_REFERENCIAS_TTL')
+cache_referencias = CacheReferencias(ttl=float(_ttl) if _ttl else None)
@@ -1,24 +1,324 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import pymysql
 from pymysql.cursors import DictCursor
 
+from . import trazas
+
+
+class _ConexionPrestada:
+    """
+    Envoltorio de una conexión del pool. Delega todo en la conexión real de
+    pymysql, salvo close(), que la devuelve al pool en lugar de cerrarla.
+    Así los managers siguen haciendo conn.close() sin enterarse del pool.
+    """
+
+    def __init__(self, pool, conn, fija=False, unidad=None):
+        self._pool = pool
+        self._conn = conn
+        # Si la conexión está fijada al request, close() no la libera:
+        # se devuelve recién al finalizar el préstamo.
+        self._fija = fija
+        # Préstamo con una unidad de trabajo abierta: commit/rollback los
+        # resuelve la unidad al cerrarse, no cada manager.
+        self._unidad = unidad
+        self._cerrada = False
+
+    def cursor(self, *args, **kwargs):
+        # Cursor instrumentado: cuenta y mide las consultas del request (ver BD/trazas.py)
+        return trazas.CursorTrazado(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        if self._unidad is None:
+            self._conn.commit()
+
+    def rollback(self):
+        if self._unidad is not None:
+            # Un manager falló: la unidad entera termina en rollback
+            self._unidad.solo_rollback = True
+        self._conn.rollback()
+
+    def close(self):
+        if self._cerrada:
+            return
+        self._cerrada = True
+        if not self._fija:
+            self._pool.devolver(self._conn)
+
+    def __getattr__(self, nombre):
+        return getattr(self._conn, nombre)
+
+
+class ConnectionPool:
+    """Pool de conexiones MySQL thread-safe con tamaño mínimo/máximo."""
+
+    def __init__(self, config, min_size=1, max_size=10, idle_timeout=300,
+                 checkout_timeout=10, verificar_tras=5):
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        # Segundos que una conexión puede quedar libre antes de cerrarla
+        self.idle_timeout = idle_timeout
+        # Segundos que se espera una conexión libre cuando el pool está lleno
+        self.checkout_timeout = checkout_timeout
+        # Sólo se hace ping a conexiones que estuvieron libres más de esto
+        self.verificar_tras = verificar_tras
+
+        self._cond = threading.Condition()
+        self._libres = deque()  # (conexion, instante_devolucion); la más reciente a la derecha
+        self._abiertas = 0      # libres + prestadas
+        self._cerrado = False
+
+        self._stats = {
+            'creadas': 0,
+            'reutilizadas': 0,
+            'descartadas': 0,
+            'evictadas': 0,
+            'esperas': 0,
+            'timeouts': 0,
+        }
+
+    # ----------------------------------------------------------
+    #   CREACIÓN / VERIFICACIÓN
+    # ----------------------------------------------------------
+    # En REPEATABLE READ (el default de InnoDB) la primera lectura fija la foto
+    # de toda la transacción: una verificación que corre después de esperar un
+    # FOR UPDATE no vería lo que otra transacción confirmó mientras tanto (ver
+    # AlquilerManager.__hay_superposicion). En READ COMMITTED cada sentencia
+    # lee lo último confirmado.
+    AISLAMIENTO = "SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED"
+
+    def _crear(self):
+        conn = pymysql.connect(**self.config, cursorclass=DictCursor, init_command=self.AISLAMIENTO)
+        with self._cond:
+            self._stats['creadas'] += 1
+        return conn
+
+    def _esta_sana(self, conn, libre_desde):
+        if time.monotonic() - libre_desde < self.verificar_tras:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _cerrar_silencioso(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _evictar_inactivas(self):
+        """Cierra las conexiones libres más viejas que idle_timeout (con el lock tomado)."""
+        ahora = time.monotonic()
+        while (self._libres and self._abiertas > self.min_size
+               and ahora - self._libres[0][1] > self.idle_timeout):
+            conn, _ = self._libres.popleft()
+            self._abiertas -= 1
+            self._stats['evictadas'] += 1
+            self._cerrar_silencioso(conn)
+
+    # ----------------------------------------------------------
+    #   PRÉSTAMO / DEVOLUCIÓN
+    # ----------------------------------------------------------
+    def obtener(self):
+        """Entrega una conexión libre (o nueva). Lanza OperationalError si vence la espera."""
+        limite = time.monotonic() + self.checkout_timeout
+
+        with self._cond:
+            while True:
+                if self._cerrado:
+                    raise pymysql.err.OperationalError(0, "Pool cerrado: el proceso se está apagando")
+                self._evictar_inactivas()
+                if self._libres:
+                    conn, libre_desde = self._libres.pop()
+                    self._stats['reutilizadas'] += 1
+                    break
+                if self._abiertas < self.max_size:
+                    self._abiertas += 1
+                    conn, libre_desde = None, None
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._stats['timeouts'] += 1
+                    raise pymysql.err.OperationalError(
+                        0, f"Pool agotado: no se liberó ninguna conexión en {self.checkout_timeout}s")
+                self._stats['esperas'] += 1
+                self._cond.wait(restante)
+
+        # La conexión a MySQL y el ping se hacen fuera del lock
+        if conn is not None and self._esta_sana(conn, libre_desde):
+            return conn
+
+        if conn is not None:
+            with self._cond:
+                self._stats['descartadas'] += 1
+            self._cerrar_silencioso(conn)
+
+        try:
+            return self._crear()
+        except Exception:
+            with self._cond:
+                self._abiertas -= 1
+                self._cond.notify()
+            raise
+
+    def devolver(self, conn):
+        """Devuelve la conexión al pool, descartando cualquier transacción pendiente."""
+        try:
+            # Cierra el snapshot de lectura abierto por los SELECT sin commit
+            conn.rollback()
+            sana = True
+        except Exception:
+            sana = False
+
+        with self._cond:
+            cerrar = not sana or self._cerrado
+            if not cerrar:
+                self._libres.append((conn, time.monotonic()))
+            else:
+                self._abiertas -= 1
+                if not sana:
+                    self._stats['descartadas'] += 1
+            self._cond.notify_all()
+
+        if cerrar:
+            self._cerrar_silencioso(conn)
+
+    def cerrar(self, espera=10):
+        """
+        Apagado ordenado: no entrega más conexiones, espera hasta 'espera'
+        segundos a que vuelvan las prestadas (los requests en curso terminan
+        normalmente) y cierra todas las libres. Las que vuelvan después se
+        cierran al devolverlas. Retorna cuántas seguían prestadas al final.
+        """
+        limite = time.monotonic() + espera
+        with self._cond:
+            self._cerrado = True
+            while self._abiertas > len(self._libres):
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                self._cond.wait(restante)
+            libres = [conn for conn, _ in self._libres]
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            prestadas = self._abiertas
+
+        for conn in libres:
+            self._cerrar_silencioso(conn)
+        return prestadas
+
+    def precalentar(self):
+        """Abre conexiones hasta alcanzar min_size."""
+        while True:
+            with self._cond:
+                if self._abiertas >= self.min_size:
+                    return
+                self._abiertas += 1
+            try:
+                conn = self._crear()
+            except Exception:
+                with self._cond:
+                    self._abiertas -= 1
+                raise
+            self.devolver(conn)
+
+    def estadisticas(self):
+        with self._cond:
+            libres = len(self._libres)
+            return {
+                'min': self.min_size,
+                'max': self.max_size,
+                'abiertas': self._abiertas,
+                'libres': libres,
+                'en_uso': self._abiertas - libres,
+                **self._stats,
+            }
+
+
+class _Prestamo:
+    """Conexión fijada al hilo durante un request (se pide recién cuando hace falta)."""
+
+    def __init__(self):
+        self.conn = None
+        # Pool del que salió 'conn': se devuelve a ese aunque mientras tanto
+        # cerrar_pool() lo haya reemplazado (igual que _ConexionPrestada._pool)
+        self.pool = None
+        self.profundidad = 0
+        # Unidad de trabajo: niveles abiertos, si ya falló y qué correr tras el commit
+        self.transaccion = 0
+        self.solo_rollback = False
+        self.al_confirmar = []
+
+
+class ResultadoUnidad:
+    """Lo que entrega unidad_de_trabajo(); 'confirmada' se completa al salir del bloque."""
+
+    def __init__(self):
+        # True/False al cerrar la unidad más externa; None si quedó anidada en otra
+        self.confirmada = None
+
+
 class DBConnection:
-    
+
+    # El pool es único por proceso y lo comparten todas las instancias
+    _pool = None
+    _pool_lock = threading.Lock()
+    _local = threading.local()
+
     def __init__(self):
-        # Configuración de tu servidor MySQL local
+        # Configuración de tu servidor MySQL local (se puede pisar con variables
+        # de entorno, por ejemplo para apuntar los benchmarks a otra BD)
         self.config = {
-            'user': 'root',  # Ejemplo: 'root' o el que creaste
-            'password': 'root123',
-            'host': '127.0.0.1',
-            'database': 'alquiler_autos' # Nombre de la BD que creaste en MySQL
+            'user': os.environ.get('DB_USER', 'root'),  # Ejemplo: 'root' o el que creaste
+            'password': os.environ.get('DB_PASSWORD', 'root123'),
+            'host': os.environ.get('DB_HOST', '127.0.0.1'),
+            'port': int(os.environ.get('DB_PORT', 3306)),
+            'database': os.environ.get('DB_NAME', 'alquiler_autos') # Nombre de la BD que creaste en MySQL
         }
 
-    def get_connection(self):
-        """Retorna una conexión activa a la base de datos MySQL."""
+    def _obtener_pool(self):
+        if DBConnection._pool is None:
+            with DBConnection._pool_lock:
+                if DBConnection._pool is None:
+                    DBConnection._pool = ConnectionPool(
+                        self.config,
+                        min_size=int(os.environ.get('DB_POOL_MIN', 1)),
+                        max_size=int(os.environ.get('DB_POOL_MAX', 10)),
+                        idle_timeout=int(os.environ.get('DB_POOL_IDLE', 300)),
+                        checkout_timeout=int(os.environ.get('DB_POOL_TIMEOUT', 10))
+                    )
+        return DBConnection._pool
+
+    def get_connection(self, dedicada=False):
+        """
+        Retorna una conexión activa a la base de datos MySQL, tomada del pool.
+        Dentro de un préstamo (ver prestamo()) todas las llamadas del mismo hilo
+        reciben la misma conexión. Con dedicada=True se entrega una conexión
+        propia aunque haya préstamo: es para cursores que se leen después de
+        terminado el request (respuestas en streaming).
+        """
         try:
-            conn = pymysql.connect(
-                **self.config, 
-                cursorclass=DictCursor)
-            return conn
+            trazas.registrar_conexion()
+            pool = self._obtener_pool()
+            prestamo = getattr(DBConnection._local, 'prestamo', None)
+
+            if prestamo is None or dedicada:
+                return _ConexionPrestada(pool, pool.obtener())
+
+            if prestamo.conn is None:
+                prestamo.conn = pool.obtener()
+                prestamo.pool = pool
+            unidad = prestamo if prestamo.transaccion else None
+            return _ConexionPrestada(pool, prestamo.conn, fija=True, unidad=unidad)
+
         except pymysql.MySQLError as err:
             if err.args[0] == pymysql.constants.ER.ACCESS_DENIED_ERROR:
                 print("Error: Usuario o contraseña incorrectos.")
@@ -28,25 +328,234 @@ class DBConnection:
                 print(f"Error de conexión a MySQL: {err}")
             return None
 
-    def execute_sql_script(self, sql_script):
-        """Ejecuta un script DDL para crear tablas (usa este método para crear el esquema)."""
+    # ----------------------------------------------------------
+    #   PRÉSTAMO POR REQUEST
+    # ----------------------------------------------------------
+    @classmethod
+    def iniciar_prestamo(cls):
+        """Fija una conexión al hilo actual hasta finalizar_prestamo()."""
+        prestamo = getattr(cls._local, 'prestamo', None)
+        if prestamo is None:
+            prestamo = cls._local.prestamo = _Prestamo()
+        prestamo.profundidad += 1
+
+    @classmethod
+    def finalizar_prestamo(cls):
+        """Devuelve al pool la conexión fijada por iniciar_prestamo()."""
+        prestamo = getattr(cls._local, 'prestamo', None)
+        if prestamo is None:
+            return
+        prestamo.profundidad -= 1
+        if prestamo.profundidad > 0:
+            return
+
+        cls._local.prestamo = None
+        if prestamo.conn is not None:
+            prestamo.pool.devolver(prestamo.conn)
+
+    @classmethod
+    @contextmanager
+    def prestamo(cls):
+        cls.iniciar_prestamo()
+        try:
+            yield
+        finally:
+            cls.finalizar_prestamo()
+
+    # ----------------------------------------------------------
+    #   UNIDAD DE TRABAJO (UNA TRANSACCIÓN POR OPERACIÓN)
+    # ----------------------------------------------------------
+    # Dentro de una unidad, todos los managers usan la conexión del préstamo y
+    # sus commit() no hacen nada: se confirma una sola vez al cerrar la unidad
+    # más externa. Si algún manager hizo rollback, o la unidad se cierra con
+    # confirmar=False, se descarta todo. Las unidades se pueden anidar.
+    @classmethod
+    def iniciar_transaccion(cls):
+        """Abre (o anida) una unidad de trabajo sobre el préstamo del hilo."""
+        cls.iniciar_prestamo()
+        cls._local.prestamo.transaccion += 1
+
+    @classmethod
+    def finalizar_transaccion(cls, confirmar=True):
+        """
+        Cierra un nivel de la unidad de trabajo. En el más externo hace el commit
+        (o el rollback) y, si confirmó, corre los callbacks de al_confirmar().
+        Retorna True si se confirmó, False si se descartó y None si sigue anidada.
+        """
+        prestamo = getattr(cls._local, 'prestamo', None)
+        if prestamo is None or prestamo.transaccion == 0:
+            return None
+
+        try:
+            if not confirmar:
+                prestamo.solo_rollback = True
+            prestamo.transaccion -= 1
+            if prestamo.transaccion > 0:
+                return None
+
+            callbacks, prestamo.al_confirmar = prestamo.al_confirmar, []
+            solo_rollback, prestamo.solo_rollback = prestamo.solo_rollback, False
+            conn = prestamo.conn
+
+            # Si el rollback falla, el pool descarta la conexión al devolverla
+            if solo_rollback:
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except pymysql.MySQLError as err:
+                        print(f"Error al descartar la transacción: {err}")
+                return False
+
+            if conn is not None:
+                try:
+                    conn.commit()
+                except pymysql.MySQLError as err:
+                    print(f"Error al confirmar la transacción: {err}")
+                    return False
+
+            for callback in callbacks:
+                callback()
+            return True
+
+        finally:
+            cls.finalizar_prestamo()
+
+    @classmethod
+    @contextmanager
+    def unidad_de_trabajo(cls):
+        """
+        with DBConnection.unidad_de_trabajo() as uow: ...
+        Una excepción dentro del bloque descarta la unidad. Al salir,
+        uow.confirmada indica si se hizo el commit.
+        """
+        resultado = ResultadoUnidad()
+        cls.iniciar_transaccion()
+        try:
+            yield resultado
+        except BaseException:
+            cls.finalizar_transaccion(confirmar=False)
+            raise
+        resultado.confirmada = cls.finalizar_transaccion()
+
+    @classmethod
+    def en_transaccion(cls):
+        prestamo = getattr(cls._local, 'prestamo', None)
+        return prestamo is not None and prestamo.transaccion > 0
+
+    @classmethod
+    def marcar_rollback(cls):
+        """Hace que la unidad de trabajo abierta termine en rollback."""
+        prestamo = getattr(cls._local, 'prestamo', None)
+        if prestamo is not None and prestamo.transaccion:
+            prestamo.solo_rollback = True
+
+    @classmethod
+    def al_confirmar(cls, callback):
+        """
+        Corre 'callback' cuando los cambios queden confirmados: al cerrar la
+        unidad de trabajo abierta, o en el acto si no hay ninguna.
+        Se usa para actualizar caches e índices en memoria sólo tras el commit.
+        """
+        prestamo = getattr(cls._local, 'prestamo', None)
+        if prestamo is not None and prestamo.transaccion:
+            prestamo.al_confirmar.append(callback)
+        else:
+            callback()
+
+    def precalentar_pool(self):
+        """Abre las conexiones mínimas del pool (se llama al arrancar el servidor)."""
+        try:
+            self._obtener_pool().precalentar()
+        except pymysql.MySQLError as err:
+            print(f"Error al precalentar el pool de conexiones: {err}")
+
+    @classmethod
+    def cerrar_pool(cls, espera=10):
+        """
+        Drena y cierra el pool del proceso (al apagar un worker). Si después
+        alguien vuelve a pedir una conexión, se crea un pool nuevo.
+        """
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool is None:
+            return 0
+        prestadas = pool.cerrar(espera)
+        if prestadas:
+            print(f"⚠️ Pool cerrado con {prestadas} conexión(es) todavía en uso.")
+        return prestadas
+
+    @classmethod
+    def estadisticas_pool(cls):
+        """Métricas del pool para monitoreo."""
+        pool = cls._pool
+        if pool is None:
+            return {'abiertas': 0, 'libres': 0, 'en_uso': 0}
+        return pool.estadisticas()
+
+    def execute_sql_script(self, sql_script, omitir=None):
+        """
+        Ejecuta un script SQL de varias sentencias (esquema, índices, SPs).
+        pymysql ejecuta una sentencia por llamada, así que el script se divide
+        antes (ver dividir_sentencias). Retorna True si corrieron todas.
+        Ojo: en MySQL el DDL confirma solo, así que un error a mitad de script
+        deja aplicadas las sentencias anteriores. Para poder reintentarlo,
+        'omitir(sentencia)' puede indicar cuáles ya no hace falta correr.
+        """
         conn = self.get_connection()
-        if conn:
-            cursor = conn.cursor()
-            try:
-                # El método multi=True permite ejecutar múltiples sentencias CREATE TABLE
-                for result in cursor.execute(sql_script, multi=True):
-                    if result.with_rows:
-                        # Si hay resultados (SELECT), podrías procesarlos aquí
-                        pass
-                conn.commit()
-                print("Esquema MySQL creado/actualizado correctamente.")
-            except pymysql.MySQLError as err:
-                print(f"Error al ejecutar script SQL: {err}")
-                conn.rollback()
-            finally:
-                cursor.close()
-                conn.close()
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            for sentencia in dividir_sentencias(sql_script):
+                if omitir is not None and omitir(sentencia):
+                    continue
+                cursor.execute(sentencia)
+                # Un CALL puede dejar varios resultados pendientes
+                while cursor.nextset():
+                    pass
+            conn.commit()
+            print("Esquema MySQL creado/actualizado correctamente.")
+            return True
+        except pymysql.MySQLError as err:
+            print(f"Error al ejecutar script SQL: {err}")
+            conn.rollback()
+            return False
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def dividir_sentencias(sql_script):
+    """
+    Divide un script en sentencias. Respeta las líneas DELIMITER (como el
+    cliente mysql) para poder definir procedimientos con ';' en el cuerpo.
+    Una sentencia termina en la línea que termina con el delimitador; las
+    líneas de comentario (-- o #) entre sentencias se descartan.
+    """
+    delimitador = ';'
+    sentencias = []
+    actual = []
+
+    for linea in sql_script.splitlines():
+        limpia = linea.strip()
+        if limpia.upper().startswith('DELIMITER '):
+            delimitador = limpia.split(None, 1)[1]
+            continue
+        if not actual and (not limpia or limpia.startswith('--') or limpia.startswith('#')):
+            continue
+
+        actual.append(linea)
+        if limpia.endswith(delimitador):
+            sentencia = '\n'.join(actual).rstrip()[:-len(delimitador)].strip()
+            if sentencia:
+                sentencias.append(sentencia)
+            actual = []
+
+    resto = '\n'.join(actual).strip()
+    if resto:
+        sentencias.append(resto)
+    return sentencias
 
 # Si quieres usar el archivo SQL que ya generamos, puedes cargarlo aquí
 if __name__ == '__main__':
@@ -63,4 +572,4 @@ if __name__ == '__main__':
     #         db.execute_sql_script(contenido_sql)
     #     except Exception as e:
     #         print(f"Error al leer/ejecutar el archivo SQL: {e}")
-    pass
\ No newline at end of file
+    pass
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import weakref
+from contextlib import asynccontextmanager
+
+import pymysql
+
+from .db_conection import DBConnection
+
+try:
+    import aiomysql
+except ImportError:  # el acceso async es opcional: pip install aiomysql
+    aiomysql = None
+
+
+class AsyncDBConnection:
+    """
+    Pool de conexiones asyncio (aiomysql) para la capa de lectura async
+    (BD/manager_async, BACK/routes_async.py). Usa la misma configuración que
+    DBConnection (variables DB_*) y hay uno por event loop (las conexiones de
+    aiomysql quedan atadas al loop que las creó): se crea con la primera
+    consulta hecha en ese loop y se cierra con cerrar_pool() desde el mismo.
+    Mientras un request espera a MySQL, el event loop atiende a los demás,
+    así un solo proceso sostiene muchas consultas concurrentes con pocas
+    conexiones, sin un hilo por request.
+    Las conexiones van en autocommit: esta capa sólo lee, y así cada
+    consulta ve lo último confirmado por la aplicación sync.
+    """
+
+    # event loop -> pool / lock; un loop cerrado y descartado sale solo
+    _pools = weakref.WeakKeyDictionary()
+    _locks = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        config = DBConnection().config
+        self.config = {
+            'user': config['user'],
+            'password': config['password'],
+            'host': config['host'],
+            'port': config['port'],
+            'db': config['database'],
+        }
+
+    async def _obtener_pool(self):
+        if aiomysql is None:
+            raise RuntimeError("Para el acceso async hace falta instalar aiomysql")
+        loop = asyncio.get_running_loop()
+        pool = AsyncDBConnection._pools.get(loop)
+        if pool is None:
+            lock = AsyncDBConnection._locks.setdefault(loop, asyncio.Lock())
+            async with lock:
+                pool = AsyncDBConnection._pools.get(loop)
+                if pool is None:
+                    pool = AsyncDBConnection._pools[loop] = await aiomysql.create_pool(
+                        **self.config,
+                        minsize=int(os.environ.get('DB_POOL_MIN', 1)),
+                        maxsize=int(os.environ.get('DB_POOL_MAX', 10)),
+                        # Segundos de vida de una conexión antes de reciclarla
+                        pool_recycle=int(os.environ.get('DB_POOL_IDLE', 300)),
+                        autocommit=True,
+                        cursorclass=aiomysql.DictCursor,
+                    )
+        return pool
+
+    @asynccontextmanager
+    async def cursor(self):
+        """
+        async with AsyncDBConnection().cursor() as cursor: ...
+        Toma una conexión del pool (esperando si está lleno) y la devuelve al salir.
+        """
+        pool = await self._obtener_pool()
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                yield cursor
+
+    async def precalentar_pool(self):
+        """Crea el pool con sus conexiones mínimas (se llama al arrancar el servidor)."""
+        try:
+            await self._obtener_pool()
+        except pymysql.MySQLError as err:
+            print(f"Error al precalentar el pool async: {err}")
+
+    @classmethod
+    async def cerrar_pool(cls):
+        """Espera a que vuelvan las conexiones prestadas y cierra el pool del loop actual (al apagar el proceso)."""
+        pool = cls._pools.pop(asyncio.get_running_loop(), None)
+        if pool is None:
+            return
+        pool.close()
+        await pool.wait_closed()
+
+    @classmethod
+    def estadisticas_pool(cls):
+        """
+        Métricas del pool del loop actual para monitoreo, con las mismas claves
+        que DBConnection.estadisticas_pool.
+        """
+        try:
+            pool = cls._pools.get(asyncio.get_running_loop())
+        except RuntimeError:  # fuera de un event loop
+            pool = None
+        if pool is None:
+            return {'abiertas': 0, 'libres': 0, 'en_uso': 0}
+        return {
+            'min': pool.minsize,
+            'max': pool.maxsize,
+            'abiertas': pool.size,
+            'libres': pool.freesize,
+            'en_uso': pool.size - pool.freesize,
+        }
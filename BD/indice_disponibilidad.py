@@ -0,0 +1,245 @@
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+
+import pymysql
+
+from .db_conection import DBConnection
+
+# Estados de alquiler que ocupan el vehículo (6 = Pendiente de inicio, 7 = En curso).
+# SP_VALIDAR_DISPONIBILIDAD_ALQUILER (migración 0002) los tiene escritos en SQL
+ESTADOS_ALQUILER_ACTIVOS = (6, 7)
+
+# Un mantenimiento sin fecha de fin bloquea el vehículo indefinidamente
+_SIN_FIN = datetime.max
+
+
+class _IntervalosVehiculo:
+    """
+    Intervalos ocupados de un vehículo, ordenados por inicio, junto con el
+    máximo acumulado de los fines. Con eso, saber si [inicio, fin) se pisa con
+    algún intervalo es una búsqueda binaria más una comparación: O(log n).
+    Los intervalos son semiabiertos, así que uno que termina justo cuando
+    empieza otro no es conflicto.
+    """
+
+    def __init__(self, intervalos):
+        # intervalos: lista de (inicio, fin, clave)
+        self.intervalos = sorted(intervalos, key=lambda i: (i[0], i[1]))
+        self._reindexar()
+
+    def _reindexar(self):
+        self.inicios = [i[0] for i in self.intervalos]
+        self.max_fin = []
+        maximo = None
+        for _, fin, _ in self.intervalos:
+            maximo = fin if maximo is None or fin > maximo else maximo
+            self.max_fin.append(maximo)
+
+    def agregar(self, inicio, fin, clave):
+        insort(self.intervalos, (inicio, fin, clave), key=lambda i: (i[0], i[1]))
+        self._reindexar()
+
+    def quitar(self, clave):
+        self.intervalos = [i for i in self.intervalos if i[2] != clave]
+        self._reindexar()
+
+    def hay_conflicto(self, inicio, fin, excluir=None):
+        # Sólo pueden pisarse los intervalos que empiezan antes de 'fin', y alguno
+        # se pisa si y sólo si el mayor de sus fines es posterior a 'inicio'
+        candidatos = bisect_left(self.inicios, fin)
+        if candidatos == 0 or self.max_fin[candidatos - 1] <= inicio:
+            return False
+        if excluir is None:
+            return True
+
+        # Con un intervalo excluido (al modificar un alquiler) se recorre hacia
+        # atrás mientras algún intervalo anterior termine después de 'inicio'
+        posicion = candidatos - 1
+        while posicion >= 0 and self.max_fin[posicion] > inicio:
+            i_inicio, i_fin, clave = self.intervalos[posicion]
+            if i_fin > inicio and clave != excluir:
+                return True
+            posicion -= 1
+        return False
+
+
+class IndiceDisponibilidad:
+    """
+    Índice en memoria de la ocupación de cada vehículo: alquileres activos o
+    reservados y mantenimientos vigentes. Cada vehículo se carga de la BD la
+    primera vez que se consulta y se refresca cada 'ttl' segundos (por si otro
+    proceso escribió). AlquilerManager y MantenimientoManager lo actualizan
+    después de cada escritura confirmada.
+
+    Es sólo un filtro rápido: la verificación definitiva la hace
+    AlquilerManager dentro de la transacción que inserta/actualiza el alquiler.
+    Claves de los intervalos: ('A', id_alquiler) o ('M', id_mantenimiento).
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self.db_connection = DBConnection()
+        self._vehiculos = {}   # id_vehiculo -> (_IntervalosVehiculo, cargado_en)
+        self._ubicacion = {}   # clave -> id_vehiculo
+        self._version = {}     # id_vehiculo -> nro. de escrituras (descarta cargas viejas)
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------
+    #   CARGA DESDE LA BD
+    # ----------------------------------------------------------
+    # Ambas admiten agregar " AND ID_VEHICULO = %s" para leer un solo vehículo
+    _SQL_ALQUILERES_ACTIVOS = f"""
+        SELECT ID_ALQUILER, ID_VEHICULO, FEC_INICIO, FEC_FIN
+        FROM ALQUILER
+        WHERE ID_ESTADO IN ({", ".join(["%s"] * len(ESTADOS_ALQUILER_ACTIVOS))})
+    """
+
+    _SQL_MANTENIMIENTOS_VIGENTES = """
+        SELECT ID_MANTENIMIENTO, ID_VEHICULO, FEC_INICIO, FEC_FIN
+        FROM MANTENIMIENTO
+        WHERE (FEC_FIN IS NULL OR FEC_FIN > NOW())
+    """
+
+    def __leer_intervalos(self, id_vehiculo=None):
+        """Lee de la BD los intervalos ocupados, agrupados por vehículo."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        filtro = "" if id_vehiculo is None else " AND ID_VEHICULO = %s"
+        params = () if id_vehiculo is None else (id_vehiculo,)
+
+        try:
+            por_vehiculo = {}
+
+            cursor.execute(self._SQL_ALQUILERES_ACTIVOS + filtro, ESTADOS_ALQUILER_ACTIVOS + params)
+            for row in cursor.fetchall():
+                por_vehiculo.setdefault(row['ID_VEHICULO'], []).append(
+                    (row['FEC_INICIO'], row['FEC_FIN'], ('A', row['ID_ALQUILER'])))
+
+            cursor.execute(self._SQL_MANTENIMIENTOS_VIGENTES + filtro, params)
+            for row in cursor.fetchall():
+                por_vehiculo.setdefault(row['ID_VEHICULO'], []).append(
+                    (row['FEC_INICIO'], row['FEC_FIN'] or _SIN_FIN, ('M', row['ID_MANTENIMIENTO'])))
+
+            return por_vehiculo
+
+        except pymysql.MySQLError as e:
+            print(f"Error al cargar el índice de disponibilidad: {e}")
+            return None
+
+        finally:
+            cursor.close()
+            conn.close()
+
+    def __instalar(self, id_vehiculo, intervalos, version):
+        """Guarda los intervalos leídos salvo que el vehículo haya cambiado mientras se leían."""
+        indice = _IntervalosVehiculo(intervalos)
+        with self._lock:
+            if self._version.get(id_vehiculo, 0) != version:
+                return indice
+            anterior = self._vehiculos.get(id_vehiculo)
+            if anterior is not None:
+                for _, _, clave in anterior[0].intervalos:
+                    self._ubicacion.pop(clave, None)
+            for _, _, clave in indice.intervalos:
+                self._ubicacion[clave] = id_vehiculo
+            self._vehiculos[id_vehiculo] = (indice, time.monotonic())
+        return indice
+
+    def __obtener(self, id_vehiculo):
+        with self._lock:
+            entrada = self._vehiculos.get(id_vehiculo)
+            if entrada is not None and time.monotonic() - entrada[1] < self.ttl:
+                return entrada[0]
+            version = self._version.get(id_vehiculo, 0)
+
+        por_vehiculo = self.__leer_intervalos(id_vehiculo)
+        if por_vehiculo is None:
+            return None
+        return self.__instalar(id_vehiculo, por_vehiculo.get(id_vehiculo, []), version)
+
+    def precargar(self):
+        """Carga la ocupación de toda la flota con dos consultas."""
+        with self._lock:
+            versiones = dict(self._version)
+        por_vehiculo = self.__leer_intervalos()
+        if por_vehiculo is None:
+            return
+        for id_vehiculo, intervalos in por_vehiculo.items():
+            self.__instalar(id_vehiculo, intervalos, versiones.get(id_vehiculo, 0))
+
+    # ----------------------------------------------------------
+    #   CONSULTA
+    # ----------------------------------------------------------
+    def hay_conflicto(self, id_vehiculo, inicio, fin, excluir=None):
+        """
+        True si [inicio, fin) se superpone con algún alquiler activo o
+        mantenimiento del vehículo. 'excluir' es la clave de un intervalo a
+        ignorar (el propio alquiler cuando se lo modifica).
+        Retorna None si no se pudo consultar la BD.
+        """
+        indice = self.__obtener(id_vehiculo)
+        if indice is None:
+            return None
+        with self._lock:
+            return indice.hay_conflicto(inicio, fin, excluir)
+
+    # ----------------------------------------------------------
+    #   MANTENIMIENTO DEL ÍNDICE (LLAMADO DESDE LOS MANAGERS)
+    # ----------------------------------------------------------
+    def __tocar(self, id_vehiculo):
+        self._version[id_vehiculo] = self._version.get(id_vehiculo, 0) + 1
+
+    def __quitar_sin_lock(self, clave, id_vehiculo=None):
+        # Aunque el intervalo no esté en el índice se sube la versión del
+        # vehículo: una carga que ya estaba leyendo la BD no debe instalarlo
+        ubicado = self._ubicacion.pop(clave, None)
+        for id_v in {ubicado, id_vehiculo} - {None}:
+            self.__tocar(id_v)
+        if ubicado is not None:
+            entrada = self._vehiculos.get(ubicado)
+            if entrada is not None:
+                entrada[0].quitar(clave)
+
+    def registrar(self, id_vehiculo, clave, inicio, fin):
+        """Agrega o reemplaza el intervalo 'clave' (puede haber cambiado de vehículo)."""
+        with self._lock:
+            self.__quitar_sin_lock(clave)
+            self.__tocar(id_vehiculo)
+            entrada = self._vehiculos.get(id_vehiculo)
+            # Si el vehículo no está cargado, se leerá completo de la BD al consultarlo
+            if entrada is not None:
+                entrada[0].agregar(inicio, fin or _SIN_FIN, clave)
+                self._ubicacion[clave] = id_vehiculo
+
+    def quitar(self, clave, id_vehiculo=None):
+        """Quita el intervalo 'clave'; conviene pasar su vehículo (ver __quitar_sin_lock)."""
+        with self._lock:
+            self.__quitar_sin_lock(clave, id_vehiculo)
+
+    def invalidar(self, id_vehiculo=None, clave=None):
+        """
+        Descarta para releerlos de la BD el vehículo dado y el que contiene
+        'clave' (sin ninguno de los dos, todos). Con una clave conviene pasar
+        también su vehículo: si todavía no estaba en el índice, igual se sube
+        su versión y una carga en curso no instala datos viejos.
+        """
+        with self._lock:
+            if clave is None and id_vehiculo is None:
+                vehiculos = list(self._vehiculos)
+            else:
+                vehiculos = {self._ubicacion.get(clave), id_vehiculo} - {None}
+            for id_v in vehiculos:
+                self.__tocar(id_v)
+                entrada = self._vehiculos.pop(id_v, None)
+                if entrada is not None:
+                    for _, _, c in entrada[0].intervalos:
+                        self._ubicacion.pop(c, None)
+
+
+indice_disponibilidad = IndiceDisponibilidad(
+    ttl=float(os.environ.get('INDICE_DISPONIBILIDAD_TTL', 60))
+)
@@ -1,13 +1,19 @@
 import pymysql
+from collections import deque
 from datetime import datetime
 
 from BACK.modelos.Alquiler import Alquiler
+from BACK.modelos.Cliente import Cliente
+from BACK.modelos.Empleado import Empleado
 from ..db_conection import DBConnection
+from ..cache import InstanciasCompartidas, versiones_tablas
+from ..indice_disponibilidad import indice_disponibilidad, ESTADOS_ALQUILER_ACTIVOS
 
 from .VehiculoManager import VehiculoManager 
 from .ClienteManager import ClienteManager 
 from .EmpleadoManager import EmpleadoManager 
 from .EstadoManager import EstadoManager
+from .ResumenFacturacionManager import ResumenFacturacionManager
 
 
 class AlquilerManager:
@@ -20,34 +26,170 @@ class AlquilerManager:
         self.empleado_manager = EmpleadoManager()
         self.estado_manager = EstadoManager()
 
+    # ----------------------------------------------------------
+    #   CARGA EN LOTE
+    # ----------------------------------------------------------
+    # Trae los alquileres junto con cliente y empleado en una única consulta
+    # y después todos sus vehículos con un solo VehiculoManager.obtener_por_ids,
+    # en lugar de resolver cada dependencia fila por fila (≈10 consultas por
+    # alquiler). Estados y categorías salen del cache de referencias; clientes,
+    # empleados y detalles de vehículo se comparten dentro de cada carga.
+    _SELECT_ALQUILER_COMPLETO = """
+        SELECT
+            A.ID_ALQUILER, A.ID_VEHICULO, A.FEC_INICIO, A.FEC_FIN,
+            A.COSTO_TOTAL, A.ID_ESTADO,
+            C.ID_CLIENTE, C.NOMBRE AS NOMBRE_CLIENTE, C.DNI AS DNI_CLIENTE,
+            C.TELEFONO AS TELEFONO_CLIENTE, C.MAIL AS MAIL_CLIENTE,
+            E.ID_EMPLEADO, E.NOMBRE AS NOMBRE_EMPLEADO, E.DNI AS DNI_EMPLEADO,
+            E.MAIL AS MAIL_EMPLEADO
+        FROM ALQUILER A
+        JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
+        JOIN EMPLEADO E ON A.ID_EMPLEADO = E.ID_EMPLEADO
+    """
+
     # ----------------------------------------------------------
     #   MAPEO FILA → OBJETO ALQUILER
     # ----------------------------------------------------------
-    def __row_to_alquiler(self, row):
+    def _row_to_alquiler(self, row, vehiculos, compartidas):
+        """
+        Arma el grafo completo del alquiler a partir de una fila del JOIN.
+        'vehiculos' es el resultado de obtener_por_ids para toda la carga y
+        'compartidas' (InstanciasCompartidas) guarda los clientes/empleados ya
+        construidos, para que las filas que los comparten reusen la misma instancia.
+        También lo usa la versión async (BD/manager_async/AlquilerManager.py).
+        """
         if row is None:
             return None
 
-        # Resolver dependencias
-        vehiculo_obj = self.vehiculo_manager.obtener_por_id(row['ID_VEHICULO'])
-        cliente_obj = self.cliente_manager.obtener_por_id(row['ID_CLIENTE'])
-        empleado_obj = self.empleado_manager.obtener_por_id(row['ID_EMPLEADO'])
-        estado_obj = self.estado_manager.obtener_por_id(row['ID_ESTADO'])
-
-        # Convertir fechas desde string MySQL
-        fec_inicio = row['FEC_INICIO']
-        fec_fin = row['FEC_FIN']
+        cliente_obj = compartidas.obtener(
+            ('CLIENTE', row['ID_CLIENTE']),
+            lambda: Cliente(
+                id_cliente=row['ID_CLIENTE'],
+                nombre=row['NOMBRE_CLIENTE'],
+                dni=row['DNI_CLIENTE'],
+                telefono=row['TELEFONO_CLIENTE'],
+                mail=row['MAIL_CLIENTE']))
+        empleado_obj = compartidas.obtener(
+            ('EMPLEADO', row['ID_EMPLEADO']),
+            lambda: Empleado(
+                id_empleado=row['ID_EMPLEADO'],
+                nombre=row['NOMBRE_EMPLEADO'],
+                dni=row['DNI_EMPLEADO'],
+                mail=row['MAIL_EMPLEADO']))
 
         return Alquiler(
             id_alquiler=row['ID_ALQUILER'],
-            vehiculo=vehiculo_obj,
+            vehiculo=vehiculos.get(row['ID_VEHICULO']),
             cliente=cliente_obj,
             empleado=empleado_obj,
-            fecha_inicio=fec_inicio,
-            fecha_fin=fec_fin,
+            fecha_inicio=row['FEC_INICIO'],
+            fecha_fin=row['FEC_FIN'],
             costo_total=row['COSTO_TOTAL'],
-            estado=estado_obj
+            estado=self.estado_manager.obtener_por_id(row['ID_ESTADO'])
         )
 
+    def __cargar(self, cursor, filtro="", params=()):
+        """Ejecuta el SELECT completo con el filtro dado y mapea todas las filas."""
+        cursor.execute(self._SELECT_ALQUILER_COMPLETO + filtro, params)
+        rows = cursor.fetchall()
+        compartidas = InstanciasCompartidas()
+        vehiculos = self.vehiculo_manager.obtener_por_ids((row['ID_VEHICULO'] for row in rows), compartidas)
+        return [self._row_to_alquiler(row, vehiculos, compartidas) for row in rows]
+
+    # ----------------------------------------------------------
+    #   DISPONIBILIDAD (VERIFICACIÓN DEFINITIVA + ÍNDICE EN MEMORIA)
+    # ----------------------------------------------------------
+    # Parámetros: vehículo, estados activos, fin, inicio, alquiler a excluir
+    # (0 si es nuevo), vehículo, fin, inicio
+    _SQL_SUPERPOSICION = f"""
+        SELECT 1 FROM ALQUILER
+        WHERE ID_VEHICULO = %s AND ID_ESTADO IN ({", ".join(["%s"] * len(ESTADOS_ALQUILER_ACTIVOS))})
+          AND FEC_INICIO < %s AND FEC_FIN > %s
+          AND ID_ALQUILER <> %s
+        UNION ALL
+        SELECT 1 FROM MANTENIMIENTO
+        WHERE ID_VEHICULO = %s
+          AND FEC_INICIO < %s AND (FEC_FIN IS NULL OR FEC_FIN > %s)
+        LIMIT 1
+    """
+
+    def hay_superposicion(self, id_vehiculo, fecha_inicio, fecha_fin, id_alquiler_excluido=None):
+        """
+        Consulta (sin bloquear) si el vehículo tiene alquileres activos o
+        mantenimientos en el rango. La usa SistemaDeAlquiler para confirmar un
+        conflicto del índice en memoria, que puede estar atrasado.
+        Retorna None si falló la BD.
+        """
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._SQL_SUPERPOSICION, (
+                id_vehiculo, *ESTADOS_ALQUILER_ACTIVOS,
+                fecha_fin, fecha_inicio,
+                id_alquiler_excluido or 0,
+                id_vehiculo,
+                fecha_fin, fecha_inicio
+            ))
+            return cursor.fetchone() is not None
+
+        except pymysql.MySQLError as e:
+            print(f"Error al verificar la disponibilidad: {e}")
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def __hay_superposicion(self, cursor, alquiler):
+        """
+        Verificación definitiva contra la BD, dentro de la transacción que escribe
+        el alquiler. Bloquea la fila del vehículo (FOR UPDATE) para que dos reservas
+        simultáneas del mismo vehículo se serialicen. La segunda ve a la primera
+        porque las conexiones del pool están en READ COMMITTED (ver
+        ConnectionPool.AISLAMIENTO): en REPEATABLE READ esta consulta leería la
+        foto fijada por las lecturas anteriores del request y no la vería.
+        """
+        cursor.execute(
+            "SELECT ID_VEHICULO FROM VEHICULO WHERE ID_VEHICULO = %s FOR UPDATE",
+            (alquiler.vehiculo.id_vehiculo,))
+
+        cursor.execute(self._SQL_SUPERPOSICION, (
+            alquiler.vehiculo.id_vehiculo, *ESTADOS_ALQUILER_ACTIVOS,
+            alquiler.fecha_fin, alquiler.fecha_inicio,
+            alquiler.id_alquiler or 0,
+            alquiler.vehiculo.id_vehiculo,
+            alquiler.fecha_fin, alquiler.fecha_inicio
+        ))
+        return cursor.fetchone() is not None
+
+    # ----------------------------------------------------------
+    #   RESUMEN DE FACTURACIÓN
+    # ----------------------------------------------------------
+    # Todo UPDATE de ALQUILER va entre estas dos llamadas: se bloquea la fila,
+    # se resta su aporte viejo al resumen y después se suma el nuevo, en la
+    # misma transacción.
+    def __quitar_del_resumen(self, cursor, id_alquiler):
+        cursor.execute("SELECT ID_ALQUILER FROM ALQUILER WHERE ID_ALQUILER = %s FOR UPDATE",
+                       (id_alquiler,))
+        ResumenFacturacionManager.aplicar_delta(cursor, id_alquiler, -1)
+
+    def __sumar_al_resumen(self, cursor, id_alquiler):
+        ResumenFacturacionManager.aplicar_delta(cursor, id_alquiler, 1)
+
+    def __sincronizar_indice(self, alquiler, id_estado=None):
+        """
+        Refleja el alquiler en el índice de disponibilidad una vez confirmado
+        en la BD (si hay una unidad de trabajo abierta, recién al cerrarla).
+        """
+        id_estado = alquiler.estado.id_estado if id_estado is None else id_estado
+        clave = ('A', alquiler.id_alquiler)
+        if id_estado in ESTADOS_ALQUILER_ACTIVOS:
+            datos = (alquiler.vehiculo.id_vehiculo, clave, alquiler.fecha_inicio, alquiler.fecha_fin)
+            self.db_connection.al_confirmar(lambda: indice_disponibilidad.registrar(*datos))
+        else:
+            id_vehiculo = alquiler.vehiculo.id_vehiculo
+            self.db_connection.al_confirmar(lambda: indice_disponibilidad.quitar(clave, id_vehiculo))
+
     # ----------------------------------------------------------
     #   CREAR
     # ----------------------------------------------------------
@@ -59,6 +201,12 @@ class AlquilerManager:
             fec_inicio_str = alquiler.fecha_inicio.strftime('%Y-%m-%d %H:%M:%S')
             fec_fin_str = alquiler.fecha_fin.strftime('%Y-%m-%d %H:%M:%S')
 
+            if (alquiler.estado.id_estado in ESTADOS_ALQUILER_ACTIVOS
+                    and self.__hay_superposicion(cursor, alquiler)):
+                print(f"❌ El vehículo {alquiler.vehiculo.id_vehiculo} ya está ocupado en esas fechas.")
+                conn.rollback()
+                return None
+
             cursor.execute("""
                 INSERT INTO ALQUILER 
                     (ID_VEHICULO, ID_EMPLEADO, ID_CLIENTE, 
@@ -76,6 +224,7 @@ class AlquilerManager:
 
             alquiler.id_alquiler = cursor.lastrowid
             conn.commit()
+            self.__sincronizar_indice(alquiler)
             return alquiler
 
         except pymysql.MySQLError as e:
@@ -86,6 +235,149 @@ class AlquilerManager:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   CREAR EN LOTE
+    # ----------------------------------------------------------
+    def guardar_lote(self, alquileres, todo_o_nada=False):
+        """
+        Inserta varios alquileres en una única transacción.
+        - Bloquea (FOR UPDATE) las filas de todos los vehículos involucrados, en
+          orden de ID para no generar deadlocks con otros lotes.
+        - Valida todos los intervalos contra la BD con una sola consulta, que lee
+          lo confirmado después de obtener los bloqueos.
+        - Valida que los pedidos del mismo lote no se pisen entre sí (gana el primero).
+        - Inserta los aceptados con un executemany.
+        Retorna una lista alineada con 'alquileres': None si se guardó (queda con
+        su id_alquiler) o el motivo del rechazo. Con todo_o_nada, un rechazo
+        cancela el lote entero. Retorna None si falló la BD (no se guarda nada).
+        """
+        if not alquileres:
+            return []
+
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            motivos = [None] * len(alquileres)
+
+            ids_vehiculos = sorted({a.vehiculo.id_vehiculo for a in alquileres})
+            marcadores = ", ".join(["%s"] * len(ids_vehiculos))
+            cursor.execute(
+                f"SELECT ID_VEHICULO FROM VEHICULO WHERE ID_VEHICULO IN ({marcadores}) "
+                "ORDER BY ID_VEHICULO FOR UPDATE",
+                ids_vehiculos)
+
+            # 1. Conflictos con lo que ya está en la BD: los intervalos pedidos se
+            #    arman como tabla derivada y se cruzan en una sola consulta. Como
+            #    la conexión está en READ COMMITTED (ConnectionPool.AISLAMIENTO),
+            #    ve lo que otro alquiler o lote confirmó mientras se esperaba el
+            #    FOR UPDATE, aunque el request ya haya leído vehículos y clientes
+            pedidos = " UNION ALL ".join(
+                ["SELECT %s AS IDX, %s AS ID_VEHICULO, "
+                 "CAST(%s AS DATETIME) AS FEC_INICIO, CAST(%s AS DATETIME) AS FEC_FIN"]
+                * len(alquileres))
+            params = []
+            for i, a in enumerate(alquileres):
+                params.extend([i, a.vehiculo.id_vehiculo, a.fecha_inicio, a.fecha_fin])
+            estados = ", ".join(["%s"] * len(ESTADOS_ALQUILER_ACTIVOS))
+
+            cursor.execute(f"""
+                SELECT R.IDX
+                FROM ({pedidos}) R
+                WHERE EXISTS (
+                        SELECT 1 FROM ALQUILER A
+                        WHERE A.ID_VEHICULO = R.ID_VEHICULO
+                          AND A.ID_ESTADO IN ({estados})
+                          AND A.FEC_INICIO < R.FEC_FIN AND A.FEC_FIN > R.FEC_INICIO)
+                   OR EXISTS (
+                        SELECT 1 FROM MANTENIMIENTO M
+                        WHERE M.ID_VEHICULO = R.ID_VEHICULO
+                          AND M.FEC_INICIO < R.FEC_FIN
+                          AND (M.FEC_FIN IS NULL OR M.FEC_FIN > R.FEC_INICIO))
+            """, params + list(ESTADOS_ALQUILER_ACTIVOS))
+            for row in cursor.fetchall():
+                motivos[row['IDX']] = "El vehículo ya tiene reservas o mantenimientos en esas fechas."
+
+            # 2. Conflictos dentro del mismo lote
+            aceptados_por_vehiculo = {}
+            for i, a in enumerate(alquileres):
+                if motivos[i] is not None:
+                    continue
+                aceptados = aceptados_por_vehiculo.setdefault(a.vehiculo.id_vehiculo, [])
+                if any(inicio < a.fecha_fin and fin > a.fecha_inicio for inicio, fin in aceptados):
+                    motivos[i] = "Se superpone con otro alquiler del mismo lote."
+                else:
+                    aceptados.append((a.fecha_inicio, a.fecha_fin))
+
+            a_insertar = [a for a, motivo in zip(alquileres, motivos) if motivo is None]
+            if todo_o_nada and len(a_insertar) < len(alquileres):
+                conn.rollback()
+                return [motivo or "Lote cancelado: otro alquiler del lote fue rechazado."
+                        for motivo in motivos]
+            if not a_insertar:
+                conn.rollback()
+                return motivos
+
+            # 3. Inserción: pymysql convierte el executemany en un único INSERT
+            #    multi-fila; lastrowid es el ID de su primera fila
+            cursor.executemany("""
+                INSERT INTO ALQUILER
+                    (ID_VEHICULO, ID_EMPLEADO, ID_CLIENTE,
+                    FEC_INICIO, FEC_FIN, COSTO_TOTAL, ID_ESTADO)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, [(
+                a.vehiculo.id_vehiculo,
+                a.empleado.id_empleado,
+                a.cliente.id_cliente,
+                a.fecha_inicio.strftime('%Y-%m-%d %H:%M:%S'),
+                a.fecha_fin.strftime('%Y-%m-%d %H:%M:%S'),
+                a.costo_total,
+                a.estado.id_estado
+            ) for a in a_insertar])
+
+            self.__asignar_ids_lote(cursor, a_insertar, cursor.lastrowid)
+            conn.commit()
+
+            for a in a_insertar:
+                self.__sincronizar_indice(a)
+
+            return motivos
+
+        except pymysql.MySQLError as e:
+            print(f"Error al guardar lote de alquileres: {e}")
+            conn.rollback()
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def __asignar_ids_lote(self, cursor, alquileres, primer_id):
+        """
+        Asigna a cada alquiler del INSERT multi-fila su ID releyendo las filas
+        en la misma transacción. No se calcula primer_id + desplazamiento: con
+        auto_increment_increment > 1 (Galera, réplicas multi-primario) o con
+        innodb_autoinc_lock_mode = 2 los IDs de un mismo INSERT no tienen por
+        qué ser consecutivos. Los vehículos están bloqueados (FOR UPDATE) y la
+        lectura ve sólo lo confirmado antes más lo propio, así que las filas con
+        ID >= primer_id de esos vehículos son exactamente las del lote, en orden.
+        """
+        pendientes = {}
+        for a in alquileres:
+            clave = (a.vehiculo.id_vehiculo, a.fecha_inicio.replace(microsecond=0))
+            pendientes.setdefault(clave, deque()).append(a)
+
+        ids_vehiculos = sorted({a.vehiculo.id_vehiculo for a in alquileres})
+        marcadores = ", ".join(["%s"] * len(ids_vehiculos))
+        cursor.execute(f"""
+            SELECT ID_ALQUILER, ID_VEHICULO, FEC_INICIO FROM ALQUILER
+            WHERE ID_ALQUILER >= %s AND ID_VEHICULO IN ({marcadores})
+            ORDER BY ID_ALQUILER
+        """, [primer_id, *ids_vehiculos])
+        for row in cursor.fetchall():
+            cola = pendientes.get((row['ID_VEHICULO'], row['FEC_INICIO']))
+            if cola:
+                cola.popleft().id_alquiler = row['ID_ALQUILER']
+
     # ----------------------------------------------------------
     #   OBTENER POR ID
     # ----------------------------------------------------------
@@ -94,9 +386,8 @@ class AlquilerManager:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM ALQUILER WHERE ID_ALQUILER = %s", (id_alquiler,))
-            row = cursor.fetchone()
-            return self.__row_to_alquiler(row)
+            alquileres = self.__cargar(cursor, "WHERE A.ID_ALQUILER = %s", (id_alquiler,))
+            return alquileres[0] if alquileres else None
 
         except pymysql.MySQLError as e:
             print(f"Error al obtener alquiler: {e}")
@@ -113,9 +404,7 @@ class AlquilerManager:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM ALQUILER")
-            rows = cursor.fetchall()
-            return [self.__row_to_alquiler(row) for row in rows]
+            return self.__cargar(cursor)
 
         except pymysql.MySQLError as e:
             print(f"Error al listar alquileres: {e}")
@@ -124,6 +413,149 @@ class AlquilerManager:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   LISTAR PAGINADO (CURSOR) CON FILTROS
+    # ----------------------------------------------------------
+    # Ordenamientos admitidos: nombre -> (columna, sentido)
+    _ORDENES = {
+        'id_desc': ('A.ID_ALQUILER', 'DESC'),
+        'id_asc': ('A.ID_ALQUILER', 'ASC'),
+        'fecha_desc': ('A.FEC_INICIO', 'DESC'),
+        'fecha_asc': ('A.FEC_INICIO', 'ASC'),
+    }
+
+    # Los campos que serializa la lista de la API, con las fechas ya formateadas
+    # por MySQL ('%%' porque la consulta lleva parámetros)
+    _SELECT_ALQUILER_PROYECCION = """
+        SELECT
+            A.ID_ALQUILER AS id,
+            CONCAT(V.PATENTE, ' - ', D.MODELO) AS vehiculo,
+            A.ID_VEHICULO AS vehiculo_id,
+            C.NOMBRE AS cliente,
+            C.ID_CLIENTE AS cliente_id,
+            E.NOMBRE AS empleado,
+            E.ID_EMPLEADO AS empleado_id,
+            DATE_FORMAT(A.FEC_INICIO, '%%Y-%%m-%%d %%H:%%i') AS fecha_inicio,
+            DATE_FORMAT(A.FEC_FIN, '%%Y-%%m-%%d %%H:%%i') AS fecha_fin,
+            A.COSTO_TOTAL AS costo_total,
+            ES.TX_ESTADO AS estado
+        FROM ALQUILER A
+        JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
+        JOIN EMPLEADO E ON A.ID_EMPLEADO = E.ID_EMPLEADO
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        JOIN ESTADO ES ON A.ID_ESTADO = ES.ID_ESTADO
+    """
+
+    def listar_paginado(self, limite=50, after_id=None, id_estado=None, desde=None, hasta=None,
+                        id_vehiculo=None, id_cliente=None, orden='id_desc'):
+        """
+        Paginación por cursor (keyset): cada página arranca después del último
+        alquiler de la anterior en lugar de usar OFFSET, así el costo no crece
+        con la cantidad de filas ni con el número de página.
+        'desde' es inclusivo y 'hasta' exclusivo (sobre FEC_INICIO).
+        Retorna (alquileres, siguiente_after_id); el cursor es None en la última página.
+        """
+        filtro, params = self._filtro_paginado(limite, after_id, id_estado, desde, hasta,
+                                                id_vehiculo, id_cliente, orden)
+
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            alquileres = self.__cargar(cursor, filtro, params)
+
+            siguiente = None
+            if len(alquileres) > limite:
+                alquileres = alquileres[:limite]
+                siguiente = alquileres[-1].id_alquiler
+
+            return alquileres, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres paginados: {e}")
+            return [], None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def listar_paginado_proyeccion(self, limite=50, after_id=None, id_estado=None, desde=None, hasta=None,
+                                   id_vehiculo=None, id_cliente=None, orden='id_desc'):
+        """
+        Igual que listar_paginado (mismos filtros y cursor) pero retorna las
+        filas de _SELECT_ALQUILER_PROYECCION tal como las serializa la API,
+        sin armar el grafo de objetos de cada alquiler.
+        """
+        filtro, params = self._filtro_paginado(limite, after_id, id_estado, desde, hasta,
+                                                id_vehiculo, id_cliente, orden)
+
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._SELECT_ALQUILER_PROYECCION + filtro, params)
+            filas = cursor.fetchall()
+
+            siguiente = None
+            if len(filas) > limite:
+                filas = filas[:limite]
+                siguiente = filas[-1]['id']
+
+            return filas, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres paginados: {e}")
+            return [], None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _filtro_paginado(self, limite, after_id, id_estado, desde, hasta, id_vehiculo, id_cliente, orden):
+        """WHERE/ORDER BY/LIMIT de la paginación por cursor (sobre el alias A de ALQUILER)."""
+        columna, sentido = self._ORDENES.get(orden, self._ORDENES['id_desc'])
+        comparador = '<' if sentido == 'DESC' else '>'
+
+        condiciones = []
+        params = []
+
+        if id_estado is not None:
+            condiciones.append("A.ID_ESTADO = %s")
+            params.append(id_estado)
+        if id_vehiculo is not None:
+            condiciones.append("A.ID_VEHICULO = %s")
+            params.append(id_vehiculo)
+        if id_cliente is not None:
+            condiciones.append("A.ID_CLIENTE = %s")
+            params.append(id_cliente)
+        if desde is not None:
+            condiciones.append("A.FEC_INICIO >= %s")
+            params.append(desde)
+        if hasta is not None:
+            condiciones.append("A.FEC_INICIO < %s")
+            params.append(hasta)
+
+        if after_id is not None:
+            if columna == 'A.ID_ALQUILER':
+                condiciones.append(f"A.ID_ALQUILER {comparador} %s")
+                params.append(after_id)
+            else:
+                # Se desempata por ID para que el cursor sea único aunque se repitan fechas
+                fecha_cursor = "(SELECT FEC_INICIO FROM ALQUILER WHERE ID_ALQUILER = %s)"
+                condiciones.append(
+                    f"(A.FEC_INICIO {comparador} {fecha_cursor} "
+                    f"OR (A.FEC_INICIO = {fecha_cursor} AND A.ID_ALQUILER {comparador} %s))"
+                )
+                params.extend([after_id, after_id, after_id])
+
+        filtro = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+        filtro += f" ORDER BY {columna} {sentido}"
+        if columna != 'A.ID_ALQUILER':
+            filtro += f", A.ID_ALQUILER {sentido}"
+        # Se pide una fila de más para saber si hay otra página
+        filtro += " LIMIT %s"
+        params.append(limite + 1)
+        return filtro, params
+
     # ----------------------------------------------------------
     #   ACTUALIZAR
     # ----------------------------------------------------------
@@ -139,6 +571,13 @@ class AlquilerManager:
             fec_inicio_str = alquiler.fecha_inicio.strftime('%Y-%m-%d %H:%M:%S')
             fec_fin_str = alquiler.fecha_fin.strftime('%Y-%m-%d %H:%M:%S')
 
+            if (alquiler.estado.id_estado in ESTADOS_ALQUILER_ACTIVOS
+                    and self.__hay_superposicion(cursor, alquiler)):
+                print(f"❌ El vehículo {alquiler.vehiculo.id_vehiculo} ya está ocupado en esas fechas.")
+                conn.rollback()
+                return False
+
+            self.__quitar_del_resumen(cursor, alquiler.id_alquiler)
             cursor.execute("""
                 UPDATE ALQUILER SET 
                     ID_VEHICULO = %s,
@@ -159,9 +598,12 @@ class AlquilerManager:
                 alquiler.estado.id_estado,
                 alquiler.id_alquiler
             ))
+            actualizados = cursor.rowcount
+            self.__sumar_al_resumen(cursor, alquiler.id_alquiler)
 
             conn.commit()
-            return cursor.rowcount > 0
+            self.__sincronizar_indice(alquiler)
+            return actualizados > 0
 
         except pymysql.MySQLError as e:
             print(f"Error al actualizar alquiler: {e}")
@@ -188,6 +630,7 @@ class AlquilerManager:
 
             CANCELADO_ID = 5  # Ajustá según tu tabla ESTADO
 
+            self.__quitar_del_resumen(cursor, alquiler.id_alquiler)
             cursor.execute("""
                 UPDATE ALQUILER SET 
                     ID_ESTADO = %s,
@@ -200,9 +643,12 @@ class AlquilerManager:
                 fec_fin_str,
                 alquiler.id_alquiler
             ))
+            actualizados = cursor.rowcount
+            self.__sumar_al_resumen(cursor, alquiler.id_alquiler)
 
             conn.commit()
-            return cursor.rowcount > 0
+            self.__sincronizar_indice(alquiler, CANCELADO_ID)
+            return actualizados > 0
 
         except pymysql.MySQLError as e:
             print(f"Error al cancelar alquiler: {e}")
@@ -227,7 +673,8 @@ class AlquilerManager:
             # Datos para el Alquiler
             fec_fin_str = alquiler.fecha_fin.strftime('%Y-%m-%d %H:%M:%S')
             
-            # 1. Actualizar ALQUILER
+            # 1. Actualizar ALQUILER (y su aporte al resumen de facturación)
+            self.__quitar_del_resumen(cursor, alquiler.id_alquiler)
             cursor.execute("""
                 UPDATE ALQUILER SET 
                     FEC_FIN = %s,
@@ -240,6 +687,7 @@ class AlquilerManager:
                 alquiler.estado.id_estado,
                 alquiler.id_alquiler
             ))
+            self.__sumar_al_resumen(cursor, alquiler.id_alquiler)
 
             ESTADO_DISPONIBLE = 1
             
@@ -255,6 +703,8 @@ class AlquilerManager:
             ))
 
             conn.commit()
+            self.__sincronizar_indice(alquiler)
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('VEHICULO'))
             return True
 
         except pymysql.MySQLError as e:
@@ -273,9 +723,7 @@ class AlquilerManager:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM ALQUILER WHERE ID_CLIENTE = %s", (id_cliente,))
-            rows = cursor.fetchall()
-            return [self.__row_to_alquiler(row) for row in rows]
+            return self.__cargar(cursor, "WHERE A.ID_CLIENTE = %s", (id_cliente,))
 
         except pymysql.MySQLError as e:
             print(f"Error al listar alquileres por cliente: {e}")
@@ -284,14 +732,19 @@ class AlquilerManager:
             cursor.close()
             conn.close()
 
+    # Parámetros: vehículo y ESTADOS_ALQUILER_ACTIVOS (también lo usa el manager async)
+    _FILTRO_ACTIVOS_POR_VEHICULO = (
+        "WHERE A.ID_VEHICULO = %s AND A.ID_ESTADO IN ("
+        + ", ".join(["%s"] * len(ESTADOS_ALQUILER_ACTIVOS)) + ")"
+    )
+
     def listar_activo_por_vehiculo(self, id_vehiculo):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM ALQUILER WHERE ID_VEHICULO = %s AND (ID_ESTADO = 7 OR ID_ESTADO = 6)", (id_vehiculo,))
-            rows = cursor.fetchall()
-            return [self.__row_to_alquiler(row) for row in rows]
+            return self.__cargar(cursor, self._FILTRO_ACTIVOS_POR_VEHICULO,
+                                 (id_vehiculo, *ESTADOS_ALQUILER_ACTIVOS))
 
         except pymysql.MySQLError as e:
             print(f"Error al listar alquileres por vehículo: {e}")
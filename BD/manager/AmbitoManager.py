@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.Ambito import Ambito
 from ..db_conection import DBConnection
+from ..cache import cache_referencias
 
 
 class AmbitoManager:
@@ -22,9 +23,9 @@ class AmbitoManager:
         )
 
     # ----------------------------------------------------------
-    #   OBTENER POR ID
+    #   CARGA DE LA TABLA COMPLETA (PARA EL CACHE)
     # ----------------------------------------------------------
-    def obtener_por_id(self, id_ambito):
+    def __cargar_tabla(self):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
@@ -32,40 +33,27 @@ class AmbitoManager:
             cursor.execute("""
                 SELECT ID_AMBITO, TX_AMBITO
                 FROM AMBITO
-                WHERE ID_AMBITO = %s
-            """, (id_ambito,))
+            """)
 
-            row = cursor.fetchone()
-            return self.__row_to_ambito(row)
+            rows = cursor.fetchall()
+            return {row['ID_AMBITO']: self.__row_to_ambito(row) for row in rows}
 
         except pymysql.MySQLError as e:
-            print(f"Error al obtener ámbito: {e}")
+            print(f"Error al listar ámbitos: {e}")
             return None
 
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    def obtener_por_id(self, id_ambito):
+        return cache_referencias.obtener('AMBITO', id_ambito, self.__cargar_tabla)
+
     # ----------------------------------------------------------
     #   LISTAR TODOS
     # ----------------------------------------------------------
     def listar_todos(self):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT ID_AMBITO, TX_AMBITO
-                FROM AMBITO
-            """)
-
-            rows = cursor.fetchall()
-            return [self.__row_to_ambito(row) for row in rows]
-
-        except pymysql.MySQLError as e:
-            print(f"Error al listar ámbitos: {e}")
-            return []
-
-        finally:
-            cursor.close()
-            conn.close()
+        return list(cache_referencias.obtener_tabla('AMBITO', self.__cargar_tabla).values())
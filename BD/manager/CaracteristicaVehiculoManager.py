@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.CaracteristicaVehiculo import CaracteristicaVehiculo
 from ..db_conection import DBConnection
+from ..cache import versiones_tablas
 from .CategoriaManager import CategoriaManager
 
 
@@ -45,6 +46,7 @@ class CaracteristicaVehiculoManager:
 
             caracteristica.id_caracteristica = cursor.lastrowid
             conn.commit()
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('DETALLE_VEHICULO'))
             return caracteristica
 
         except pymysql.MySQLError as e:
@@ -119,6 +121,7 @@ class CaracteristicaVehiculoManager:
             print("ROWCOUNT:", cursor.rowcount)  # <--- SUPER IMPORTANTE
 
             conn.commit()
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('DETALLE_VEHICULO'))
             return True
 
         except pymysql.MySQLError as e:
@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.Categoria import Categoria
 from ..db_conection import DBConnection
+from ..cache import cache_referencias
 
 
 class CategoriaManager:
@@ -20,9 +21,9 @@ class CategoriaManager:
         )
 
     # ----------------------------------------------------------
-    #   OBTENER POR ID
+    #   CARGA DE LA TABLA COMPLETA (PARA EL CACHE)
     # ----------------------------------------------------------
-    def obtener_por_id(self, id_categoria):
+    def __cargar_tabla(self):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
@@ -30,40 +31,27 @@ class CategoriaManager:
             cursor.execute("""
                 SELECT ID_CATEGORIA, TX_CATEGORIA
                 FROM CATEGORIA
-                WHERE ID_CATEGORIA = %s
-            """, (id_categoria,))
+            """)
 
-            row = cursor.fetchone()
-            return self.__row_to_categoria(row)
+            rows = cursor.fetchall()
+            return {row['ID_CATEGORIA']: self.__row_to_categoria(row) for row in rows}
 
         except pymysql.MySQLError as e:
-            print(f"Error al obtener categoría: {e}")
+            print(f"Error al listar categorías: {e}")
             return None
 
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    def obtener_por_id(self, id_categoria):
+        return cache_referencias.obtener('CATEGORIA', id_categoria, self.__cargar_tabla)
+
     # ----------------------------------------------------------
     #   LISTAR TODOS
     # ----------------------------------------------------------
     def listar_todos(self):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT ID_CATEGORIA, TX_CATEGORIA
-                FROM CATEGORIA
-            """)
-
-            rows = cursor.fetchall()
-            return [self.__row_to_categoria(row) for row in rows]
-
-        except pymysql.MySQLError as e:
-            print(f"Error al listar categorías: {e}")
-            return []
-
-        finally:
-            cursor.close()
-            conn.close()
+        return list(cache_referencias.obtener_tabla('CATEGORIA', self.__cargar_tabla).values())
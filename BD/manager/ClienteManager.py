@@ -86,6 +86,27 @@ class ClienteManager:
             cursor.close()
             conn.close()
 
+    # --- 3b. Listar proyección (para la API, sin construir objetos) ---
+    def listar_proyeccion(self):
+        """Filas {id, nombre, dni, mail} listas para serializar."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT ID_CLIENTE AS id, NOMBRE AS nombre, DNI AS dni, MAIL AS mail
+                FROM CLIENTE
+            """)
+            return cursor.fetchall()
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar clientes: {e}")
+            return []
+
+        finally:
+            cursor.close()
+            conn.close()
+
     # --- 4. Actualizar (UPDATE) ---
     def actualizar(self, cliente):
         conn = self.db_connection.get_connection()
@@ -94,6 +94,26 @@ class EmpleadoManager:
             cursor.close()
             conn.close()
 
+    def listar_proyeccion(self):
+        """Filas {id, nombre, dni, mail} listas para serializar, sin construir objetos."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT ID_EMPLEADO AS id, NOMBRE AS nombre, DNI AS dni, MAIL AS mail
+                FROM EMPLEADO
+            """)
+            return cursor.fetchall()
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar empleados: {e}")
+            return []
+
+        finally:
+            cursor.close()
+            conn.close()
+
     # ----------------------------------------------------------
     # ACTUALIZAR
     # ----------------------------------------------------------
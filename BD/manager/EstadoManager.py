@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.Estado import Estado
 from ..db_conection import DBConnection
+from ..cache import cache_referencias
 from .AmbitoManager import AmbitoManager
 
 
@@ -28,9 +29,9 @@ class EstadoManager:
         )
 
     # ----------------------------------------------------------
-    #   OBTENER POR ID
+    #   CARGA DE LA TABLA COMPLETA (PARA EL CACHE)
     # ----------------------------------------------------------
-    def obtener_por_id(self, id_estado):
+    def __cargar_tabla(self):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
@@ -38,62 +39,33 @@ class EstadoManager:
             cursor.execute("""
                 SELECT ID_ESTADO, TX_ESTADO, ID_AMBITO
                 FROM ESTADO
-                WHERE ID_ESTADO = %s
-            """, (id_estado,))
+            """)
 
-            row = cursor.fetchone()
-            return self.__row_to_estado(row)
+            rows = cursor.fetchall()
+            return {row['ID_ESTADO']: self.__row_to_estado(row) for row in rows}
 
         except pymysql.MySQLError as e:
-            print(f"Error al obtener estado: {e}")
+            print(f"Error al listar estados: {e}")
             return None
 
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    def obtener_por_id(self, id_estado):
+        return cache_referencias.obtener('ESTADO', id_estado, self.__cargar_tabla)
+
     # ----------------------------------------------------------
     #   LISTAR TODOS
     # ----------------------------------------------------------
     def listar_todos(self):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT ID_ESTADO, TX_ESTADO, ID_AMBITO
-                FROM ESTADO
-            """)
-
-            rows = cursor.fetchall()
-            return [self.__row_to_estado(row) for row in rows]
-
-        except pymysql.MySQLError as e:
-            print(f"Error al listar estados: {e}")
-            return []
-
-        finally:
-            cursor.close()
-            conn.close()
+        return list(cache_referencias.obtener_tabla('ESTADO', self.__cargar_tabla).values())
 
     def listar_por_ambito(self, ambito_id):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT ID_ESTADO, TX_ESTADO, ID_AMBITO
-                FROM ESTADO
-                WHERE ID_AMBITO = %s
-            """, (ambito_id,))
-
-            rows = cursor.fetchall()
-            return [self.__row_to_estado(row) for row in rows]
-
-        except pymysql.MySQLError as e:
-            print(f"Error al listar estados por ámbito: {e}")
-            return []
-
-        finally:
-            cursor.close()
-            conn.close()
+        return [
+            e for e in self.listar_todos()
+            if e.ambito is not None and e.ambito.id_ambito == ambito_id
+        ]
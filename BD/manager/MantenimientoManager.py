@@ -3,6 +3,7 @@ from datetime import datetime
 
 from BACK.modelos.Mantenimiento import Mantenimiento
 from ..db_conection import DBConnection
+from ..indice_disponibilidad import indice_disponibilidad
 from .VehiculoManager import VehiculoManager 
 from .TipoMantenimientoManager import TipoMantenimientoManager 
 
@@ -18,11 +19,12 @@ class MantenimientoManager:
     # ----------------------------------------------------------
     #   MAPEO FILA → OBJETO
     # ----------------------------------------------------------
-    def __row_to_mantenimiento(self, row):
+    def __row_to_mantenimiento(self, row, vehiculos):
         if row is None:
             return None
 
-        vehiculo_obj = self.vehiculo_manager.obtener_por_id(row["ID_VEHICULO"])
+        # 'vehiculos' viene de VehiculoManager.obtener_por_ids para todas las filas juntas
+        vehiculo_obj = vehiculos.get(row["ID_VEHICULO"])
         tipo_mto_obj = self.tipo_mantenimiento_manager.obtener_por_id(row["ID_TIPO_MANTENIMIENTO"])
 
         fec_inicio = (
@@ -68,6 +70,9 @@ class MantenimientoManager:
 
             mantenimiento.id_mantenimiento = cursor.lastrowid
             conn.commit()
+            # El vehículo se relee de la BD en la próxima consulta de disponibilidad
+            id_vehiculo = mantenimiento.vehiculo.id_vehiculo
+            self.db_connection.al_confirmar(lambda: indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo))
             return mantenimiento
 
         except pymysql.MySQLError as e:
@@ -94,7 +99,10 @@ class MantenimientoManager:
             """, (id_mantenimiento,))
 
             row = cursor.fetchone()
-            return self.__row_to_mantenimiento(row)
+            if row is None:
+                return None
+            vehiculos = self.vehiculo_manager.obtener_por_ids([row["ID_VEHICULO"]])
+            return self.__row_to_mantenimiento(row, vehiculos)
 
         finally:
             cursor.close()
@@ -103,12 +111,20 @@ class MantenimientoManager:
     # ----------------------------------------------------------
     #   FINALIZAR MANTENIMIENTO (UPDATE)
     # ----------------------------------------------------------
+    def __vehiculo_de(self, cursor, id_mantenimiento):
+        """Vehículo del mantenimiento antes de modificarlo (para el índice de disponibilidad)."""
+        cursor.execute("SELECT ID_VEHICULO FROM MANTENIMIENTO WHERE ID_MANTENIMIENTO = %s",
+                       (id_mantenimiento,))
+        row = cursor.fetchone()
+        return row['ID_VEHICULO'] if row else None
+
     def finalizar_mantenimiento(self, id_mantenimiento, fecha_fin, costo):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
         try:
             fec_fin_str = fecha_fin.strftime("%Y-%m-%d %H:%M:%S")
+            id_vehiculo = self.__vehiculo_de(cursor, id_mantenimiento)
 
             cursor.execute("""
                 UPDATE MANTENIMIENTO
@@ -117,6 +133,8 @@ class MantenimientoManager:
             """, (fec_fin_str, costo, id_mantenimiento))
 
             conn.commit()
+            self.db_connection.al_confirmar(
+                lambda: indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo, clave=('M', id_mantenimiento)))
             return cursor.rowcount > 0
 
         except pymysql.MySQLError as e:
@@ -140,7 +158,8 @@ class MantenimientoManager:
             """, (id_vehiculo,))
 
             rows = cursor.fetchall()
-            return [self.__row_to_mantenimiento(row) for row in rows]
+            vehiculos = self.vehiculo_manager.obtener_por_ids(row["ID_VEHICULO"] for row in rows)
+            return [self.__row_to_mantenimiento(row, vehiculos) for row in rows]
 
         finally:
             cursor.close()
@@ -151,12 +170,15 @@ class MantenimientoManager:
         cursor = conn.cursor()
 
         try:
+            id_vehiculo = self.__vehiculo_de(cursor, id_mantenimiento)
             cursor.execute("""
                 DELETE FROM MANTENIMIENTO
                 WHERE ID_MANTENIMIENTO = %s
             """, (id_mantenimiento,))
 
             conn.commit()
+            self.db_connection.al_confirmar(
+                lambda: indice_disponibilidad.quitar(('M', id_mantenimiento), id_vehiculo))
             return cursor.rowcount > 0
 
         except pymysql.MySQLError as e:
@@ -179,6 +201,7 @@ class MantenimientoManager:
             """, (id_vehiculo,))
 
             conn.commit()
+            self.db_connection.al_confirmar(lambda: indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo))
             return cursor.rowcount > 0
 
         except pymysql.MySQLError as e:
@@ -200,6 +223,7 @@ class MantenimientoManager:
                 mantenimiento.fecha_fin.strftime("%Y-%m-%d %H:%M:%S")
                 if mantenimiento.fecha_fin else None
             )
+            id_vehiculo_anterior = self.__vehiculo_de(cursor, mantenimiento.id_mantenimiento)
 
             cursor.execute("""
                 UPDATE MANTENIMIENTO
@@ -221,6 +245,11 @@ class MantenimientoManager:
             ))
 
             conn.commit()
+            # Pudo cambiar de vehículo: se descartan el anterior y el actual
+            clave, id_vehiculo = ('M', mantenimiento.id_mantenimiento), mantenimiento.vehiculo.id_vehiculo
+            self.db_connection.al_confirmar(
+                lambda: indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo_anterior, clave=clave))
+            self.db_connection.al_confirmar(lambda: indice_disponibilidad.invalidar(id_vehiculo=id_vehiculo))
             return True
 
         except pymysql.MySQLError as e:
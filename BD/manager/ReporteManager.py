@@ -1,99 +1,316 @@
 # TPIDAO/BD/manager/ReporteManager.py
 import pymysql
+from pymysql.cursors import Cursor, SSCursor, SSDictCursor
 from ..db_conection import DBConnection
 
 class ReporteManager:
+    # Filas que se piden por vez al servidor cuando se lee en streaming
+    TAMANIO_LOTE_STREAMING = 1000
+
+    # Columnas (en orden) de cada fila que devuelve iterar_exportacion_alquileres
+    COLUMNAS_EXPORTACION = [
+        'ID_ALQUILER', 'FEC_INICIO', 'FEC_FIN', 'COSTO_TOTAL', 'ESTADO',
+        'ID_CLIENTE', 'CLIENTE', 'DNI', 'ID_EMPLEADO',
+        'ID_VEHICULO', 'PATENTE', 'MODELO', 'ANIO', 'CATEGORIA',
+    ]
+
     def __init__(self):
         self.db_connection = DBConnection()
 
+    # Hacemos JOIN para mostrar Patente y Modelo, no solo IDs
+    _SQL_RANKING_VEHICULOS = """
+        SELECT V.PATENTE, D.MODELO, COUNT(A.ID_ALQUILER) as CANTIDAD
+        FROM ALQUILER A
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        GROUP BY V.ID_VEHICULO, V.PATENTE, D.MODELO
+        ORDER BY CANTIDAD DESC
+        LIMIT 5
+    """
+
     def obtener_ranking_vehiculos(self):
         """Top vehículos más alquilados."""
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
         try:
-            # Hacemos JOIN para mostrar Patente y Modelo, no solo IDs
-            sql = """
-                SELECT V.PATENTE, D.MODELO, COUNT(A.ID_ALQUILER) as CANTIDAD
-                FROM ALQUILER A
-                JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
-                JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
-                GROUP BY V.ID_VEHICULO, V.PATENTE, D.MODELO
-                ORDER BY CANTIDAD DESC
-                LIMIT 5
-            """
-            cursor.execute(sql)
+            cursor.execute(self._SQL_RANKING_VEHICULOS)
             return cursor.fetchall()
         finally:
             cursor.close()
             conn.close()
 
 
+    # El nombre del mes se arma con DATE_FORMAT('%M') sobre el primer día del mes
+    _SQL_FACTURACION_MENSUAL = """
+        SELECT 
+            DATE_FORMAT(MAKEDATE(ANIO, 1) + INTERVAL (MES - 1) MONTH, '%%M') as MES_NOMBRE, 
+            MES as MES_NUMERO,
+            SUM(TOTAL_FACTURADO) as TOTAL
+        FROM RESUMEN_FACTURACION_MENSUAL
+        WHERE ANIO = %s AND CANTIDAD_FINALIZADOS > 0
+        GROUP BY MES_NUMERO, MES_NOMBRE
+        ORDER BY MES_NUMERO ASC
+    """
+
     def obtener_facturacion_mensual(self, anio):
-        """Suma de COSTO_TOTAL agrupado por mes para un año específico."""
+        """
+        Suma de COSTO_TOTAL de los alquileres finalizados, por mes de FEC_FIN,
+        para un año. Se lee de RESUMEN_FACTURACION_MENSUAL (ver
+        ResumenFacturacionManager), no de ALQUILER.
+        """
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
         try:
-            # DATE_FORMAT('%Y-%m') agrupa por "2023-11", "2023-12", etc.
-            sql = """
-                SELECT 
-                    DATE_FORMAT(FEC_FIN, '%%M') as MES_NOMBRE, 
-                    MONTH(FEC_FIN) as MES_NUMERO,
-                    SUM(COSTO_TOTAL) as TOTAL
-                FROM ALQUILER
-                WHERE YEAR(FEC_FIN) = %s AND ID_ESTADO = 7
-                GROUP BY MES_NUMERO, MES_NOMBRE
-                ORDER BY MES_NUMERO ASC
-            """
-            cursor.execute(sql, (anio,))
+            cursor.execute(self._SQL_FACTURACION_MENSUAL, (anio,))
             return cursor.fetchall()
         finally:
             cursor.close()
             conn.close()
 
 
+    _SQL_ALQUILERES_POR_PERIODO = """
+        SELECT A.*, C.NOMBRE as CLIENTE, D.MODELO, V.PATENTE
+        FROM ALQUILER A
+        JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        WHERE A.FEC_INICIO BETWEEN %s AND %s
+    """
+
     def alquileres_por_periodo(self, fecha_desde, fecha_hasta):
         """Cantidad de alquileres iniciados en un rango de fechas."""
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
         try:
-            sql = """
-                SELECT A.*, C.NOMBRE as CLIENTE, D.MODELO, V.PATENTE
-                FROM ALQUILER A
-                JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
-                JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
-                JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
-                WHERE A.FEC_INICIO BETWEEN %s AND %s
-            """
-            cursor.execute(sql, (fecha_desde, fecha_hasta))
+            cursor.execute(self._SQL_ALQUILERES_POR_PERIODO, (fecha_desde, fecha_hasta))
             return cursor.fetchall()
         finally:
             cursor.close()
             conn.close()
+
+    def iterar_alquileres_por_periodo(self, fecha_desde, fecha_hasta):
+        """
+        Igual que alquileres_por_periodo pero como generador: usa un cursor del
+        lado del servidor (SSDictCursor) y trae las filas de a
+        TAMANIO_LOTE_STREAMING, así la memoria no depende del tamaño del rango.
+        Usa una conexión dedicada porque se consume después de que el request
+        devolvió su conexión; se libera al agotar (o cerrar) el generador.
+        """
+        conn = self.db_connection.get_connection(dedicada=True)
+        cursor = conn.cursor(SSDictCursor)
+        try:
+            cursor.execute(self._SQL_ALQUILERES_POR_PERIODO, (fecha_desde, fecha_hasta))
+            while True:
+                filas = cursor.fetchmany(self.TAMANIO_LOTE_STREAMING)
+                if not filas:
+                    break
+                yield from filas
+        finally:
+            cursor.close()
+            conn.close()
             
             
+    _SQL_EXPORTACION_ALQUILERES = """
+        SELECT
+            A.ID_ALQUILER, A.FEC_INICIO, A.FEC_FIN, A.COSTO_TOTAL,
+            E.TX_ESTADO,
+            C.ID_CLIENTE, C.NOMBRE, C.DNI,
+            A.ID_EMPLEADO,
+            V.ID_VEHICULO, V.PATENTE, D.MODELO, D.`AÑO`, CA.TX_CATEGORIA
+        FROM ALQUILER A
+        JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        JOIN CATEGORIA CA ON D.ID_CATEGORIA = CA.ID_CATEGORIA
+        JOIN ESTADO E ON A.ID_ESTADO = E.ID_ESTADO
+        WHERE A.FEC_INICIO >= %s AND A.FEC_INICIO < %s
+        ORDER BY A.ID_ALQUILER
+    """
+
+    def iterar_exportacion_alquileres(self, fecha_desde, fecha_hasta, tamanio_lote=None):
+        """
+        Historial de alquileres iniciados en [fecha_desde, fecha_hasta) (el
+        final es exclusivo: para incluir un día entero se pasa el día
+        siguiente), con cliente, vehículo y estado, para exportar. Es un generador de lotes (listas de tuplas en el
+        orden de COLUMNAS_EXPORTACION) leídos con un cursor del servidor, así la
+        memoria queda acotada al tamaño del lote.
+        """
+        tamanio_lote = tamanio_lote or self.TAMANIO_LOTE_STREAMING
+        conn = self.db_connection.get_connection(dedicada=True)
+        cursor = conn.cursor(SSCursor)
+        try:
+            cursor.execute(self._SQL_EXPORTACION_ALQUILERES, (fecha_desde, fecha_hasta))
+            while True:
+                lote = cursor.fetchmany(tamanio_lote)
+                if not lote:
+                    break
+                yield lote
+        finally:
+            cursor.close()
+            conn.close()
+
+    # Parámetros: inicio, inicio, estado cancelado, fin, inicio
+    _SQL_ANALITICA_ALQUILERES = """
+        SELECT
+            A.ID_VEHICULO, D.ID_CATEGORIA,
+            TIMESTAMPDIFF(SECOND, %s, A.FEC_INICIO),
+            TIMESTAMPDIFF(SECOND, %s, A.FEC_FIN),
+            A.COSTO_TOTAL
+        FROM ALQUILER A
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        WHERE A.ID_ESTADO <> %s AND A.FEC_INICIO < %s AND A.FEC_FIN > %s
+    """
+
+    def datos_analitica_periodo(self, inicio, fin, id_cancelado=5):
+        """
+        Datos en columnas para la analítica de un período [inicio, fin):
+        - 'alquileres': tupla de columnas (ID_VEHICULO, ID_CATEGORIA, inicio,
+          fin, COSTO_TOTAL) de los alquileres no cancelados que tocan el
+          período. Las fechas vienen como segundos desde 'inicio', calculados
+          en la BD, así no hay que convertir datetimes fila por fila.
+        - 'categorias': {ID_CATEGORIA: TX_CATEGORIA}
+        - 'vehiculos': [(ID_VEHICULO, PATENTE, MODELO)] de toda la flota.
+        """
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor(Cursor)  # tuplas: más livianas que dicts para armar columnas
+        try:
+            cursor.execute(self._SQL_ANALITICA_ALQUILERES, (inicio, inicio, id_cancelado, fin, inicio))
+            filas = cursor.fetchall()
+            alquileres = tuple(zip(*filas)) if filas else ((), (), (), (), ())
+
+            cursor.execute("SELECT ID_CATEGORIA, TX_CATEGORIA FROM CATEGORIA")
+            categorias = dict(cursor.fetchall())
+
+            cursor.execute("""
+                SELECT V.ID_VEHICULO, V.PATENTE, D.MODELO
+                FROM VEHICULO V
+                JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+                ORDER BY V.ID_VEHICULO
+            """)
+            vehiculos = cursor.fetchall()
+
+            return {'alquileres': alquileres, 'categorias': categorias, 'vehiculos': vehiculos}
+        finally:
+            cursor.close()
+            conn.close()
+
+    _SQL_INTERVALOS_UTILIZACION = """
+        SELECT ID_VEHICULO, 'A',
+               TIMESTAMPDIFF(SECOND, %s, GREATEST(FEC_INICIO, %s)),
+               TIMESTAMPDIFF(SECOND, %s, LEAST(FEC_FIN, %s))
+        FROM ALQUILER
+        WHERE ID_ESTADO <> %s AND FEC_INICIO < %s AND FEC_FIN > %s
+        UNION ALL
+        SELECT ID_VEHICULO, 'M',
+               TIMESTAMPDIFF(SECOND, %s, GREATEST(FEC_INICIO, %s)),
+               TIMESTAMPDIFF(SECOND, %s, LEAST(COALESCE(FEC_FIN, %s), %s))
+        FROM MANTENIMIENTO
+        WHERE FEC_INICIO < %s AND (FEC_FIN IS NULL OR FEC_FIN > %s)
+    """
+
+    @staticmethod
+    def _params_intervalos_utilizacion(inicio, fin, id_cancelado):
+        return (inicio, inicio, inicio, fin, id_cancelado, fin, inicio,
+                inicio, inicio, inicio, fin, fin, fin, inicio)
+
+    def intervalos_utilizacion(self, inicio, fin, id_cancelado=5):
+        """
+        Intervalos de ocupación de la ventana [inicio, fin), recortados a ella:
+        - 'intervalos': [(ID_VEHICULO, tipo, desde, hasta)] con tipo 'A'
+          (alquiler no cancelado) o 'M' (mantenimiento; si no tiene FEC_FIN
+          sigue abierto hasta el final de la ventana). desde/hasta en segundos
+          desde 'inicio', calculados en la BD.
+        - 'vehiculos': [(ID_VEHICULO, PATENTE, MODELO, ID_CATEGORIA, TX_CATEGORIA)]
+        """
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor(Cursor)
+        try:
+            cursor.execute(self._SQL_INTERVALOS_UTILIZACION,
+                           self._params_intervalos_utilizacion(inicio, fin, id_cancelado))
+            intervalos = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT V.ID_VEHICULO, V.PATENTE, D.MODELO, D.ID_CATEGORIA, CA.TX_CATEGORIA
+                FROM VEHICULO V
+                JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+                JOIN CATEGORIA CA ON D.ID_CATEGORIA = CA.ID_CATEGORIA
+                ORDER BY V.ID_VEHICULO
+            """)
+            return {'intervalos': intervalos, 'vehiculos': cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
+    _SQL_HISTORIAL_CLIENTE = """
+        SELECT 
+            A.ID_ALQUILER, 
+            D.MODELO, 
+            V.PATENTE, 
+            A.FEC_INICIO, 
+            A.FEC_FIN, 
+            A.COSTO_TOTAL,
+            E.TX_ESTADO as ESTADO
+        FROM ALQUILER A
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        JOIN ESTADO E ON A.ID_ESTADO = E.ID_ESTADO
+        WHERE A.ID_CLIENTE = %s
+        ORDER BY A.FEC_INICIO DESC
+    """
+
     def historial_cliente_detallado(self, id_cliente):
         """Listado detallado para un cliente específico."""
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
         try:
-            sql = """
-                SELECT 
-                    A.ID_ALQUILER, 
-                    D.MODELO, 
-                    V.PATENTE, 
-                    A.FEC_INICIO, 
-                    A.FEC_FIN, 
-                    A.COSTO_TOTAL,
-                    E.TX_ESTADO as ESTADO
-                FROM ALQUILER A
-                JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
-                JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
-                JOIN ESTADO E ON A.ID_ESTADO = E.ID_ESTADO
-                WHERE A.ID_CLIENTE = %s
-                ORDER BY A.FEC_INICIO DESC
-            """
-            cursor.execute(sql, (id_cliente,))
+            cursor.execute(self._SQL_HISTORIAL_CLIENTE, (id_cliente,))
             return cursor.fetchall()
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+
+    # Rango [inicio_mes, fin_mes) en vez de MONTH()/YEAR() para poder usar índices
+    _SQL_KPIS_TOTALES = """
+        SELECT
+            (SELECT COUNT(*) FROM VEHICULO
+             WHERE ID_ESTADO = %s) as VEHICULOS_DISPONIBLES,
+            (SELECT COUNT(*) FROM ALQUILER
+             WHERE ID_ESTADO = %s) as ALQUILERES_ACTIVOS,
+            (SELECT COALESCE(SUM(COSTO_TOTAL), 0) FROM ALQUILER
+             WHERE ID_ESTADO = %s AND FEC_FIN >= %s AND FEC_FIN < %s) as INGRESOS_MES
+    """
+
+    _SQL_KPIS_ULTIMOS = """
+        SELECT
+            A.ID_ALQUILER,
+            CONCAT(V.PATENTE, ' - ', D.MODELO) as VEHICULO,
+            C.NOMBRE as CLIENTE,
+            A.FEC_INICIO,
+            E.TX_ESTADO as ESTADO,
+            A.COSTO_TOTAL
+        FROM ALQUILER A
+        JOIN VEHICULO V ON A.ID_VEHICULO = V.ID_VEHICULO
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        JOIN CLIENTE C ON A.ID_CLIENTE = C.ID_CLIENTE
+        JOIN ESTADO E ON A.ID_ESTADO = E.ID_ESTADO
+        ORDER BY A.ID_ALQUILER DESC
+        LIMIT %s
+    """
+
+    def obtener_kpis_dashboard(self, inicio_mes, fin_mes, id_disponible, id_en_curso,
+                               id_finalizado, cantidad_recientes=5):
+        """Totales del tablero de control y últimos alquileres, agregados en la BD."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(self._SQL_KPIS_TOTALES, (id_disponible, id_en_curso, id_finalizado, inicio_mes, fin_mes))
+            kpis = cursor.fetchone()
+
+            cursor.execute(self._SQL_KPIS_ULTIMOS, (cantidad_recientes,))
+            kpis['ULTIMOS'] = cursor.fetchall()
+            return kpis
+        finally:
+            cursor.close()
+            conn.close()
@@ -0,0 +1,135 @@
+import pymysql
+from ..db_conection import DBConnection
+
+
+# Estados de alquiler que suman al resumen
+FINALIZADO_ID = 8
+CANCELADO_ID = 5
+
+
+class ResumenFacturacionManager:
+    """
+    Tabla resumen RESUMEN_FACTURACION_MENSUAL: alquileres finalizados (cantidad
+    y facturación) y cancelados por año, mes y vehículo, según el mes de
+    FEC_FIN. La mantienen AlquilerManager (con aplicar_delta, dentro de su
+    propia transacción) y reconstruir() para cargarla desde cero. Los
+    alquileres se crean activos, así que solo los cambios de estado la afectan.
+    La clave es sólo el vehículo del alquiler, que no cambia entre el -1 y el
+    +1 de un mismo alquiler; la categoría se obtiene al leer (JOIN con
+    VEHICULO y DETALLE_VEHICULO), así un cambio de categoría del vehículo no
+    deja deltas repartidos entre dos filas.
+    """
+
+    _SQL_CREAR_TABLA = """
+        CREATE TABLE IF NOT EXISTS RESUMEN_FACTURACION_MENSUAL (
+            ANIO SMALLINT NOT NULL,
+            MES TINYINT NOT NULL,
+            ID_VEHICULO INT NOT NULL,
+            CANTIDAD_FINALIZADOS INT NOT NULL DEFAULT 0,
+            TOTAL_FACTURADO DECIMAL(14,2) NOT NULL DEFAULT 0,
+            CANTIDAD_CANCELADOS INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (ANIO, MES, ID_VEHICULO)
+        )
+    """
+
+    _COLUMNAS = """
+        (ANIO, MES, ID_VEHICULO,
+         CANTIDAD_FINALIZADOS, TOTAL_FACTURADO, CANTIDAD_CANCELADOS)
+    """
+
+    # Lo que aporta cada alquiler al resumen (nada si no está finalizado ni cancelado)
+    _SQL_APORTE = f"""
+        SELECT
+            YEAR(A.FEC_FIN) AS ANIO, MONTH(A.FEC_FIN) AS MES, A.ID_VEHICULO,
+            %s * (A.ID_ESTADO = {FINALIZADO_ID}) AS DELTA_FINALIZADOS,
+            %s * IF(A.ID_ESTADO = {FINALIZADO_ID}, A.COSTO_TOTAL, 0) AS DELTA_FACTURADO,
+            %s * (A.ID_ESTADO = {CANCELADO_ID}) AS DELTA_CANCELADOS
+        FROM ALQUILER A
+        WHERE A.ID_ALQUILER = %s AND A.ID_ESTADO IN ({FINALIZADO_ID}, {CANCELADO_ID})
+    """
+
+    # El aporte va como tabla derivada con alias ('nuevo') en lugar de VALUES(),
+    # que MySQL marcó obsoleto en ON DUPLICATE KEY UPDATE desde 8.0.20
+    _SQL_APLICAR_DELTA = f"""
+        INSERT INTO RESUMEN_FACTURACION_MENSUAL {_COLUMNAS}
+        SELECT * FROM ({_SQL_APORTE}) AS nuevo
+        ON DUPLICATE KEY UPDATE
+            CANTIDAD_FINALIZADOS = CANTIDAD_FINALIZADOS + nuevo.DELTA_FINALIZADOS,
+            TOTAL_FACTURADO = TOTAL_FACTURADO + nuevo.DELTA_FACTURADO,
+            CANTIDAD_CANCELADOS = CANTIDAD_CANCELADOS + nuevo.DELTA_CANCELADOS
+    """
+
+    _SQL_CARGAR = f"""
+        INSERT INTO RESUMEN_FACTURACION_MENSUAL {_COLUMNAS}
+        SELECT
+            YEAR(A.FEC_FIN), MONTH(A.FEC_FIN), A.ID_VEHICULO,
+            SUM(A.ID_ESTADO = {FINALIZADO_ID}),
+            SUM(IF(A.ID_ESTADO = {FINALIZADO_ID}, A.COSTO_TOTAL, 0)),
+            SUM(A.ID_ESTADO = {CANCELADO_ID})
+        FROM ALQUILER A
+        WHERE A.ID_ESTADO IN ({FINALIZADO_ID}, {CANCELADO_ID})
+        GROUP BY YEAR(A.FEC_FIN), MONTH(A.FEC_FIN), A.ID_VEHICULO
+    """
+
+    def __init__(self):
+        self.db_connection = DBConnection()
+
+    # ----------------------------------------------------------
+    #   ACTUALIZACIÓN INCREMENTAL
+    # ----------------------------------------------------------
+    @classmethod
+    def aplicar_delta(cls, cursor, id_alquiler, signo):
+        """
+        Suma (signo=1) o resta (signo=-1) el aporte actual del alquiler al
+        resumen. Quien modifica un alquiler llama con -1 antes del UPDATE y con
+        +1 después, usando su cursor, así el resumen se confirma o se deshace
+        junto con el cambio.
+        """
+        cursor.execute(cls._SQL_APLICAR_DELTA, (signo, signo, signo, id_alquiler))
+
+    # ----------------------------------------------------------
+    #   RECONSTRUCCIÓN COMPLETA
+    # ----------------------------------------------------------
+    def reconstruir(self, recrear=False):
+        """
+        Crea la tabla si falta y la recalcula desde ALQUILER. Retorna las filas
+        cargadas. Con recrear=True la tabla se borra antes, para pasar a este
+        esquema una tabla creada con uno anterior (ver las migraciones 0003 y 0004).
+        """
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            if recrear:
+                cursor.execute("DROP TABLE IF EXISTS RESUMEN_FACTURACION_MENSUAL")
+            cursor.execute(self._SQL_CREAR_TABLA)
+            cursor.execute("DELETE FROM RESUMEN_FACTURACION_MENSUAL")
+            cursor.execute(self._SQL_CARGAR)
+            filas = cursor.rowcount
+            conn.commit()
+            return filas
+
+        except pymysql.MySQLError as e:
+            print(f"Error al reconstruir el resumen de facturación: {e}")
+            conn.rollback()
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
+    def tiene_esquema_anterior(self):
+        """True si la tabla existe con la clave por categoría de la primera versión."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = DATABASE()
+                  AND table_name = 'RESUMEN_FACTURACION_MENSUAL'
+                  AND column_name = 'ID_CATEGORIA'
+            """)
+            return cursor.fetchone() is not None
+        finally:
+            cursor.close()
+            conn.close()
@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.TipoIncidente import TipoIncidente
 from ..db_conection import DBConnection
+from ..cache import cache_referencias
 
 
 class TipoIncidenteManager:
@@ -22,38 +23,35 @@ class TipoIncidenteManager:
         )
 
     # ----------------------------------------------------------
-    #   OBTENER POR ID
-    # ----------------------------------------------------------
-    def obtener_por_id(self, id_tipo):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-        try:
-            sql = "SELECT * FROM TIPO_INCIDENTE WHERE ID_TIPO_INCIDENTE = %s"
-            cursor.execute(sql, (id_tipo,))
-            row = cursor.fetchone()
-            return self.__row_to_tipo_incidente(row)
-        finally:
-            cursor.close()
-            conn.close()
-
-    # ----------------------------------------------------------
-    #   LISTAR TODOS
+    #   CARGA DE LA TABLA COMPLETA (PARA EL CACHE)
     # ----------------------------------------------------------
-    def listar_todos(self):
+    def __cargar_tabla(self):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
         try:
             cursor.execute("SELECT * FROM TIPO_INCIDENTE")
             rows = cursor.fetchall()
-            return [self.__row_to_tipo_incidente(row) for row in rows]
+            return {row["ID_TIPO_INCIDENTE"]: self.__row_to_tipo_incidente(row) for row in rows}
 
         except pymysql.MySQLError as e:
             print(f"Error al listar tipos de incidente: {e}")
-            return []
+            return None
         
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    def obtener_por_id(self, id_tipo):
+        return cache_referencias.obtener('TIPO_INCIDENTE', id_tipo, self.__cargar_tabla)
+
+    # ----------------------------------------------------------
+    #   LISTAR TODOS
+    # ----------------------------------------------------------
+    def listar_todos(self):
+        return list(cache_referencias.obtener_tabla('TIPO_INCIDENTE', self.__cargar_tabla).values())
+
     
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pymysql
 from BACK.modelos.TipoMantenimiento import TipoMantenimiento
 from ..db_conection import DBConnection
+from ..cache import cache_referencias
 
 
 class TipoMantenimientoManager:
@@ -22,46 +23,33 @@ class TipoMantenimientoManager:
         )
 
     # ----------------------------------------------------------
-    #   OBTENER POR ID
+    #   CARGA DE LA TABLA COMPLETA (PARA EL CACHE)
     # ----------------------------------------------------------
-    def obtener_por_id(self, id_tipo_mantenimiento):
+    def __cargar_tabla(self):
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT * 
-                FROM TIPO_MANTENIMIENTO 
-                WHERE ID_TIPO_MANTENIMIENTO = %s
-            """, (id_tipo_mantenimiento,))
-
-            row = cursor.fetchone()
-            return self.__row_to_tipo_mantenimiento(row)
+            cursor.execute("SELECT * FROM TIPO_MANTENIMIENTO")
+            rows = cursor.fetchall()
+            return {row["ID_TIPO_MANTENIMIENTO"]: self.__row_to_tipo_mantenimiento(row) for row in rows}
 
         except pymysql.MySQLError as e:
-            print(f"Error al obtener tipo de mantenimiento: {e}")
+            print(f"Error al listar tipos de mantenimiento: {e}")
             return None
-        
+
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    def obtener_por_id(self, id_tipo_mantenimiento):
+        return cache_referencias.obtener('TIPO_MANTENIMIENTO', id_tipo_mantenimiento, self.__cargar_tabla)
+
     # ----------------------------------------------------------
     #   LISTAR TODOS
     # ----------------------------------------------------------
     def listar_todos(self):
-        conn = self.db_connection.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT * FROM TIPO_MANTENIMIENTO")
-            rows = cursor.fetchall()
-            return [self.__row_to_tipo_mantenimiento(row) for row in rows]
-
-        except pymysql.MySQLError as e:
-            print(f"Error al listar tipos de mantenimiento: {e}")
-            return []
-
-        finally:
-            cursor.close()
-            conn.close()
+        return list(cache_referencias.obtener_tabla('TIPO_MANTENIMIENTO', self.__cargar_tabla).values())
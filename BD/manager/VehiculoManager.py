@@ -1,7 +1,11 @@
 import pymysql
 from BACK.modelos.Vehiculo import Vehiculo
+from BACK.modelos.CaracteristicaVehiculo import CaracteristicaVehiculo
 from ..db_conection import DBConnection
+from ..cache import InstanciasCompartidas, versiones_tablas
+from ..indice_disponibilidad import ESTADOS_ALQUILER_ACTIVOS
 from .EstadoManager import EstadoManager
+from .CategoriaManager import CategoriaManager
 from .CaracteristicaVehiculoManager import CaracteristicaVehiculoManager
 
 
@@ -11,18 +15,47 @@ class VehiculoManager:
     def __init__(self):
         self.db_connection = DBConnection()
         self.estado_manager = EstadoManager()
+        self.categoria_manager = CategoriaManager()
         self.caracteristica_manager = CaracteristicaVehiculoManager()
 
+    # Vehículo + detalle en una sola consulta. Estado y categoría se
+    # resuelven desde el cache de referencias, sin JOIN.
+    _SELECT_VEHICULO_COMPLETO = """
+        SELECT
+            V.ID_VEHICULO, V.ID_ESTADO, V.PATENTE, V.KILOMETRAJE, V.COSTO_DIARIO_ALQUILER,
+            D.ID_DETALLE_VEHICULO, D.MODELO, D.`AÑO`, D.ID_CATEGORIA
+        FROM VEHICULO V
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+    """
+
+    # Máximo de IDs por consulta IN (...) en obtener_por_ids
+    _TAMANIO_LOTE = 1000
+
     # ----------------------------------------------------------
     #   MAPEO FILA → OBJETO
     # ----------------------------------------------------------
-    def __row_to_vehiculo(self, row):
+    def _row_to_vehiculo(self, row, compartidas=None):
+        """
+        'compartidas' (InstanciasCompartidas) es el registro de la carga: los
+        vehículos del mismo detalle (modelo/año) reciben la misma
+        CaracteristicaVehiculo en lugar de una copia cada uno.
+        También lo usa la versión async (BD/manager_async/VehiculoManager.py).
+        """
         if row is None:
             return None
-        
+        if compartidas is None:
+            compartidas = InstanciasCompartidas()
+
         estado_obj = self.estado_manager.obtener_por_id(row["ID_ESTADO"])
 
-        caracteristica_obj = self.caracteristica_manager.obtener_por_id(row["ID_DETALLE_VEHICULO"])
+        caracteristica_obj = compartidas.obtener(
+            ('DETALLE_VEHICULO', row["ID_DETALLE_VEHICULO"]),
+            lambda: CaracteristicaVehiculo(
+                id_caracteristica=row["ID_DETALLE_VEHICULO"],
+                modelo=row["MODELO"],
+                anio=row["AÑO"],
+                categoria=self.categoria_manager.obtener_por_id(row["ID_CATEGORIA"])
+            ))
 
         return Vehiculo(
             id_vehiculo=row["ID_VEHICULO"],
@@ -55,6 +88,7 @@ class VehiculoManager:
 
             vehiculo.id_vehiculo = cursor.lastrowid
             conn.commit()
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('VEHICULO'))
             return vehiculo
 
         except pymysql.MySQLError as e:
@@ -70,22 +104,43 @@ class VehiculoManager:
     #   OBTENER POR ID
     # ----------------------------------------------------------
     def obtener_por_id(self, id_vehiculo):
+        return self.obtener_por_ids([id_vehiculo]).get(id_vehiculo)
+
+    # ----------------------------------------------------------
+    #   OBTENER VARIOS POR ID (EN LOTE)
+    # ----------------------------------------------------------
+    def obtener_por_ids(self, ids, compartidas=None):
+        """
+        Trae todos los vehículos pedidos con una consulta IN (...) y los
+        retorna como {id_vehiculo: Vehiculo}. Los IDs inexistentes no aparecen.
+        'compartidas' permite que quien arma un resultado mayor (por ejemplo
+        AlquilerManager) comparta con estos vehículos su registro de instancias.
+        """
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        if not ids:
+            return {}
+        if compartidas is None:
+            compartidas = InstanciasCompartidas()
+
         conn = self.db_connection.get_connection()
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT * 
-                FROM VEHICULO 
-                WHERE ID_VEHICULO = %s
-            """, (id_vehiculo,))
-
-            row = cursor.fetchone()
-            return self.__row_to_vehiculo(row)
+            vehiculos = {}
+            for i in range(0, len(ids), self._TAMANIO_LOTE):
+                lote = ids[i:i + self._TAMANIO_LOTE]
+                marcadores = ", ".join(["%s"] * len(lote))
+                cursor.execute(
+                    self._SELECT_VEHICULO_COMPLETO + f"WHERE V.ID_VEHICULO IN ({marcadores})",
+                    lote
+                )
+                for row in cursor.fetchall():
+                    vehiculos[row["ID_VEHICULO"]] = self._row_to_vehiculo(row, compartidas)
+            return vehiculos
 
         except pymysql.MySQLError as e:
-            print(f"Error al obtener vehículo: {e}")
-            return None
+            print(f"Error al obtener vehículos: {e}")
+            return {}
 
         finally:
             cursor.close()
@@ -99,14 +154,133 @@ class VehiculoManager:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT * FROM VEHICULO")
+            cursor.execute(self._SELECT_VEHICULO_COMPLETO)
             rows = cursor.fetchall()
-            return [self.__row_to_vehiculo(row) for row in rows]
+            compartidas = InstanciasCompartidas()
+            return [self._row_to_vehiculo(row, compartidas) for row in rows]
+
+        finally:
+            cursor.close()
+            conn.close()
+
+    # ----------------------------------------------------------
+    #   LISTAR PROYECCIÓN (PARA LA API)
+    # ----------------------------------------------------------
+    _SELECT_VEHICULO_PROYECCION = """
+        SELECT
+            V.ID_VEHICULO AS id, V.PATENTE AS patente, V.KILOMETRAJE AS kilometraje,
+            V.COSTO_DIARIO_ALQUILER AS costo_diario, E.TX_ESTADO AS estado,
+            D.MODELO AS modelo, D.`AÑO` AS anio, C.TX_CATEGORIA AS categoria
+        FROM VEHICULO V
+        JOIN DETALLE_VEHICULO D ON V.ID_DETALLE_VEHICULO = D.ID_DETALLE_VEHICULO
+        JOIN ESTADO E ON V.ID_ESTADO = E.ID_ESTADO
+        JOIN CATEGORIA C ON D.ID_CATEGORIA = C.ID_CATEGORIA
+    """
+
+    def listar_proyeccion(self):
+        """
+        Lo mismo que listar_todos pero como filas con los campos que serializa
+        la API (id, patente, kilometraje, costo_diario, estado, modelo, anio,
+        categoria), sin armar Vehiculo/CaracteristicaVehiculo por fila.
+        """
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self._SELECT_VEHICULO_PROYECCION)
+            return cursor.fetchall()
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar vehículos: {e}")
+            return []
 
         finally:
             cursor.close()
             conn.close()
 
+    # ----------------------------------------------------------
+    #   BUSCAR DISPONIBLES EN UN RANGO DE FECHAS
+    # ----------------------------------------------------------
+    def buscar_disponibles(self, fecha_inicio, fecha_fin, id_categoria=None, max_costo=None,
+                           limite=50, after_id=None):
+        """
+        Vehículos libres en [fecha_inicio, fecha_fin) para toda la flota en una
+        sola consulta: anti-join (NOT EXISTS) contra los alquileres activos
+        (ESTADOS_ALQUILER_ACTIVOS, los mismos que el índice de disponibilidad) y los mantenimientos que se superponen con el rango.
+        Se excluyen los vehículos en estado Mantenimiento.
+        Ordena por costo diario (y por ID para desempatar) y pagina por cursor:
+        retorna (vehiculos, siguiente_after_id), con None en la última página.
+        """
+        consulta, params = self._consulta_disponibles(fecha_inicio, fecha_fin, id_categoria,
+                                                      max_costo, limite, after_id)
+
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(consulta, params)
+            compartidas = InstanciasCompartidas()
+            vehiculos = [self._row_to_vehiculo(row, compartidas) for row in cursor.fetchall()]
+
+            siguiente = None
+            if len(vehiculos) > limite:
+                vehiculos = vehiculos[:limite]
+                siguiente = vehiculos[-1].id_vehiculo
+
+            return vehiculos, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al buscar vehículos disponibles: {e}")
+            return [], None
+
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _consulta_disponibles(self, fecha_inicio, fecha_fin, id_categoria, max_costo, limite, after_id):
+        """SQL y parámetros de buscar_disponibles (pide limite + 1 filas para detectar otra página)."""
+        ESTADO_MANTENIMIENTO = 3
+        estados_activos = ", ".join(["%s"] * len(ESTADOS_ALQUILER_ACTIVOS))
+
+        condiciones = [
+            "V.ID_ESTADO <> %s",
+            f"""NOT EXISTS (
+                SELECT 1 FROM ALQUILER A
+                WHERE A.ID_VEHICULO = V.ID_VEHICULO
+                  AND A.ID_ESTADO IN ({estados_activos})
+                  AND A.FEC_INICIO < %s AND A.FEC_FIN > %s)""",
+            """NOT EXISTS (
+                SELECT 1 FROM MANTENIMIENTO M
+                WHERE M.ID_VEHICULO = V.ID_VEHICULO
+                  AND M.FEC_INICIO < %s
+                  AND (M.FEC_FIN IS NULL OR M.FEC_FIN > %s))""",
+        ]
+        params = [ESTADO_MANTENIMIENTO, *ESTADOS_ALQUILER_ACTIVOS, fecha_fin, fecha_inicio, fecha_fin, fecha_inicio]
+
+        if id_categoria is not None:
+            condiciones.append("D.ID_CATEGORIA = %s")
+            params.append(id_categoria)
+        if max_costo is not None:
+            condiciones.append("V.COSTO_DIARIO_ALQUILER <= %s")
+            params.append(max_costo)
+        if after_id is not None:
+            # Se desempata por ID para que el cursor sea único aunque se repitan costos
+            costo_cursor = "(SELECT COSTO_DIARIO_ALQUILER FROM VEHICULO WHERE ID_VEHICULO = %s)"
+            condiciones.append(
+                f"(V.COSTO_DIARIO_ALQUILER > {costo_cursor} "
+                f"OR (V.COSTO_DIARIO_ALQUILER = {costo_cursor} AND V.ID_VEHICULO > %s))"
+            )
+            params.extend([after_id, after_id, after_id])
+
+        consulta = (
+            self._SELECT_VEHICULO_COMPLETO
+            + "WHERE " + " AND ".join(condiciones)
+            + " ORDER BY V.COSTO_DIARIO_ALQUILER ASC, V.ID_VEHICULO ASC LIMIT %s"
+        )
+        # Se pide una fila de más para saber si hay otra página
+        params.append(limite + 1)
+        return consulta, params
+
     # ----------------------------------------------------------
     #   ACTUALIZAR
     # ----------------------------------------------------------
@@ -137,6 +311,7 @@ class VehiculoManager:
             ))
 
             conn.commit()
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('VEHICULO'))
             return True
 
         except pymysql.MySQLError as e:
@@ -177,6 +352,8 @@ class VehiculoManager:
             """, (id_detalle, id_detalle))
             
             conn.commit()
+            self.db_connection.al_confirmar(
+                lambda: versiones_tablas.incrementar('VEHICULO', 'DETALLE_VEHICULO'))
             return True
 
         except pymysql.MySQLError as e:
@@ -203,6 +380,7 @@ class VehiculoManager:
             """, (nuevo_estado_id, id_vehiculo))
 
             conn.commit()
+            self.db_connection.al_confirmar(lambda: versiones_tablas.incrementar('VEHICULO'))
             return cursor.rowcount > 0
 
         except pymysql.MySQLError as e:
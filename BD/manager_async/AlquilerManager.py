@@ -0,0 +1,123 @@
+import pymysql
+from ..db_conection_async import AsyncDBConnection
+from ..cache import InstanciasCompartidas
+from ..indice_disponibilidad import ESTADOS_ALQUILER_ACTIVOS
+from ..manager.AlquilerManager import AlquilerManager as AlquilerManagerSync
+
+from .VehiculoManager import VehiculoManager
+
+
+class AlquilerManager:
+    """
+    Lecturas de Alquiler con asyncio (aiomysql). Mismos nombres y resultados
+    que BD/manager/AlquilerManager.py, con sus consultas, filtros de paginación
+    y mapeo fila → objeto. Las escrituras (con su verificación de superposición,
+    resumen de facturación e índice de disponibilidad) siguen en el manager sync.
+    """
+
+    def __init__(self):
+        self.db_connection = AsyncDBConnection()
+        self.vehiculo_manager = VehiculoManager()
+        self._sync = AlquilerManagerSync()
+
+    # ----------------------------------------------------------
+    #   CARGA EN LOTE
+    # ----------------------------------------------------------
+    async def __cargar(self, filtro="", params=()):
+        """Ejecuta el SELECT completo con el filtro dado y mapea todas las filas."""
+        async with self.db_connection.cursor() as cursor:
+            await cursor.execute(self._sync._SELECT_ALQUILER_COMPLETO + filtro, params)
+            rows = await cursor.fetchall()
+        # La conexión vuelve al pool antes de pedir los vehículos
+        compartidas = InstanciasCompartidas()
+        vehiculos = await self.vehiculo_manager.obtener_por_ids(
+            (row['ID_VEHICULO'] for row in rows), compartidas)
+        return [self._sync._row_to_alquiler(row, vehiculos, compartidas) for row in rows]
+
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    async def obtener_por_id(self, id_alquiler):
+        try:
+            alquileres = await self.__cargar("WHERE A.ID_ALQUILER = %s", (id_alquiler,))
+            return alquileres[0] if alquileres else None
+
+        except pymysql.MySQLError as e:
+            print(f"Error al obtener alquiler: {e}")
+            return None
+
+    # ----------------------------------------------------------
+    #   LISTAR TODOS
+    # ----------------------------------------------------------
+    async def listar_todos(self):
+        try:
+            return await self.__cargar()
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres: {e}")
+            return []
+
+    # ----------------------------------------------------------
+    #   LISTAR PAGINADO (CURSOR) CON FILTROS
+    # ----------------------------------------------------------
+    async def listar_paginado(self, limite=50, after_id=None, id_estado=None, desde=None, hasta=None,
+                              id_vehiculo=None, id_cliente=None, orden='id_desc'):
+        """Retorna (alquileres, siguiente_after_id), como el manager sync."""
+        filtro, params = self._sync._filtro_paginado(limite, after_id, id_estado, desde, hasta,
+                                                      id_vehiculo, id_cliente, orden)
+
+        try:
+            alquileres = await self.__cargar(filtro, params)
+
+            siguiente = None
+            if len(alquileres) > limite:
+                alquileres = alquileres[:limite]
+                siguiente = alquileres[-1].id_alquiler
+
+            return alquileres, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres paginados: {e}")
+            return [], None
+
+    async def listar_paginado_proyeccion(self, limite=50, after_id=None, id_estado=None, desde=None,
+                                         hasta=None, id_vehiculo=None, id_cliente=None, orden='id_desc'):
+        """Retorna (filas, siguiente_after_id), como el manager sync."""
+        filtro, params = self._sync._filtro_paginado(limite, after_id, id_estado, desde, hasta,
+                                                      id_vehiculo, id_cliente, orden)
+
+        try:
+            async with self.db_connection.cursor() as cursor:
+                await cursor.execute(self._sync._SELECT_ALQUILER_PROYECCION + filtro, params)
+                filas = await cursor.fetchall()
+
+            siguiente = None
+            if len(filas) > limite:
+                filas = filas[:limite]
+                siguiente = filas[-1]['id']
+
+            return filas, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres paginados: {e}")
+            return [], None
+
+    # ----------------------------------------------------------
+    #   LISTAR POR CLIENTE
+    # ----------------------------------------------------------
+    async def listar_por_cliente(self, id_cliente):
+        try:
+            return await self.__cargar("WHERE A.ID_CLIENTE = %s", (id_cliente,))
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres por cliente: {e}")
+            return []
+
+    async def listar_activo_por_vehiculo(self, id_vehiculo):
+        try:
+            return await self.__cargar(self._sync._FILTRO_ACTIVOS_POR_VEHICULO,
+                                       (id_vehiculo, *ESTADOS_ALQUILER_ACTIVOS))
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar alquileres por vehículo: {e}")
+            return []
@@ -0,0 +1,48 @@
+from ..db_conection_async import AsyncDBConnection
+from ..manager.ReporteManager import ReporteManager as ReporteManagerSync
+
+
+class ReporteManager:
+    """
+    Reportes con asyncio (aiomysql): las consultas agregadas de
+    BD/manager/ReporteManager.py, con los mismos nombres y resultados.
+    Los reportes en streaming, la exportación y la analítica siguen en el
+    manager sync (usan cursores del servidor y numpy).
+    """
+
+    def __init__(self):
+        self.db_connection = AsyncDBConnection()
+
+    async def __consultar(self, sql, params=None):
+        async with self.db_connection.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+
+    async def obtener_ranking_vehiculos(self):
+        """Top vehículos más alquilados."""
+        return await self.__consultar(ReporteManagerSync._SQL_RANKING_VEHICULOS)
+
+    async def obtener_facturacion_mensual(self, anio):
+        """Facturación por mes de un año, leída de RESUMEN_FACTURACION_MENSUAL."""
+        return await self.__consultar(ReporteManagerSync._SQL_FACTURACION_MENSUAL, (anio,))
+
+    async def alquileres_por_periodo(self, fecha_desde, fecha_hasta):
+        """Alquileres iniciados en un rango de fechas."""
+        return await self.__consultar(ReporteManagerSync._SQL_ALQUILERES_POR_PERIODO,
+                                      (fecha_desde, fecha_hasta))
+
+    async def historial_cliente_detallado(self, id_cliente):
+        """Listado detallado para un cliente específico."""
+        return await self.__consultar(ReporteManagerSync._SQL_HISTORIAL_CLIENTE, (id_cliente,))
+
+    async def obtener_kpis_dashboard(self, inicio_mes, fin_mes, id_disponible, id_en_curso,
+                                     id_finalizado, cantidad_recientes=5):
+        """Totales del tablero de control y últimos alquileres, agregados en la BD."""
+        async with self.db_connection.cursor() as cursor:
+            await cursor.execute(ReporteManagerSync._SQL_KPIS_TOTALES,
+                                 (id_disponible, id_en_curso, id_finalizado, inicio_mes, fin_mes))
+            kpis = await cursor.fetchone()
+
+            await cursor.execute(ReporteManagerSync._SQL_KPIS_ULTIMOS, (cantidad_recientes,))
+            kpis['ULTIMOS'] = await cursor.fetchall()
+            return kpis
@@ -0,0 +1,101 @@
+import pymysql
+from ..db_conection_async import AsyncDBConnection
+from ..cache import InstanciasCompartidas
+from ..manager.VehiculoManager import VehiculoManager as VehiculoManagerSync
+
+
+class VehiculoManager:
+    """
+    Lecturas de Vehiculo con asyncio (aiomysql). Mismos nombres y resultados
+    que BD/manager/VehiculoManager.py: las consultas y el mapeo fila → objeto
+    son los del manager sync, aquí sólo cambia cómo se espera a la BD.
+    Las escrituras siguen en el manager sync.
+    """
+
+    def __init__(self):
+        self.db_connection = AsyncDBConnection()
+        self._sync = VehiculoManagerSync()
+
+    # ----------------------------------------------------------
+    #   OBTENER POR ID
+    # ----------------------------------------------------------
+    async def obtener_por_id(self, id_vehiculo):
+        return (await self.obtener_por_ids([id_vehiculo])).get(id_vehiculo)
+
+    # ----------------------------------------------------------
+    #   OBTENER VARIOS POR ID (EN LOTE)
+    # ----------------------------------------------------------
+    async def obtener_por_ids(self, ids, compartidas=None):
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        if not ids:
+            return {}
+        if compartidas is None:
+            compartidas = InstanciasCompartidas()
+
+        try:
+            async with self.db_connection.cursor() as cursor:
+                vehiculos = {}
+                for i in range(0, len(ids), self._sync._TAMANIO_LOTE):
+                    lote = ids[i:i + self._sync._TAMANIO_LOTE]
+                    marcadores = ", ".join(["%s"] * len(lote))
+                    await cursor.execute(
+                        self._sync._SELECT_VEHICULO_COMPLETO + f"WHERE V.ID_VEHICULO IN ({marcadores})",
+                        lote
+                    )
+                    for row in await cursor.fetchall():
+                        vehiculos[row["ID_VEHICULO"]] = self._sync._row_to_vehiculo(row, compartidas)
+                return vehiculos
+
+        except pymysql.MySQLError as e:
+            print(f"Error al obtener vehículos: {e}")
+            return {}
+
+    # ----------------------------------------------------------
+    #   LISTAR TODOS
+    # ----------------------------------------------------------
+    async def listar_todos(self):
+        async with self.db_connection.cursor() as cursor:
+            await cursor.execute(self._sync._SELECT_VEHICULO_COMPLETO)
+            rows = await cursor.fetchall()
+            compartidas = InstanciasCompartidas()
+            return [self._sync._row_to_vehiculo(row, compartidas) for row in rows]
+
+    # ----------------------------------------------------------
+    #   LISTAR PROYECCIÓN (PARA LA API)
+    # ----------------------------------------------------------
+    async def listar_proyeccion(self):
+        try:
+            async with self.db_connection.cursor() as cursor:
+                await cursor.execute(self._sync._SELECT_VEHICULO_PROYECCION)
+                return await cursor.fetchall()
+
+        except pymysql.MySQLError as e:
+            print(f"Error al listar vehículos: {e}")
+            return []
+
+    # ----------------------------------------------------------
+    #   BUSCAR DISPONIBLES EN UN RANGO DE FECHAS
+    # ----------------------------------------------------------
+    async def buscar_disponibles(self, fecha_inicio, fecha_fin, id_categoria=None, max_costo=None,
+                                 limite=50, after_id=None):
+        """Retorna (vehiculos, siguiente_after_id), como el manager sync."""
+        consulta, params = self._sync._consulta_disponibles(fecha_inicio, fecha_fin, id_categoria,
+                                                            max_costo, limite, after_id)
+
+        try:
+            async with self.db_connection.cursor() as cursor:
+                await cursor.execute(consulta, params)
+                compartidas = InstanciasCompartidas()
+                vehiculos = [self._sync._row_to_vehiculo(row, compartidas)
+                             for row in await cursor.fetchall()]
+
+            siguiente = None
+            if len(vehiculos) > limite:
+                vehiculos = vehiculos[:limite]
+                siguiente = vehiculos[-1].id_vehiculo
+
+            return vehiculos, siguiente
+
+        except pymysql.MySQLError as e:
+            print(f"Error al buscar vehículos disponibles: {e}")
+            return [], None
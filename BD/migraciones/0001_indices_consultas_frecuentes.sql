@@ -0,0 +1,29 @@
+-- ==========================================================
+-- Índices para los predicados más usados
+-- El migrador saltea los que ya existen: si falla a mitad, se reintenta
+-- ==========================================================
+
+-- Disponibilidad: superposición por vehículo y estado activo
+-- (AlquilerManager.__hay_superposicion, VehiculoManager.buscar_disponibles)
+CREATE INDEX IX_ALQUILER_VEHICULO_ESTADO_FECHAS
+    ON ALQUILER (ID_VEHICULO, ID_ESTADO, FEC_INICIO, FEC_FIN);
+
+-- Reporte por período y exportación (WHERE FEC_INICIO BETWEEN ...)
+CREATE INDEX IX_ALQUILER_FEC_INICIO
+    ON ALQUILER (FEC_INICIO);
+
+-- Historial de un cliente ordenado por fecha
+CREATE INDEX IX_ALQUILER_CLIENTE_FEC_INICIO
+    ON ALQUILER (ID_CLIENTE, FEC_INICIO);
+
+-- KPIs (estado + rango de FEC_FIN) y precarga del índice de disponibilidad
+CREATE INDEX IX_ALQUILER_ESTADO_FEC_FIN
+    ON ALQUILER (ID_ESTADO, FEC_FIN);
+
+-- Mantenimientos abiertos o vigentes de un vehículo
+CREATE INDEX IX_MANTENIMIENTO_VEHICULO_FEC_FIN
+    ON MANTENIMIENTO (ID_VEHICULO, FEC_FIN);
+
+-- Búsqueda de disponibles ordenada por costo (con cursor por ID)
+CREATE INDEX IX_VEHICULO_COSTO
+    ON VEHICULO (COSTO_DIARIO_ALQUILER, ID_VEHICULO);
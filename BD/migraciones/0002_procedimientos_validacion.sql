@@ -0,0 +1,46 @@
+-- ==========================================================
+-- Procedimientos que usan los managers y no estaban en el esquema
+-- ==========================================================
+
+DROP PROCEDURE IF EXISTS SP_VALIDAR_ESTADO_MANTENIMIENTO;
+DROP PROCEDURE IF EXISTS SP_VALIDAR_DISPONIBILIDAD_ALQUILER;
+
+DELIMITER //
+
+-- Devuelve el mantenimiento vigente del vehículo (ninguna fila si no tiene).
+-- Usa IX_MANTENIMIENTO_VEHICULO_FEC_FIN.
+CREATE PROCEDURE SP_VALIDAR_ESTADO_MANTENIMIENTO(IN p_id_vehiculo INT)
+BEGIN
+    SELECT ID_MANTENIMIENTO, ID_VEHICULO, FEC_INICIO, FEC_FIN
+    FROM MANTENIMIENTO
+    WHERE ID_VEHICULO = p_id_vehiculo
+      AND (FEC_FIN IS NULL OR FEC_FIN > NOW())
+      AND FEC_INICIO <= NOW()
+    LIMIT 1;
+END //
+
+-- Lanza SIGNAL 45000 (CONFLICTO_FECHAS) si el vehículo tiene un alquiler
+-- activo (pendiente o en curso) o un mantenimiento que se superpone al rango.
+-- Los estados (6, 7) son ESTADOS_ALQUILER_ACTIVOS de BD/indice_disponibilidad.py,
+-- que usan los managers: si cambian ahí, hay que recrear este SP en una migración.
+CREATE PROCEDURE SP_VALIDAR_DISPONIBILIDAD_ALQUILER(
+    IN p_id_vehiculo INT,
+    IN p_fec_inicio DATETIME,
+    IN p_fec_fin DATETIME
+)
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM ALQUILER
+        WHERE ID_VEHICULO = p_id_vehiculo AND ID_ESTADO IN (6, 7)
+          AND FEC_INICIO < p_fec_fin AND FEC_FIN > p_fec_inicio
+    ) OR EXISTS (
+        SELECT 1 FROM MANTENIMIENTO
+        WHERE ID_VEHICULO = p_id_vehiculo
+          AND FEC_INICIO < p_fec_fin AND (FEC_FIN IS NULL OR FEC_FIN > p_fec_inicio)
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'CONFLICTO_FECHAS: el vehículo no está disponible en ese rango';
+    END IF;
+END //
+
+DELIMITER ;
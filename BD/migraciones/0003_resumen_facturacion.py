@@ -0,0 +1,10 @@
+"""
+Tabla resumen RESUMEN_FACTURACION_MENSUAL y su carga inicial desde ALQUILER.
+La tabla y la carga las arma ResumenFacturacionManager, el mismo SQL que usa
+BD/reconstruir_resumen.py.
+"""
+from BD.manager.ResumenFacturacionManager import ResumenFacturacionManager
+
+
+def aplicar(db_connection):
+    return ResumenFacturacionManager().reconstruir() is not None
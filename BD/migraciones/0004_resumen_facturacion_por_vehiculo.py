@@ -0,0 +1,13 @@
+"""
+El resumen de facturación pasa a tener clave (ANIO, MES, ID_VEHICULO): la
+categoría se une al leer. Las bases que aplicaron la primera versión de 0003
+tienen la tabla con ID_CATEGORIA en la clave; se recrea y se recarga.
+"""
+from BD.manager.ResumenFacturacionManager import ResumenFacturacionManager
+
+
+def aplicar(db_connection):
+    resumen = ResumenFacturacionManager()
+    if not resumen.tiene_esquema_anterior():
+        return True
+    return resumen.reconstruir(recrear=True) is not None
@@ -0,0 +1,287 @@
+"""
+Migraciones versionadas del esquema y verificación de índices con EXPLAIN.
+
+Cada archivo BD/migraciones/NNNN_descripcion.sql es una migración; se aplican
+en orden de versión con DBConnection.execute_sql_script y se registran en la
+tabla SCHEMA_MIGRACIONES, así cada una corre una sola vez por base.
+Una migración también puede ser NNNN_descripcion.py con una función
+aplicar(db_connection) que retorna True si terminó bien: sirve cuando el SQL
+ya lo arma un manager (por ejemplo el resumen de facturación) y copiarlo al
+.sql haría que las dos versiones se separen con el tiempo.
+
+Como el DDL de MySQL confirma solo, una migración que falla a mitad de camino
+deja creadas las sentencias anteriores. Para poder reintentarla, los CREATE
+INDEX de un índice que ya existe (según information_schema.statistics) se
+saltean.
+
+Uso (desde la raíz del proyecto):
+    python -m BD.migrador estado
+    python -m BD.migrador aplicar
+    python -m BD.migrador explicar     # EXPLAIN de las consultas frecuentes
+
+Los planes dependen del volumen de datos: en una base casi vacía MySQL puede
+preferir recorrer la tabla aunque haya índice. Conviene correr "explicar" sobre
+el dataset de benchmarks (ver benchmarks/generador.py).
+"""
+import argparse
+import importlib.util
+import os
+import re
+import sys
+from datetime import datetime
+
+import pymysql
+
+from .db_conection import DBConnection
+
+DIRECTORIO_MIGRACIONES = os.path.join(os.path.dirname(__file__), 'migraciones')
+
+_RE_ARCHIVO = re.compile(r'^(\d+)_(.+)\.(sql|py)$')
+_RE_CREATE_INDEX = re.compile(r'^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+`?(\w+)`?\s+ON\s+`?(\w+)`?', re.IGNORECASE)
+
+
+# ----------------------------------------------------------
+#   MIGRACIONES
+# ----------------------------------------------------------
+class Migrador:
+    def __init__(self, directorio=DIRECTORIO_MIGRACIONES):
+        self.directorio = directorio
+        self.db_connection = DBConnection()
+
+    def disponibles(self):
+        """[(version, nombre, ruta)] de los archivos de migración, ordenados por versión."""
+        migraciones = []
+        for archivo in os.listdir(self.directorio):
+            coincidencia = _RE_ARCHIVO.match(archivo)
+            if coincidencia:
+                migraciones.append((int(coincidencia.group(1)), coincidencia.group(2),
+                                    os.path.join(self.directorio, archivo)))
+        return sorted(migraciones)
+
+    def aplicadas(self):
+        """{version: fecha} de las migraciones ya registradas (crea la tabla si falta)."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS SCHEMA_MIGRACIONES (
+                    VERSION INT PRIMARY KEY,
+                    NOMBRE VARCHAR(200) NOT NULL,
+                    FEC_APLICADA DATETIME NOT NULL
+                )
+            """)
+            cursor.execute("SELECT VERSION, FEC_APLICADA FROM SCHEMA_MIGRACIONES")
+            return {row['VERSION']: row['FEC_APLICADA'] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def pendientes(self):
+        aplicadas = self.aplicadas()
+        return [m for m in self.disponibles() if m[0] not in aplicadas]
+
+    def aplicar(self):
+        """
+        Aplica las migraciones pendientes en orden y se detiene en la primera
+        que falla. Retorna (aplicadas, fallida) con fallida = None si no hubo error.
+        """
+        aplicadas = []
+        for version, nombre, ruta in self.pendientes():
+            print(f"→ Aplicando {version:04d}_{nombre}...")
+            if ruta.endswith('.py'):
+                correcta = self.__aplicar_python(ruta)
+            else:
+                with open(ruta, encoding='utf-8') as f:
+                    correcta = self.db_connection.execute_sql_script(
+                        f.read(), omitir=self.__indice_existente(self.indices_existentes()))
+            if not correcta:
+                return aplicadas, version
+
+            self.__registrar(version, nombre)
+            aplicadas.append(version)
+        return aplicadas, None
+
+    def indices_existentes(self):
+        """{(tabla, índice)} en mayúsculas de los índices de la base actual."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT DISTINCT TABLE_NAME, INDEX_NAME
+                FROM information_schema.statistics
+                WHERE TABLE_SCHEMA = DATABASE()
+            """)
+            return {(row['TABLE_NAME'].upper(), row['INDEX_NAME'].upper()) for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def __indice_existente(existentes):
+        """Función 'omitir' de execute_sql_script: True para un CREATE INDEX ya aplicado."""
+        def omitir(sentencia):
+            coincidencia = _RE_CREATE_INDEX.match(sentencia)
+            if not coincidencia:
+                return False
+            indice, tabla = coincidencia.group(1).upper(), coincidencia.group(2).upper()
+            if (tabla, indice) in existentes:
+                print(f"  (ya existe {indice} en {tabla}, se saltea)")
+                return True
+            return False
+        return omitir
+
+    def __aplicar_python(self, ruta):
+        """Carga la migración .py (su nombre empieza con un número, no se puede importar) y la corre."""
+        spec = importlib.util.spec_from_file_location(
+            f"_migracion_{os.path.basename(ruta)[:-3]}", ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(modulo)
+            return bool(modulo.aplicar(self.db_connection))
+        except pymysql.MySQLError as e:
+            print(f"Error en la migración {os.path.basename(ruta)}: {e}")
+            return False
+
+    def __registrar(self, version, nombre):
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO SCHEMA_MIGRACIONES (VERSION, NOMBRE, FEC_APLICADA) VALUES (%s, %s, %s)",
+                (version, nombre, datetime.now())
+            )
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+
+# ----------------------------------------------------------
+#   VERIFICACIÓN DE ÍNDICES (EXPLAIN)
+# ----------------------------------------------------------
+# Consultas de ReporteManager y de disponibilidad, con parámetros de ejemplo.
+# El SQL es el de los managers (no una copia), así lo que se verifica es lo
+# que corre la aplicación. Cada una indica las tablas (como aparecen en la
+# columna "table" del EXPLAIN, es decir, por alias si lo tienen) que tienen
+# que resolverse con un índice.
+_DESDE, _HASTA = datetime(2025, 1, 1), datetime(2025, 12, 31, 23, 59)
+
+
+def consultas_verificadas():
+    """[(nombre, sql, params, tablas_con_indice)] de las consultas a verificar."""
+    # Se importan acá: los managers cargan los modelos de BACK, que 'estado' y
+    # 'aplicar' no necesitan
+    from BACK.GestorReportes import PARAMETROS_KPIS
+    from .indice_disponibilidad import IndiceDisponibilidad, ESTADOS_ALQUILER_ACTIVOS
+    from .manager.AlquilerManager import AlquilerManager
+    from .manager.ReporteManager import ReporteManager
+    from .manager.ResumenFacturacionManager import CANCELADO_ID
+    from .manager.VehiculoManager import VehiculoManager
+
+    disponibles, params_disponibles = VehiculoManager()._consulta_disponibles(
+        _DESDE, _HASTA, id_categoria=None, max_costo=None, limite=50, after_id=None)
+
+    return [
+        ('ReporteManager.obtener_ranking_vehiculos',
+         ReporteManager._SQL_RANKING_VEHICULOS, (), {'A'}),
+        ('ReporteManager.obtener_facturacion_mensual',
+         ReporteManager._SQL_FACTURACION_MENSUAL, (2025,), {'RESUMEN_FACTURACION_MENSUAL'}),
+        ('ReporteManager.alquileres_por_periodo',
+         ReporteManager._SQL_ALQUILERES_POR_PERIODO, (_DESDE, _HASTA), {'A', 'C', 'V', 'D'}),
+        ('ReporteManager.iterar_exportacion_alquileres',
+         ReporteManager._SQL_EXPORTACION_ALQUILERES, (_DESDE, _HASTA), {'A', 'C', 'V', 'D'}),
+        ('ReporteManager.datos_analitica_periodo',
+         ReporteManager._SQL_ANALITICA_ALQUILERES,
+         (_DESDE, _DESDE, CANCELADO_ID, _HASTA, _DESDE), {'A', 'V', 'D'}),
+        # MANTENIMIENTO no tiene índice por FEC_INICIO y es chica: sólo se exige el de ALQUILER
+        ('ReporteManager.intervalos_utilizacion',
+         ReporteManager._SQL_INTERVALOS_UTILIZACION,
+         ReporteManager._params_intervalos_utilizacion(_DESDE, _HASTA, CANCELADO_ID), {'ALQUILER'}),
+        ('ReporteManager.historial_cliente_detallado',
+         ReporteManager._SQL_HISTORIAL_CLIENTE, (1,), {'A', 'V', 'D'}),
+        ('ReporteManager.obtener_kpis_dashboard (totales)',
+         ReporteManager._SQL_KPIS_TOTALES,
+         (PARAMETROS_KPIS['id_disponible'], PARAMETROS_KPIS['id_en_curso'],
+          PARAMETROS_KPIS['id_finalizado'], _DESDE, datetime(2025, 2, 1)),
+         {'VEHICULO', 'ALQUILER'}),
+        ('ReporteManager.obtener_kpis_dashboard (últimos)',
+         ReporteManager._SQL_KPIS_ULTIMOS, (5,), {'A'}),
+        ('AlquilerManager.__hay_superposicion',
+         AlquilerManager._SQL_SUPERPOSICION,
+         (1, *ESTADOS_ALQUILER_ACTIVOS, _HASTA, _DESDE, 0, 1, _HASTA, _DESDE),
+         {'ALQUILER', 'MANTENIMIENTO'}),
+        ('VehiculoManager.buscar_disponibles', disponibles, params_disponibles, {'A', 'M'}),
+        ('IndiceDisponibilidad.precargar (alquileres)',
+         IndiceDisponibilidad._SQL_ALQUILERES_ACTIVOS, ESTADOS_ALQUILER_ACTIVOS, {'ALQUILER'}),
+        # El cuerpo del SP (migración 0002) no se puede pasar a EXPLAIN, va su SELECT
+        ('SP_VALIDAR_ESTADO_MANTENIMIENTO', """
+            SELECT ID_MANTENIMIENTO FROM MANTENIMIENTO
+            WHERE ID_VEHICULO = %s AND (FEC_FIN IS NULL OR FEC_FIN > NOW()) AND FEC_INICIO <= NOW()
+            LIMIT 1
+        """, (1,), {'MANTENIMIENTO'}),
+    ]
+
+
+def explicar(consultas=None):
+    """
+    Corre EXPLAIN de cada consulta (por defecto, las de consultas_verificadas()).
+    Retorna [(nombre, tabla, indice, tipo, ok)]: ok es False si una tabla que
+    debía usar índice se recorre completa.
+    """
+    if consultas is None:
+        consultas = consultas_verificadas()
+    db = DBConnection()
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    resultados = []
+    try:
+        for nombre, sql, params, tablas in consultas:
+            cursor.execute("EXPLAIN " + sql, params)
+            for fila in cursor.fetchall():
+                tabla = fila.get('table')
+                if tabla not in tablas:
+                    continue
+                ok = fila.get('key') is not None and fila.get('type') != 'ALL'
+                resultados.append((nombre, tabla, fila.get('key'), fila.get('type'), ok))
+        return resultados
+    except pymysql.MySQLError as e:
+        print(f"Error al correr EXPLAIN: {e}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones del esquema y verificación de índices.")
+    parser.add_argument('accion', choices=['estado', 'aplicar', 'explicar'])
+    args = parser.parse_args()
+
+    migrador = Migrador()
+
+    if args.accion == 'estado':
+        aplicadas = migrador.aplicadas()
+        for version, nombre, _ in migrador.disponibles():
+            fecha = aplicadas.get(version)
+            print(f"{version:04d}_{nombre:<45} {fecha.strftime('%Y-%m-%d %H:%M') if fecha else 'pendiente'}")
+
+    elif args.accion == 'aplicar':
+        aplicadas, fallida = migrador.aplicar()
+        print(f"{len(aplicadas)} migración(es) aplicada(s).")
+        if fallida is not None:
+            print(f"❌ Falló la migración {fallida:04d}; las siguientes no se aplicaron.")
+            sys.exit(1)
+
+    else:
+        resultados = explicar()
+        if resultados is None:
+            sys.exit(1)
+        for nombre, tabla, indice, tipo, ok in resultados:
+            marca = "✅" if ok else "❌"
+            print(f"{marca} {nombre:<45} {tabla:<30} {tipo or '-':<8} {indice or 'sin índice'}")
+        if not all(r[4] for r in resultados):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
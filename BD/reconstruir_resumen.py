@@ -0,0 +1,27 @@
+"""
+Reconstruye RESUMEN_FACTURACION_MENSUAL desde ALQUILER (backfill). La tabla se
+crea si no existe. Después la mantienen al día los cambios de estado de los
+alquileres.
+
+Uso (desde la raíz del proyecto):
+    python -m BD.reconstruir_resumen
+"""
+import argparse
+import time
+
+from BD.manager.ResumenFacturacionManager import ResumenFacturacionManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye el resumen mensual de facturación.")
+    parser.parse_args()
+
+    inicio = time.perf_counter()
+    filas = ResumenFacturacionManager().reconstruir()
+    if filas is None:
+        raise SystemExit(1)
+    print(f"Resumen de facturación reconstruido: {filas} filas en {time.perf_counter() - inicio:.1f}s.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+
+# Consultas más lentas que esto (en ms) se registran en el log de consultas lentas
+UMBRAL_CONSULTA_LENTA_MS = float(os.environ.get('DB_SLOW_MS', 200))
+
+# Cantidad de mediciones que se guardan por ruta para calcular percentiles
+MUESTRAS_POR_RUTA = 1000
+
+# Si una misma consulta se repite más que esto en un request, se avisa (posible N+1)
+UMBRAL_REPETICIONES_N1 = int(os.environ.get('DB_N1_REPETICIONES', 20))
+
+log_consultas_lentas = logging.getLogger('BD.consultas_lentas')
+
+_local = threading.local()
+
+
+# ----------------------------------------------------------
+#   HUELLA DE UNA CONSULTA
+# ----------------------------------------------------------
+_RE_ESPACIOS = re.compile(r'\s+')
+_RE_CADENAS = re.compile(r"'(?:[^'\\]|\\.)*'")
+_RE_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_LISTAS = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+
+
+@lru_cache(maxsize=1024)
+def huella(sql):
+    """
+    Normaliza el SQL para agrupar consultas iguales con distintos parámetros:
+    literales -> ?, listas IN (...) de cualquier largo -> (...), espacios colapsados.
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    sql = _RE_CADENAS.sub('?', sql)
+    sql = _RE_NUMEROS.sub('?', sql)
+    sql = _RE_LISTAS.sub('(...)', sql)
+    return _RE_ESPACIOS.sub(' ', sql).strip()
+
+
+# ----------------------------------------------------------
+#   TRAZA DE UN REQUEST
+# ----------------------------------------------------------
+class Traza:
+    """Lo que hizo un request contra la BD: conexiones, consultas y tiempo."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.conexiones = 0
+        self.consultas = 0
+        self.tiempo_bd = 0.0           # segundos
+        self.huellas = Counter()       # huella -> veces
+
+    def registrar_consulta(self, sql, segundos):
+        self.consultas += 1
+        self.tiempo_bd += segundos
+        self.huellas[huella(sql)] += 1
+
+    @property
+    def duracion(self):
+        return time.perf_counter() - self.inicio
+
+
+def iniciar_traza():
+    _local.traza = Traza()
+    return _local.traza
+
+
+def traza_actual():
+    return getattr(_local, 'traza', None)
+
+
+def finalizar_traza():
+    traza = getattr(_local, 'traza', None)
+    _local.traza = None
+    return traza
+
+
+def registrar_conexion():
+    traza = getattr(_local, 'traza', None)
+    if traza is not None:
+        traza.conexiones += 1
+
+
+# ----------------------------------------------------------
+#   CURSOR INSTRUMENTADO
+# ----------------------------------------------------------
+class CursorTrazado:
+    """Envuelve un cursor de pymysql y mide execute/executemany/callproc."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __medir(self, sql, ejecutar):
+        inicio = time.perf_counter()
+        try:
+            return ejecutar()
+        finally:
+            segundos = time.perf_counter() - inicio
+            traza = getattr(_local, 'traza', None)
+            if traza is not None:
+                traza.registrar_consulta(sql, segundos)
+            if segundos * 1000 >= UMBRAL_CONSULTA_LENTA_MS:
+                metricas.registrar_consulta_lenta(sql, segundos)
+
+    def execute(self, query, args=None):
+        return self.__medir(query, lambda: self._cursor.execute(query, args))
+
+    def executemany(self, query, args):
+        return self.__medir(query, lambda: self._cursor.executemany(query, args))
+
+    def callproc(self, procname, args=()):
+        return self.__medir(f"CALL {procname}", lambda: self._cursor.callproc(procname, args))
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+
+# ----------------------------------------------------------
+#   MÉTRICAS ACUMULADAS POR RUTA
+# ----------------------------------------------------------
+def _percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return None
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+
+class MetricasRutas:
+    """Latencias y consultas por ruta (últimas MUESTRAS_POR_RUTA) y consultas lentas recientes."""
+
+    def __init__(self):
+        self._rutas = {}     # ruta -> deque de (ms_total, ms_bd, consultas, conexiones)
+        self._requests = Counter()   # ruta -> requests totales
+        self._huellas = {}   # ruta -> Counter(huella -> veces), acumulado
+        self._lentas = deque(maxlen=50)
+        self._lock = threading.Lock()
+
+    def registrar_request(self, ruta, traza):
+        muestra = (traza.duracion * 1000, traza.tiempo_bd * 1000, traza.consultas, traza.conexiones)
+        with self._lock:
+            self._rutas.setdefault(ruta, deque(maxlen=MUESTRAS_POR_RUTA)).append(muestra)
+            self._requests[ruta] += 1
+            self._huellas.setdefault(ruta, Counter()).update(traza.huellas)
+
+        for sql, veces in traza.huellas.items():
+            if veces > UMBRAL_REPETICIONES_N1:
+                log_consultas_lentas.warning("Posible N+1 en %s: %d veces %s", ruta, veces, sql)
+
+    def registrar_consulta_lenta(self, sql, segundos):
+        ms = round(segundos * 1000, 1)
+        log_consultas_lentas.warning("Consulta lenta (%.1f ms): %s", ms, huella(sql))
+        with self._lock:
+            self._lentas.append({'ms': ms, 'consulta': huella(sql), 'en': time.time()})
+
+    def resumen(self):
+        with self._lock:
+            rutas = {ruta: list(muestras) for ruta, muestras in self._rutas.items()}
+            requests = dict(self._requests)
+            huellas = {ruta: c.most_common(5) for ruta, c in self._huellas.items()}
+            lentas = list(self._lentas)
+
+        resumen_rutas = {}
+        for ruta, muestras in rutas.items():
+            totales = sorted(m[0] for m in muestras)
+            resumen_rutas[ruta] = {
+                'muestras': len(muestras),
+                'p50_ms': round(_percentil(totales, 50), 2),
+                'p95_ms': round(_percentil(totales, 95), 2),
+                'p99_ms': round(_percentil(totales, 99), 2),
+                'bd_ms_promedio': round(sum(m[1] for m in muestras) / len(muestras), 2),
+                'consultas_promedio': round(sum(m[2] for m in muestras) / len(muestras), 2),
+                'conexiones_promedio': round(sum(m[3] for m in muestras) / len(muestras), 2),
+                # Consultas más frecuentes, con cuántas veces corren por request
+                'consultas_frecuentes': [
+                    {'consulta': sql, 'por_request': round(veces / requests[ruta], 2)}
+                    for sql, veces in huellas.get(ruta, [])
+                ],
+            }
+
+        return {
+            'rutas': resumen_rutas,
+            'consultas_lentas': lentas,
+            'umbral_consulta_lenta_ms': UMBRAL_CONSULTA_LENTA_MS,
+        }
+
+
+metricas = MetricasRutas()
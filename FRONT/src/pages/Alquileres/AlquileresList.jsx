@@ -21,6 +21,9 @@ import {
     EyeIcon 
 } from "@heroicons/react/24/solid";
 
+// Cantidad de alquileres que se piden por página al backend
+const PAGE_SIZE = 50;
+
 const AlquileresList = () => {
     // 2. INICIALIZAR EL HOOK
     const navigate = useNavigate();
@@ -32,6 +35,9 @@ const AlquileresList = () => {
     
     const [isLoading, setIsLoading] = useState(true);
     const [filtroCliente, setFiltroCliente] = useState("");
+    // Cursor de la próxima página (null si ya se cargó todo)
+    const [siguiente, setSiguiente] = useState(null);
+    const [cargandoMas, setCargandoMas] = useState(false);
 
     // Modales
     const [formVisible, setFormVisible] = useState(false);
@@ -46,15 +52,23 @@ const AlquileresList = () => {
         fechaFin: ''
     });
 
+    // El filtro por cliente se resuelve en el backend
+    const filtrosAlquileres = () => (filtroCliente ? { cliente_id: filtroCliente } : {});
+
+    const loadAlquileres = async () => {
+        const pagina = await getAlquileres({ ...filtrosAlquileres(), limit: PAGE_SIZE });
+        setAlquileres(pagina.items);
+        setSiguiente(pagina.siguiente);
+    };
+
     const loadData = async () => {
         try {
-            const [alqData, cliData, vehData, empData] = await Promise.all([
-                getAlquileres(),
+            const [, cliData, vehData, empData] = await Promise.all([
+                loadAlquileres(),
                 getClientes(),
                 listarVehiculos(),
                 getEmpleados()
             ]);
-            setAlquileres(alqData);
             setClientes(cliData);
             setVehiculos(vehData);
             setEmpleados(empData);
@@ -69,6 +83,24 @@ const AlquileresList = () => {
         loadData();
     }, []);
 
+    useEffect(() => {
+        if (isLoading) return;
+        loadAlquileres().catch((error) => console.error("Error filtrando alquileres:", error));
+    }, [filtroCliente]);
+
+    const handleCargarMas = async () => {
+        setCargandoMas(true);
+        try {
+            const pagina = await getAlquileres({ ...filtrosAlquileres(), limit: PAGE_SIZE, after_id: siguiente });
+            setAlquileres((prev) => [...prev, ...pagina.items]);
+            setSiguiente(pagina.siguiente);
+        } catch (error) {
+            console.error("Error cargando más alquileres:", error);
+        } finally {
+            setCargandoMas(false);
+        }
+    };
+
     const getMinDateTime = () => {
         const now = new Date();
         now.setMinutes(now.getMinutes() - now.getTimezoneOffset());
@@ -181,11 +213,6 @@ const AlquileresList = () => {
         return 'bg-gray-100 text-gray-800';
     };
 
-    const alquileresFiltrados = alquileres.filter((alquiler) => {
-        if (!filtroCliente) return true;
-        return alquiler.cliente_id === parseInt(filtroCliente);
-    });
-
     if (isLoading) return <div className="text-center p-10 font-medium text-gray-500">Cargando transacciones...</div>;
 
     return (
@@ -237,8 +264,8 @@ const AlquileresList = () => {
                             </tr>
                         </thead>
                         <tbody className="bg-white divide-y divide-gray-200 text-sm">
-                            {alquileresFiltrados.length > 0 ? (
-                                alquileresFiltrados.map((a) => {
+                            {alquileres.length > 0 ? (
+                                alquileres.map((a) => {
                                     const estadoUpper = a.estado.toUpperCase();
                                     const esActivo = estadoUpper.includes('CURSO') || estadoUpper.includes('PENDIENTE');
                                     const esEnCurso = estadoUpper.includes('CURSO');
@@ -303,6 +330,17 @@ const AlquileresList = () => {
                         </tbody>
                     </table>
                 </div>
+                {siguiente && (
+                    <div className="px-6 py-4 border-t border-gray-200 text-center">
+                        <button
+                            onClick={handleCargarMas}
+                            disabled={cargandoMas}
+                            className="text-indigo-600 hover:text-indigo-800 font-medium text-sm disabled:opacity-50"
+                        >
+                            {cargandoMas ? 'Cargando...' : 'Cargar más'}
+                        </button>
+                    </div>
+                )}
             </div>
 
             {/* MODAL FORMULARIO (Se mantiene igual que antes) */}
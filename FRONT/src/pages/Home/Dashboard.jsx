@@ -6,8 +6,7 @@ import {
     KeyIcon, 
     ClockIcon 
 } from '@heroicons/react/24/solid';
-import { listarVehiculos } from '../../services/vehiculoService';
-import { getAlquileres } from '../../services/alquilerService';
+import { getKpisDashboard } from '../../services/reporteService';
 
 const Dashboard = () => {
     const [stats, setStats] = useState({
@@ -38,51 +37,15 @@ const Dashboard = () => {
 
     const cargarDatosDashboard = async () => {
         try {
-            // 1. Obtener datos en paralelo
-            const [vehiculos, alquileres] = await Promise.all([
-                listarVehiculos(),
-                getAlquileres()
-            ]);
-
-            // --- Lógica de Vehículos Disponibles ---
-            // Asumiendo que el estado 'Disponible' viene como string desde tu backend (routes.py)
-            const disponibles = vehiculos.filter(v => v.estado === 'Disponible').length;
-
-            // --- Lógica de Alquileres Activos ---
-            // Asumiendo que el estado es 'En curso'
-            const activos = alquileres.filter(a => a.estado === 'En curso').length;
-
-            // --- Lógica de Ingresos del Mes Actual ---
-            const fechaActual = new Date();
-            const mesActual = fechaActual.getMonth();
-            const anioActual = fechaActual.getFullYear();
-
-            const ingresos = alquileres.reduce((total, alquiler) => {
-                // Convertimos la fecha del string (YYYY-MM-DD HH:MM) a objeto Date
-                const fechaFin = new Date(alquiler.fecha_fin);
-                
-                // Sumamos solo si está finalizado y pertenece a este mes/año
-                // Nota: Ajusta 'Finalizado' si tu string es diferente
-                if (alquiler.estado === 'Finalizado' && 
-                    fechaFin.getMonth() === mesActual && 
-                    fechaFin.getFullYear() === anioActual) {
-                    return total + parseFloat(alquiler.costo_total || 0);
-                }
-                return total;
-            }, 0);
-
-            // --- Lógica de Actividad Reciente (Últimos 5) ---
-            // Ordenamos por ID descendente (asumiendo que ID mayor es más nuevo)
-            const recientes = [...alquileres]
-                .sort((a, b) => b.id - a.id)
-                .slice(0, 5);
+            // Los totales llegan ya agregados desde el backend (un solo request)
+            const kpis = await getKpisDashboard();
 
             setStats({
-                vehiculosDisponibles: disponibles,
-                alquileresActivos: activos,
-                ingresosMes: ingresos
+                vehiculosDisponibles: kpis.vehiculos_disponibles,
+                alquileresActivos: kpis.alquileres_activos,
+                ingresosMes: kpis.ingresos_mes
             });
-            setUltimosAlquileres(recientes);
+            setUltimosAlquileres(kpis.ultimos);
 
         } catch (error) {
             console.error("Error cargando dashboard:", error);
@@ -3,7 +3,7 @@ import {
     BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer,
     PieChart, Pie, Cell, LineChart, Line
 } from 'recharts';
-import { getRankingVehiculos, getFacturacionAnual, getReportePeriodo, getHistorialCliente } from '../../services/reporteService';
+import { getRankingVehiculos, getFacturacionAnual, getAnaliticaPeriodo, getHistorialCliente } from '../../services/reporteService';
 import { getClientes } from '../../services/clienteService';
 
 // Colores para el gráfico de torta
@@ -19,6 +19,7 @@ const Reportes = () => {
     // Estado para Reporte de Período (Líneas)
     const [periodoFechas, setPeriodoFechas] = useState({ desde: '2025-01-01', hasta: '2025-12-31' });
     const [lineasData, setLineasData] = useState([]);
+    const [analitica, setAnalitica] = useState(null);
 
     // Estado para Reporte de Cliente (Tabla)
     const [clientesList, setClientesList] = useState([]);
@@ -63,26 +64,13 @@ const Reportes = () => {
     };
 
     // --- 2. Lógica Período (Líneas) ---
-    // El backend devuelve una lista de alquileres raw. 
-    // Aquí los agrupamos por MES para el gráfico de líneas.
+    // El backend ya devuelve las series agregadas (por día, con media móvil),
+    // además de los totales del período: acá solo se grafican.
     const cargarGraficoLineas = async (e) => {
         if(e) e.preventDefault();
-        const rawData = await getReportePeriodo(periodoFechas.desde, periodoFechas.hasta);
-        
-        // Agrupación simple por mes (YYYY-MM)
-        const agrupado = {};
-        rawData.forEach(item => {
-            const fecha = item.FEC_INICIO.substring(0, 7); // "2025-01"
-            agrupado[fecha] = (agrupado[fecha] || 0) + 1;
-        });
-
-        // Convertir a array para Recharts
-        const chartData = Object.keys(agrupado).sort().map(key => ({
-            fecha: key,
-            cantidad: agrupado[key]
-        }));
-        
-        setLineasData(chartData);
+        const data = await getAnaliticaPeriodo(periodoFechas.desde, periodoFechas.hasta);
+        setAnalitica(data);
+        setLineasData(data.serie_diaria);
     };
 
     // --- 3. Lógica Cliente (Tabla) ---
@@ -220,6 +208,27 @@ const Reportes = () => {
                     </button>
                 </form>
 
+                {analitica && (
+                    <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
+                        <div className="bg-gray-50 rounded-lg p-3">
+                            <p className="text-xs text-gray-500">Alquileres</p>
+                            <p className="text-xl font-bold text-gray-800">{analitica.total_alquileres}</p>
+                        </div>
+                        <div className="bg-gray-50 rounded-lg p-3">
+                            <p className="text-xs text-gray-500">Ingresos</p>
+                            <p className="text-xl font-bold text-gray-800">{formatCurrency(analitica.ingresos_totales)}</p>
+                        </div>
+                        <div className="bg-gray-50 rounded-lg p-3">
+                            <p className="text-xs text-gray-500">Duración promedio</p>
+                            <p className="text-xl font-bold text-gray-800">{analitica.duracion_promedio_horas} h</p>
+                        </div>
+                        <div className="bg-gray-50 rounded-lg p-3">
+                            <p className="text-xs text-gray-500">Utilización de la flota</p>
+                            <p className="text-xl font-bold text-gray-800">{analitica.utilizacion_flota}%</p>
+                        </div>
+                    </div>
+                )}
+
                 <div className="h-72">
                     <ResponsiveContainer width="100%" height="100%">
                         <LineChart data={lineasData}>
@@ -236,12 +245,36 @@ const Reportes = () => {
                                 stroke="#10b981" 
                                 name="Cantidad de Alquileres" 
                                 strokeWidth={3} 
-                                dot={{ r: 4, fill: '#10b981', strokeWidth: 2, stroke: '#fff' }}
+                                dot={false}
                                 activeDot={{ r: 6 }}
                             />
+                            <Line 
+                                type="monotone" 
+                                dataKey="media_movil" 
+                                stroke="#6366f1" 
+                                name="Media móvil (7 días)" 
+                                strokeWidth={2} 
+                                strokeDasharray="5 5"
+                                dot={false}
+                            />
                         </LineChart>
                     </ResponsiveContainer>
                 </div>
+
+                {analitica && analitica.ingresos_por_categoria.length > 0 && (
+                    <div className="h-64 mt-8">
+                        <h4 className="text-sm font-semibold text-gray-600 mb-2">Ingresos por Categoría</h4>
+                        <ResponsiveContainer width="100%" height="100%">
+                            <BarChart data={analitica.ingresos_por_categoria}>
+                                <CartesianGrid strokeDasharray="3 3" vertical={false} />
+                                <XAxis dataKey="categoria" axisLine={false} tickLine={false} />
+                                <YAxis axisLine={false} tickLine={false} tickFormatter={formatYAxis} />
+                                <Tooltip formatter={(value) => [formatCurrency(value), "Ingresos"]} />
+                                <Bar dataKey="ingresos" fill="#f59e0b" name="Ingresos" radius={[4, 4, 0, 0]} />
+                            </BarChart>
+                        </ResponsiveContainer>
+                    </div>
+                )}
             </div>
 
             {/* 4. LISTADO DETALLADO POR CLIENTE (TABLA) */}
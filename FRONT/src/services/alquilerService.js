@@ -3,9 +3,15 @@ import axios from 'axios';
 const ALQUILERES_URL = '/api/alquileres';
 const EMPLEADOS_URL = '/api/empleados';
 
-export const getAlquileres = async () => {
-    const response = await axios.get(ALQUILERES_URL);
-    return response.data;
+// Una página de alquileres. 'params' admite limit, after_id, estado, desde,
+// hasta, vehiculo_id, cliente_id y orden; 'siguiente' es el cursor de la
+// próxima página (null si no hay más).
+export const getAlquileres = async (params = {}) => {
+    const response = await axios.get(ALQUILERES_URL, { params });
+    return {
+        items: response.data,
+        siguiente: response.headers['x-siguiente'] ?? null
+    };
 };
 
 export const getAlquilerById = async (id) => {
@@ -24,6 +30,15 @@ export const crearAlquiler = async (alquilerData) => {
     return response.data;
 };
 
+// Alta de varios alquileres en una transacción. Responde { creados, resultados }
+// con un resultado por alquiler, en el mismo orden en que se enviaron.
+export const crearAlquileresLote = async (alquileres, todoONada = false) => {
+    const response = await axios.post(`${ALQUILERES_URL}/batch`, { alquileres, todoONada },
+        { validateStatus: (status) => status === 201 || status === 400 });
+    window.dispatchEvent(new Event("alquilerCreado"));
+    return response.data;
+};
+
 export const updateAlquiler = async (id, alquilerData) => {
     const response = await axios.put(`${ALQUILERES_URL}/${id}`, alquilerData);
     window.dispatchEvent(new Event("alquilerCreado"));
@@ -20,8 +20,28 @@ export const getReportePeriodo = async (desde, hasta) => {
     return response.data;
 };
 
+// 3b. Analítica del Período (series ya agregadas en el backend, sin filas sueltas)
+export const getAnaliticaPeriodo = async (desde, hasta, ventana = 7) => {
+    const response = await axios.get(`${API_URL}/analitica`, { params: { desde, hasta, ventana } });
+    return response.data;
+};
+
+// 3c. Utilización de la flota (horas ocupadas / disponibles, sin mantenimientos)
+export const getUtilizacionFlota = async (desde, hasta, categoria = null, top = 50) => {
+    const params = { desde, hasta, top };
+    if (categoria) params.categoria = categoria;
+    const response = await axios.get(`${API_URL}/utilizacion`, { params });
+    return response.data;
+};
+
 // 4. Historial por Cliente (Para el listado detallado)
 export const getHistorialCliente = async (idCliente) => {
     const response = await axios.get(`${API_URL}/cliente/${idCliente}`);
     return response.data;
-};
\ No newline at end of file
+};
+
+// 5. KPIs del Dashboard (totales ya calculados en el backend + últimos movimientos)
+export const getKpisDashboard = async () => {
+    const response = await axios.get('/api/dashboard/kpis');
+    return response.data;
+};
@@ -48,6 +48,16 @@ export const actualizarVehiculo = async (idVehiculo, data) => {
     return response.data;
 };
 
+// Vehículos libres en un rango de fechas, ordenados por costo diario.
+// 'params' admite desde, hasta, categoria, max_costo, limit y after_id.
+export const getVehiculosDisponibles = async (params) => {
+    const response = await axios.get(`${VEHICULOS_URL}/disponibles`, { params });
+    return {
+        items: response.data,
+        siguiente: response.headers['x-siguiente'] ?? null
+    };
+};
+
 export const getVehiculoById = async (id) => {
     const response = await axios.get(`${VEHICULOS_URL}/${id}`);
     return response.data;
@@ -0,0 +1,207 @@
+"""
+Prueba de carga HTTP contra la API: varios procesos cliente, cada uno con
+varios hilos, piden en bucle un conjunto de rutas GET durante un tiempo fijo
+y se informan requests por segundo y latencias.
+
+Uso (desde la raíz del proyecto):
+    # contra un servidor ya levantado
+    python -m benchmarks.carga --url http://127.0.0.1:5000 --duracion 15
+
+    # escalado: levanta BACK.servidor con 1, 2, 4... workers y compara
+    DB_NAME=alquiler_autos_bench python -m benchmarks.carga --escalar 1,2,4,8
+
+    # por proceso: un worker sync (hilos) contra un worker async (BACK/routes_async.py)
+    DB_NAME=alquiler_autos_bench python -m benchmarks.carga --comparar-async --hilos 32
+
+Sólo usa la biblioteca estándar del lado del cliente. Para que el cliente no
+sea el cuello de botella conviene correrlo en otra máquina, o al menos con
+tantos procesos cliente como núcleos (--procesos).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+RUTAS_POR_DEFECTO = [
+    '/api/vehiculos',
+    '/api/alquileres',
+    '/api/dashboard/kpis',
+    '/api/reportes/ranking',
+    '/api/categoria',
+]
+
+
+# ----------------------------------------------------------
+#   CLIENTE
+# ----------------------------------------------------------
+def _proceso_cliente(url_base, rutas, duracion, hilos):
+    """Corre 'hilos' hilos pidiendo las rutas en ronda. Retorna (latencias_ms, errores)."""
+    latencias = []
+    errores = [0]
+    lock = threading.Lock()
+    fin = time.monotonic() + duracion
+
+    def hilo(desfase):
+        propias = []
+        fallidas = 0
+        i = desfase
+        while time.monotonic() < fin:
+            inicio = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url_base + rutas[i % len(rutas)], timeout=30) as respuesta:
+                    respuesta.read()
+                propias.append((time.perf_counter() - inicio) * 1000)
+            except (urllib.error.URLError, OSError):
+                fallidas += 1
+            i += 1
+        with lock:
+            latencias.extend(propias)
+            errores[0] += fallidas
+
+    hilos_cliente = [threading.Thread(target=hilo, args=(n,)) for n in range(hilos)]
+    for h in hilos_cliente:
+        h.start()
+    for h in hilos_cliente:
+        h.join()
+    return latencias, errores[0]
+
+
+def medir(url_base, rutas, duracion, procesos, hilos):
+    """Carga con procesos × hilos clientes. Retorna el resumen de la corrida."""
+    with multiprocessing.Pool(procesos) as pool:
+        resultados = pool.starmap(_proceso_cliente, [(url_base, rutas, duracion, hilos)] * procesos)
+
+    latencias = sorted(l for parcial, _ in resultados for l in parcial)
+    errores = sum(e for _, e in resultados)
+    if not latencias:
+        return {'requests': 0, 'errores': errores, 'rps': 0.0}
+
+    def percentil(p):
+        return round(latencias[min(len(latencias) - 1, int(p / 100 * len(latencias)))], 2)
+
+    return {
+        'requests': len(latencias),
+        'errores': errores,
+        'rps': round(len(latencias) / duracion, 1),
+        'p50_ms': round(statistics.median(latencias), 2),
+        'p95_ms': percentil(95),
+        'p99_ms': percentil(99),
+    }
+
+
+# ----------------------------------------------------------
+#   SERVIDOR (MODOS ESCALADO Y COMPARACIÓN ASYNC)
+# ----------------------------------------------------------
+def _esperar_servidor(url_base, limite=60):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        try:
+            with urllib.request.urlopen(url_base + '/api/_pool', timeout=2):
+                return True
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    return False
+
+
+def _medir_servidor(comando, bind, rutas, duracion, procesos, hilos):
+    """Levanta el servidor con 'comando', lo mide y lo apaga."""
+    servidor = subprocess.Popen(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url_base = f"http://{bind}"
+        if not _esperar_servidor(url_base):
+            raise RuntimeError(f"El servidor no respondió: {' '.join(comando)}")
+        # Una pasada corta para precalentar pools y caches de todos los workers
+        medir(url_base, rutas, 2, procesos, hilos)
+        return medir(url_base, rutas, duracion, procesos, hilos)
+    finally:
+        servidor.terminate()   # SIGTERM: apagado ordenado de gunicorn / hypercorn
+        servidor.wait(timeout=60)
+
+
+def medir_con_workers(workers, hilos_servidor, puerto, rutas, duracion, procesos, hilos):
+    bind = f"127.0.0.1:{puerto}"
+    comando = [sys.executable, '-m', 'BACK.servidor', '--workers', str(workers),
+               '--threads', str(hilos_servidor), '--bind', bind]
+    return _medir_servidor(comando, bind, rutas, duracion, procesos, hilos)
+
+
+def medir_async(workers, puerto, rutas, duracion, procesos, hilos):
+    """Igual que medir_con_workers, con la app Quart + aiomysql servida por hypercorn."""
+    bind = f"127.0.0.1:{puerto}"
+    comando = [sys.executable, '-m', 'hypercorn', '--workers', str(workers),
+               '--bind', bind, 'BACK.routes_async:app']
+    return _medir_servidor(comando, bind, rutas, duracion, procesos, hilos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga HTTP de la API.")
+    parser.add_argument('--url', help="servidor ya levantado (por ejemplo http://127.0.0.1:5000)")
+    parser.add_argument('--escalar', help="lista de cantidades de workers a probar, por ejemplo 1,2,4")
+    parser.add_argument('--comparar-async', action='store_true',
+                        help="compara un worker sync con un worker async (requiere aiomysql, quart e hypercorn)")
+    parser.add_argument('--hilos-servidor', type=int, default=4,
+                        help="hilos por worker sync en --escalar y --comparar-async")
+    parser.add_argument('--puerto', type=int, default=5077, help="puerto para --escalar y --comparar-async")
+    parser.add_argument('--duracion', type=float, default=10.0, help="segundos de carga por corrida")
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1, help="procesos cliente")
+    parser.add_argument('--hilos', type=int, default=8, help="hilos por proceso cliente")
+    parser.add_argument('--rutas', nargs='+', default=RUTAS_POR_DEFECTO)
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    if [bool(args.url), bool(args.escalar), args.comparar_async].count(True) != 1:
+        parser.error("Indique --url, --escalar o --comparar-async (uno solo).")
+
+    if args.url:
+        resultados = {'servidor': args.url,
+                      'medicion': medir(args.url.rstrip('/'), args.rutas, args.duracion, args.procesos, args.hilos)}
+        m = resultados['medicion']
+        print(f"{m['rps']} req/s  p50 {m.get('p50_ms', '-')} ms  p95 {m.get('p95_ms', '-')} ms  "
+              f"p99 {m.get('p99_ms', '-')} ms  ({m['requests']} ok, {m['errores']} errores)")
+    elif args.comparar_async:
+        # Misma carga contra un único proceso de cada tipo: lo que se compara es
+        # cuántos requests concurrentes sostiene un proceso, no la escala en núcleos
+        resultados = {'hilos_servidor': args.hilos_servidor,
+                      'clientes_concurrentes': args.procesos * args.hilos, 'corridas': {}}
+        print(f"{'servidor':>8} {'req/s':>10} {'x':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errores':>8}")
+        corridas = [
+            ('sync', lambda: medir_con_workers(1, args.hilos_servidor, args.puerto, args.rutas,
+                                               args.duracion, args.procesos, args.hilos)),
+            ('async', lambda: medir_async(1, args.puerto, args.rutas,
+                                          args.duracion, args.procesos, args.hilos)),
+        ]
+        base = None
+        for nombre, correr in corridas:
+            m = correr()
+            resultados['corridas'][nombre] = m
+            base = base or m['rps'] or None
+            aceleracion = f"{m['rps'] / base:.2f}" if base else '-'
+            print(f"{nombre:>8} {m['rps']:>10} {aceleracion:>6} {m.get('p50_ms', '-'):>9} "
+                  f"{m.get('p95_ms', '-'):>9} {m.get('p99_ms', '-'):>9} {m['errores']:>8}")
+    else:
+        resultados = {'nucleos': os.cpu_count(), 'hilos_servidor': args.hilos_servidor, 'corridas': {}}
+        base = None
+        print(f"{'workers':>8} {'req/s':>10} {'x':>6} {'p50 ms':>9} {'p95 ms':>9} {'errores':>8}")
+        for workers in (int(w) for w in args.escalar.split(',')):
+            m = medir_con_workers(workers, args.hilos_servidor, args.puerto, args.rutas,
+                                  args.duracion, args.procesos, args.hilos)
+            resultados['corridas'][workers] = m
+            base = base or m['rps'] or None
+            aceleracion = f"{m['rps'] / base:.2f}" if base else '-'
+            print(f"{workers:>8} {m['rps']:>10} {aceleracion:>6} {m.get('p50_ms', '-'):>9} "
+                  f"{m.get('p95_ms', '-'):>9} {m['errores']:>8}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
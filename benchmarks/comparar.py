@@ -0,0 +1,62 @@
+"""
+Compara dos corridas de benchmarks/ejecutar.py por la mediana de cada caso.
+
+Uso:
+    python -m benchmarks.comparar base.json nueva.json [--umbral 20]
+
+Sale con código 1 si algún caso empeoró más que el umbral (en %).
+"""
+import argparse
+import json
+import sys
+
+
+def cargar(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(base, nueva, umbral):
+    """Retorna las filas (caso, base_ms, nueva_ms, variacion_%) y los casos que empeoraron."""
+    filas = []
+    regresiones = []
+    for caso, medicion in nueva['resultados'].items():
+        anterior = base['resultados'].get(caso)
+        if anterior is None:
+            filas.append((caso, None, medicion['mediana_ms'], None))
+            continue
+        variacion = ((medicion['mediana_ms'] - anterior['mediana_ms'])
+                     / anterior['mediana_ms'] * 100 if anterior['mediana_ms'] else 0.0)
+        filas.append((caso, anterior['mediana_ms'], medicion['mediana_ms'], variacion))
+        if variacion > umbral:
+            regresiones.append(caso)
+    return filas, regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dos resultados de benchmarks.")
+    parser.add_argument('base')
+    parser.add_argument('nueva')
+    parser.add_argument('--umbral', type=float, default=20.0,
+                        help="porcentaje de empeoramiento tolerado (por defecto 20)")
+    args = parser.parse_args()
+
+    base, nueva = cargar(args.base), cargar(args.nueva)
+    if base['meta']['escala'] != nueva['meta']['escala']:
+        print(f"⚠️ Las escalas difieren: {base['meta']['escala']} vs {nueva['meta']['escala']}")
+
+    filas, regresiones = comparar(base, nueva, args.umbral)
+    for caso, antes, despues, variacion in filas:
+        if antes is None:
+            print(f"{caso:<60} {'-':>10} {despues:>10.2f} ms   (nuevo)")
+        else:
+            marca = " ❌" if caso in regresiones else ""
+            print(f"{caso:<60} {antes:>10.2f} {despues:>10.2f} ms   {variacion:+7.1f}%{marca}")
+
+    if regresiones:
+        print(f"\n{len(regresiones)} caso(s) empeoraron más de {args.umbral:.0f}%.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
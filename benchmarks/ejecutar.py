@@ -0,0 +1,293 @@
+"""
+Mide los métodos de los managers y las rutas de la API contra el dataset
+sintético (ver benchmarks/generador.py) y guarda los tiempos en JSON.
+
+Uso (desde la raíz del proyecto):
+    DB_NAME=alquiler_autos_bench python -m benchmarks.ejecutar --escala 10k --generar
+    DB_NAME=alquiler_autos_bench python -m benchmarks.ejecutar --escala 10k --salida base.json
+
+Para comparar dos corridas: python -m benchmarks.comparar base.json nueva.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+from BACK.GestorReportes import GestorReportes
+from BD.db_conection import DBConnection
+from BD.manager.AlquilerManager import AlquilerManager
+from BD.manager.ClienteManager import ClienteManager
+from BD.manager.MantenimientoManager import MantenimientoManager
+from BD.manager.ReporteManager import ReporteManager
+from BD.manager.VehiculoManager import VehiculoManager
+
+from .generador import BD_PRINCIPAL, ESCALAS, GeneradorDatos
+
+# Por encima de esta escala no se miden los listados que traen la tabla entera
+LIMITE_LISTADOS_COMPLETOS = 100_000
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+
+
+# ----------------------------------------------------------
+#   MEDICIÓN
+# ----------------------------------------------------------
+def medir(funcion, repeticiones, calentamiento=1):
+    """Corre 'funcion' varias veces y retorna estadísticas en milisegundos."""
+    for _ in range(calentamiento):
+        funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    tiempos.sort()
+    return {
+        'repeticiones': repeticiones,
+        'min_ms': round(tiempos[0], 3),
+        'mediana_ms': round(statistics.median(tiempos), 3),
+        'p95_ms': round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        'max_ms': round(tiempos[-1], 3),
+    }
+
+
+class Contexto:
+    """Rangos de IDs del dataset y generador de argumentos reproducible."""
+
+    def __init__(self, escala, semilla):
+        self.escala = escala
+        self.rnd = random.Random(semilla)
+        self.rangos = {}
+
+        conn = DBConnection().get_connection()
+        cursor = conn.cursor()
+        try:
+            for tabla, columna in [('ALQUILER', 'ID_ALQUILER'), ('VEHICULO', 'ID_VEHICULO'),
+                                   ('CLIENTE', 'ID_CLIENTE'), ('EMPLEADO', 'ID_EMPLEADO')]:
+                cursor.execute(f"SELECT MIN({columna}) AS MINIMO, MAX({columna}) AS MAXIMO FROM {tabla}")
+                row = cursor.fetchone()
+                if row['MINIMO'] is None:
+                    raise RuntimeError(f"La tabla {tabla} está vacía: corra con --generar.")
+                self.rangos[tabla] = (row['MINIMO'], row['MAXIMO'])
+
+            cursor.execute("SELECT MIN(FEC_INICIO) AS DESDE, MAX(FEC_FIN) AS HASTA FROM ALQUILER")
+            row = cursor.fetchone()
+            self.fecha_desde, self.fecha_hasta = row['DESDE'], row['HASTA']
+        finally:
+            cursor.close()
+            conn.close()
+
+    def id_al_azar(self, tabla):
+        return self.rnd.randint(*self.rangos[tabla])
+
+    def rango_al_azar(self, dias):
+        """Un rango de 'dias' días dentro del período cubierto por el dataset."""
+        total = max(1, (self.fecha_hasta - self.fecha_desde).days - dias)
+        desde = self.fecha_desde + timedelta(days=self.rnd.randrange(total))
+        return desde, desde + timedelta(days=dias)
+
+
+# ----------------------------------------------------------
+#   CASOS: MANAGERS Y SERVICIO
+# ----------------------------------------------------------
+def casos_managers(ctx):
+    alquileres = AlquilerManager()
+    vehiculos = VehiculoManager()
+    clientes = ClienteManager()
+    mantenimientos = MantenimientoManager()
+    reportes = ReporteManager()
+
+    casos = {
+        'AlquilerManager.obtener_por_id':
+            lambda: alquileres.obtener_por_id(ctx.id_al_azar('ALQUILER')),
+        'AlquilerManager.listar_paginado':
+            lambda: alquileres.listar_paginado(limite=50),
+        'AlquilerManager.listar_paginado[estado]':
+            lambda: alquileres.listar_paginado(limite=50, id_estado=7),
+        'AlquilerManager.listar_paginado_proyeccion':
+            lambda: alquileres.listar_paginado_proyeccion(limite=50),
+        'AlquilerManager.listar_por_cliente':
+            lambda: alquileres.listar_por_cliente(ctx.id_al_azar('CLIENTE')),
+        'AlquilerManager.listar_activo_por_vehiculo':
+            lambda: alquileres.listar_activo_por_vehiculo(ctx.id_al_azar('VEHICULO')),
+        'VehiculoManager.obtener_por_id':
+            lambda: vehiculos.obtener_por_id(ctx.id_al_azar('VEHICULO')),
+        'VehiculoManager.obtener_por_ids[100]':
+            lambda: vehiculos.obtener_por_ids(ctx.id_al_azar('VEHICULO') for _ in range(100)),
+        'VehiculoManager.listar_todos':
+            vehiculos.listar_todos,
+        'VehiculoManager.listar_proyeccion':
+            vehiculos.listar_proyeccion,
+        'VehiculoManager.buscar_disponibles':
+            lambda: vehiculos.buscar_disponibles(*ctx.rango_al_azar(7)),
+        'MantenimientoManager.listar_por_vehiculo':
+            lambda: mantenimientos.listar_por_vehiculo(ctx.id_al_azar('VEHICULO')),
+        'ReporteManager.obtener_ranking_vehiculos':
+            reportes.obtener_ranking_vehiculos,
+        'ReporteManager.obtener_facturacion_mensual':
+            lambda: reportes.obtener_facturacion_mensual(ctx.fecha_hasta.year),
+        'ReporteManager.alquileres_por_periodo':
+            lambda: reportes.alquileres_por_periodo(*ctx.rango_al_azar(30)),
+        'ReporteManager.historial_cliente_detallado':
+            lambda: reportes.historial_cliente_detallado(ctx.id_al_azar('CLIENTE')),
+        'ReporteManager.obtener_kpis_dashboard':
+            lambda: reportes.obtener_kpis_dashboard(
+                *ctx.rango_al_azar(30), id_disponible=1, id_en_curso=7, id_finalizado=8),
+    }
+
+    if ctx.escala <= LIMITE_LISTADOS_COMPLETOS:
+        casos['AlquilerManager.listar_todos'] = alquileres.listar_todos
+        casos['ClienteManager.listar_todos'] = clientes.listar_todos
+
+    return casos
+
+
+def casos_servicio(ctx, sistema):
+    def registrar_sin_persistir():
+        # Se corre dentro de una unidad de trabajo que termina en rollback,
+        # así el dataset no cambia entre repeticiones
+        inicio = datetime.now() + timedelta(days=ctx.rnd.randint(400, 800))
+        with DBConnection.unidad_de_trabajo():
+            sistema.registrar_alquiler(
+                ctx.id_al_azar('VEHICULO'), ctx.id_al_azar('CLIENTE'), ctx.id_al_azar('EMPLEADO'),
+                inicio, inicio + timedelta(days=3))
+            DBConnection.marcar_rollback()
+
+    gestor_reportes = GestorReportes()
+
+    return {
+        'SistemaDeAlquiler.validar_disponibilidad_vehiculo':
+            lambda: sistema.validar_disponibilidad_vehiculo(ctx.id_al_azar('VEHICULO'), *ctx.rango_al_azar(5)),
+        'SistemaDeAlquiler.buscar_disponibles':
+            lambda: sistema.buscar_disponibles(*ctx.rango_al_azar(7)),
+        'SistemaDeAlquiler.registrar_alquiler[rollback]':
+            registrar_sin_persistir,
+        'GestorReportes.obtener_analitica_periodo[365d]':
+            lambda: gestor_reportes.obtener_analitica_periodo(*ctx.rango_al_azar(365)),
+        'GestorReportes.obtener_utilizacion[90d]':
+            lambda: gestor_reportes.obtener_utilizacion(*ctx.rango_al_azar(90), top_vehiculos=50),
+    }
+
+
+# ----------------------------------------------------------
+#   CASOS: RUTAS (TEST CLIENT DE FLASK)
+# ----------------------------------------------------------
+def casos_rutas(ctx, cliente):
+    def get(url_o_funcion):
+        def caso():
+            url = url_o_funcion() if callable(url_o_funcion) else url_o_funcion
+            respuesta = cliente.get(url)
+            if respuesta.status_code >= 500:
+                raise RuntimeError(f"GET {url} respondió {respuesta.status_code}")
+        return caso
+
+    def disponibles():
+        desde, hasta = ctx.rango_al_azar(7)
+        return (f"/api/vehiculos/disponibles?desde={desde:%Y-%m-%dT%H:%M}"
+                f"&hasta={hasta:%Y-%m-%dT%H:%M}")
+
+    casos = {
+        'GET /api/alquileres': get('/api/alquileres'),
+        'GET /api/alquileres?estado': get('/api/alquileres?estado=7'),
+        'GET /api/alquileres/<id>': get(lambda: f"/api/alquileres/{ctx.id_al_azar('ALQUILER')}"),
+        'GET /api/vehiculos': get('/api/vehiculos'),
+        'GET /api/vehiculos/<id>': get(lambda: f"/api/vehiculos/{ctx.id_al_azar('VEHICULO')}"),
+        'GET /api/vehiculos/disponibles': get(disponibles),
+        'GET /api/dashboard/kpis': get('/api/dashboard/kpis'),
+        'GET /api/reportes/ranking': get('/api/reportes/ranking'),
+        'GET /api/reportes/facturacion/<anio>': get(f"/api/reportes/facturacion/{ctx.fecha_hasta.year}"),
+        'GET /api/reportes/cliente/<id>': get(lambda: f"/api/reportes/cliente/{ctx.id_al_azar('CLIENTE')}"),
+    }
+
+    if ctx.escala <= LIMITE_LISTADOS_COMPLETOS:
+        casos['GET /api/clientes'] = get('/api/clientes')
+
+    return casos
+
+
+# ----------------------------------------------------------
+#   EJECUCIÓN
+# ----------------------------------------------------------
+def _commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de managers y rutas.")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='10k')
+    parser.add_argument('--semilla', type=int, default=13)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--generar', action='store_true', help="regenera el dataset antes de medir")
+    parser.add_argument('--solo', choices=['managers', 'servicio', 'rutas'], action='append',
+                        help="grupos a correr (por defecto todos)")
+    parser.add_argument('--salida', help="archivo JSON de resultados")
+    parser.add_argument('--forzar', action='store_true',
+                        help=f"permite correr contra la BD '{BD_PRINCIPAL}'")
+    args = parser.parse_args()
+
+    bd = DBConnection().config['database']
+    if bd == BD_PRINCIPAL and not args.forzar:
+        parser.error(f"La BD configurada es '{BD_PRINCIPAL}': use DB_NAME=<bd de prueba> o --forzar.")
+
+    escala = ESCALAS[args.escala]
+    if args.generar:
+        generador = GeneradorDatos(escala, semilla=args.semilla)
+        generador.limpiar()
+        generador.generar()
+
+    # Se importa recién ahora: al cargarse, routes.py precalienta el pool y los caches
+    from BACK.routes import app, sistema
+
+    ctx = Contexto(escala, args.semilla)
+    grupos = args.solo or ['managers', 'servicio', 'rutas']
+    casos = {}
+    if 'managers' in grupos:
+        casos.update({f"managers.{n}": f for n, f in casos_managers(ctx).items()})
+    if 'servicio' in grupos:
+        casos.update({f"servicio.{n}": f for n, f in casos_servicio(ctx, sistema).items()})
+    if 'rutas' in grupos:
+        cliente = app.test_client()
+        casos.update({f"rutas.{n}": f for n, f in casos_rutas(ctx, cliente).items()})
+
+    resultados = {}
+    for nombre, funcion in casos.items():
+        resultados[nombre] = medir(funcion, args.repeticiones)
+        print(f"{nombre:<60} mediana {resultados[nombre]['mediana_ms']:>10.2f} ms"
+              f"   p95 {resultados[nombre]['p95_ms']:>10.2f} ms")
+
+    informe = {
+        'meta': {
+            'escala': args.escala,
+            'semilla': args.semilla,
+            'repeticiones': args.repeticiones,
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit_actual(),
+            'python': platform.python_version(),
+            'bd': bd,
+        },
+        'resultados': resultados,
+    }
+
+    salida = args.salida
+    if salida is None:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS,
+                              f"{args.escala}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {salida}")
+
+
+if __name__ == '__main__':
+    main()
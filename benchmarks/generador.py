@@ -0,0 +1,293 @@
+"""
+Generador determinístico de datos sintéticos para los benchmarks.
+
+Con la misma semilla, escala y fecha de referencia genera siempre los mismos
+registros. La escala es la cantidad de ALQUILER; el resto de las tablas se
+dimensiona en proporción (ver PROPORCIONES).
+
+Uso (desde la raíz del proyecto, con una BD aparte para no pisar datos reales):
+    DB_NAME=alquiler_autos_bench python -m benchmarks.generador --escala 100k
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from BD.db_conection import DBConnection
+from BD.manager.ResumenFacturacionManager import ResumenFacturacionManager
+
+ESCALAS = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+# Filas de cada tabla por cada alquiler (con un mínimo para escalas chicas)
+PROPORCIONES = {
+    'CLIENTE': (1 / 10, 100),
+    'EMPLEADO': (1 / 2000, 10),
+    'VEHICULO': (1 / 100, 50),
+    'MANTENIMIENTO': (1 / 20, 10),
+    'INCIDENTE': (1 / 50, 10),
+}
+
+# Estados según los datos de referencia (ver BD/README.md)
+VEHICULO_DISPONIBLE, VEHICULO_EN_USO, VEHICULO_MANTENIMIENTO = 1, 2, 3
+ALQUILER_CANCELADO, ALQUILER_PENDIENTE, ALQUILER_EN_CURSO, ALQUILER_FINALIZADO = 5, 6, 7, 8
+
+# Tablas que genera el benchmark, en orden de borrado (respetando las FKs)
+TABLAS_GENERADAS = ['INCIDENTE', 'MANTENIMIENTO', 'ALQUILER', 'VEHICULO',
+                    'DETALLE_VEHICULO', 'EMPLEADO', 'CLIENTE']
+
+BD_PRINCIPAL = 'alquiler_autos'
+
+_MODELOS = ['Ford Fiesta', 'Toyota Corolla', 'Renault Duster', 'Toyota Hilux',
+            'Fiat Cronos', 'VW Gol', 'Peugeot 208', 'Chevrolet Onix', 'Jeep Renegade']
+_NOMBRES = ['Juan', 'María', 'Carlos', 'Ana', 'Lucía', 'Pedro', 'Sofía', 'Martín', 'Laura']
+_APELLIDOS = ['Pérez', 'López', 'Ruiz', 'Torres', 'Gómez', 'Díaz', 'Romero', 'Sosa']
+
+
+def cantidad(tabla, escala):
+    factor, minimo = PROPORCIONES[tabla]
+    return max(minimo, int(escala * factor))
+
+
+class GeneradorDatos:
+    """Carga CLIENTE, EMPLEADO, VEHICULO, ALQUILER, MANTENIMIENTO e INCIDENTE."""
+
+    def __init__(self, escala, semilla=13, fecha_referencia=datetime(2025, 6, 1), lote=5000):
+        self.escala = escala
+        self.semilla = semilla
+        # "Hoy" para el dataset: define qué alquileres quedan finalizados, en curso o pendientes
+        self.fecha_referencia = fecha_referencia
+        self.lote = lote
+        self.db_connection = DBConnection()
+
+    # ----------------------------------------------------------
+    #   UTILIDADES
+    # ----------------------------------------------------------
+    def __insertar(self, conn, cursor, sql, filas):
+        """Inserta en lotes con executemany (un INSERT multi-fila por lote)."""
+        total = 0
+        buffer = []
+        for fila in filas:
+            buffer.append(fila)
+            if len(buffer) >= self.lote:
+                cursor.executemany(sql, buffer)
+                conn.commit()
+                total += len(buffer)
+                buffer = []
+        if buffer:
+            cursor.executemany(sql, buffer)
+            conn.commit()
+            total += len(buffer)
+        return total
+
+    def __primer_id(self, cursor, tabla, columna, esperados):
+        """
+        Primer ID de la tabla recién cargada. La tabla se vació antes y la carga
+        es el único escritor, así que los IDs son consecutivos; se verifica igual.
+        """
+        cursor.execute(f"SELECT MIN({columna}) AS MINIMO, MAX({columna}) AS MAXIMO, "
+                       f"COUNT(*) AS CANTIDAD FROM {tabla}")
+        row = cursor.fetchone()
+        if row['CANTIDAD'] != esperados or row['MAXIMO'] - row['MINIMO'] + 1 != esperados:
+            raise RuntimeError(f"Los IDs de {tabla} no son consecutivos; vacíe la tabla y reintente.")
+        return row['MINIMO']
+
+    def __ids_referencia(self, cursor, tabla, columna):
+        cursor.execute(f"SELECT {columna} AS ID FROM {tabla} ORDER BY {columna}")
+        ids = [row['ID'] for row in cursor.fetchall()]
+        if not ids:
+            raise RuntimeError(f"La tabla {tabla} está vacía: cargue primero los datos de referencia.")
+        return ids
+
+    # ----------------------------------------------------------
+    #   LIMPIEZA
+    # ----------------------------------------------------------
+    def limpiar(self):
+        """Borra los datos de las tablas generadas (no toca las de referencia)."""
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        try:
+            for tabla in TABLAS_GENERADAS:
+                cursor.execute(f"DELETE FROM {tabla}")
+                conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    # ----------------------------------------------------------
+    #   GENERACIÓN
+    # ----------------------------------------------------------
+    def generar(self):
+        """Genera el dataset completo. Retorna {tabla: filas_insertadas}."""
+        rnd = random.Random(self.semilla)
+        conn = self.db_connection.get_connection()
+        cursor = conn.cursor()
+        totales = {}
+
+        try:
+            categorias = self.__ids_referencia(cursor, 'CATEGORIA', 'ID_CATEGORIA')
+            tipos_mantenimiento = self.__ids_referencia(cursor, 'TIPO_MANTENIMIENTO', 'ID_TIPO_MANTENIMIENTO')
+            tipos_incidente = self.__ids_referencia(cursor, 'TIPO_INCIDENTE', 'ID_TIPO_INCIDENTE')
+
+            # --- CLIENTE ---
+            n_clientes = cantidad('CLIENTE', self.escala)
+            totales['CLIENTE'] = self.__insertar(conn, cursor, """
+                INSERT INTO CLIENTE (NOMBRE, DNI, TELEFONO, MAIL) VALUES (%s, %s, %s, %s)
+            """, (
+                (f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}",
+                 str(40_000_000 + i),
+                 f"11{rnd.randrange(10**7, 10**8)}",
+                 f"cliente{i}@bench.example.com")
+                for i in range(n_clientes)
+            ))
+            primer_cliente = self.__primer_id(cursor, 'CLIENTE', 'ID_CLIENTE', n_clientes)
+
+            # --- EMPLEADO ---
+            n_empleados = cantidad('EMPLEADO', self.escala)
+            totales['EMPLEADO'] = self.__insertar(conn, cursor, """
+                INSERT INTO EMPLEADO (NOMBRE, DNI, MAIL) VALUES (%s, %s, %s)
+            """, (
+                (f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}",
+                 str(20_000_000 + i),
+                 f"empleado{i}@bench.example.com")
+                for i in range(n_empleados)
+            ))
+            primer_empleado = self.__primer_id(cursor, 'EMPLEADO', 'ID_EMPLEADO', n_empleados)
+
+            # --- DETALLE_VEHICULO + VEHICULO (un detalle por vehículo) ---
+            n_vehiculos = cantidad('VEHICULO', self.escala)
+            totales['DETALLE_VEHICULO'] = self.__insertar(conn, cursor, """
+                INSERT INTO DETALLE_VEHICULO (MODELO, `AÑO`, ID_CATEGORIA) VALUES (%s, %s, %s)
+            """, (
+                (rnd.choice(_MODELOS), rnd.randint(2012, 2025), rnd.choice(categorias))
+                for _ in range(n_vehiculos)
+            ))
+            primer_detalle = self.__primer_id(cursor, 'DETALLE_VEHICULO', 'ID_DETALLE_VEHICULO', n_vehiculos)
+
+            estados_vehiculo = ([VEHICULO_DISPONIBLE] * 8 + [VEHICULO_EN_USO] + [VEHICULO_MANTENIMIENTO])
+            costos = [rnd.choice(range(12_000, 40_001, 500)) for _ in range(n_vehiculos)]
+            totales['VEHICULO'] = self.__insertar(conn, cursor, """
+                INSERT INTO VEHICULO
+                    (ID_DETALLE_VEHICULO, ID_ESTADO, PATENTE, KILOMETRAJE, COSTO_DIARIO_ALQUILER)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (
+                (primer_detalle + i, rnd.choice(estados_vehiculo), f"BN{i:06d}",
+                 rnd.randint(0, 250_000), costos[i])
+                for i in range(n_vehiculos)
+            ))
+            primer_vehiculo = self.__primer_id(cursor, 'VEHICULO', 'ID_VEHICULO', n_vehiculos)
+
+            # --- ALQUILER: una línea de tiempo sin superposiciones por vehículo ---
+            # Se anotan al pasar los alquileres que van a tener incidentes (por posición)
+            incidentes = []
+            p_incidente = cantidad('INCIDENTE', self.escala) / self.escala
+
+            def alquileres():
+                por_vehiculo = self.escala // n_vehiculos
+                sobrantes = self.escala % n_vehiculos
+                posicion = 0
+                for v in range(n_vehiculos):
+                    n = por_vehiculo + (1 if v < sobrantes else 0)
+                    # Cada alquiler (con el hueco previo) ocupa ~8.5 días en promedio;
+                    # la línea termina cerca de un mes después de la fecha de
+                    # referencia, así hay alquileres en curso y reservas futuras
+                    fecha = self.fecha_referencia - timedelta(days=8.5 * n - 30)
+                    for _ in range(n):
+                        fecha += timedelta(days=rnd.randint(0, 5), hours=rnd.randint(0, 23))
+                        dias = rnd.randint(1, 10)
+                        fin = fecha + timedelta(days=dias)
+
+                        if fin <= self.fecha_referencia:
+                            estado = ALQUILER_CANCELADO if rnd.random() < 0.1 else ALQUILER_FINALIZADO
+                        elif fecha <= self.fecha_referencia:
+                            estado = ALQUILER_EN_CURSO
+                        else:
+                            estado = ALQUILER_PENDIENTE
+
+                        if rnd.random() < p_incidente:
+                            incidentes.append((posicion, fecha + (fin - fecha) / 2))
+
+                        yield (primer_vehiculo + v,
+                               primer_empleado + rnd.randrange(n_empleados),
+                               primer_cliente + rnd.randrange(n_clientes),
+                               fecha, fin, (dias + 1) * costos[v], estado)
+                        fecha = fin
+                        posicion += 1
+
+            totales['ALQUILER'] = self.__insertar(conn, cursor, """
+                INSERT INTO ALQUILER
+                    (ID_VEHICULO, ID_EMPLEADO, ID_CLIENTE, FEC_INICIO, FEC_FIN, COSTO_TOTAL, ID_ESTADO)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, alquileres())
+            primer_alquiler = self.__primer_id(cursor, 'ALQUILER', 'ID_ALQUILER', self.escala)
+
+            # --- MANTENIMIENTO (los más recientes pueden seguir abiertos) ---
+            n_mantenimientos = cantidad('MANTENIMIENTO', self.escala)
+
+            def mantenimientos():
+                for _ in range(n_mantenimientos):
+                    inicio = self.fecha_referencia - timedelta(days=rnd.randint(0, 3 * 365),
+                                                               hours=rnd.randint(0, 23))
+                    fin = inicio + timedelta(days=rnd.randint(1, 7))
+                    yield (primer_vehiculo + rnd.randrange(n_vehiculos),
+                           rnd.choice(tipos_mantenimiento),
+                           inicio,
+                           None if fin > self.fecha_referencia else fin,
+                           rnd.randint(5_000, 300_000),
+                           "Generado por benchmark")
+
+            totales['MANTENIMIENTO'] = self.__insertar(conn, cursor, """
+                INSERT INTO MANTENIMIENTO
+                    (ID_VEHICULO, ID_TIPO_MANTENIMIENTO, FEC_INICIO, FEC_FIN, COSTO, OBSERVACION)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, mantenimientos())
+
+            # --- INCIDENTE ---
+            totales['INCIDENTE'] = self.__insertar(conn, cursor, """
+                INSERT INTO INCIDENTE (ID_TIPO_INCIDENTE, ID_ALQUILER, FEC_INCIDENTE, DESCRIPCION)
+                VALUES (%s, %s, %s, %s)
+            """, (
+                (rnd.choice(tipos_incidente), primer_alquiler + posicion, fecha, "Generado por benchmark")
+                for posicion, fecha in incidentes
+            ))
+
+            # --- Resumen de facturación, derivado de ALQUILER ---
+            totales['RESUMEN_FACTURACION_MENSUAL'] = ResumenFacturacionManager().reconstruir()
+            if totales['RESUMEN_FACTURACION_MENSUAL'] is None:
+                raise RuntimeError("No se pudo reconstruir RESUMEN_FACTURACION_MENSUAL.")
+
+            return totales
+
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el dataset sintético de los benchmarks.")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='10k')
+    parser.add_argument('--semilla', type=int, default=13)
+    parser.add_argument('--forzar', action='store_true',
+                        help=f"permite borrar y cargar datos en la BD '{BD_PRINCIPAL}'")
+    args = parser.parse_args()
+
+    bd = DBConnection().config['database']
+    if bd == BD_PRINCIPAL and not args.forzar:
+        parser.error(f"La BD configurada es '{BD_PRINCIPAL}': use DB_NAME=<bd de prueba> o --forzar.")
+
+    generador = GeneradorDatos(ESCALAS[args.escala], semilla=args.semilla)
+    inicio = time.perf_counter()
+    generador.limpiar()
+    totales = generador.generar()
+    segundos = time.perf_counter() - inicio
+
+    for tabla, filas in totales.items():
+        print(f"{tabla:<28} {filas:>10,}")
+    print(f"Dataset '{args.escala}' (semilla {args.semilla}) generado en {segundos:.1f}s en la BD '{bd}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Mide con tracemalloc la memoria que ocupa el resultado de
+AlquilerManager.listar_todos() sobre el dataset sintético, y cuántas
+instancias de cada modelo tiene el grafo frente a cuántas son distintas.
+
+Uso (desde la raíz del proyecto):
+    DB_NAME=alquiler_autos_bench python -m benchmarks.ejecutar --escala 100k --generar --solo managers
+    DB_NAME=alquiler_autos_bench python -m benchmarks.memoria --salida antes.json      # en el commit base
+    DB_NAME=alquiler_autos_bench python -m benchmarks.memoria --comparar antes.json    # en el commit nuevo
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from BD.db_conection import DBConnection
+from BD.manager.AlquilerManager import AlquilerManager
+
+from .ejecutar import _commit_actual
+from .generador import BD_PRINCIPAL
+
+MB = 1024 * 1024
+
+
+# ----------------------------------------------------------
+#   RECORRIDO DEL GRAFO
+# ----------------------------------------------------------
+def _atributos(obj):
+    """Atributos de una instancia de modelo, tenga __dict__ o __slots__."""
+    if hasattr(obj, '__dict__'):
+        return vars(obj).values()
+    return [getattr(obj, nombre, None) for nombre in getattr(type(obj), '__slots__', ())]
+
+
+def contar_instancias(alquileres):
+    """
+    {clase: {'referencias': n, 'distintas': m}} para los modelos alcanzables
+    desde los alquileres. Con objetos compartidos 'distintas' es mucho menor
+    que 'referencias'.
+    """
+    referencias = {}
+    vistos = set()
+    pendientes = list(alquileres)
+    while pendientes:
+        obj = pendientes.pop()
+        if obj is None or type(obj).__module__.split('.')[:2] != ['BACK', 'modelos']:
+            continue
+        clase = type(obj).__name__
+        conteo = referencias.setdefault(clase, {'referencias': 0, 'distintas': 0})
+        conteo['referencias'] += 1
+        if id(obj) in vistos:
+            continue
+        vistos.add(id(obj))
+        conteo['distintas'] += 1
+        pendientes.extend(_atributos(obj))
+    return referencias
+
+
+# ----------------------------------------------------------
+#   MEDICIÓN
+# ----------------------------------------------------------
+def medir():
+    manager = AlquilerManager()
+    # Primera carga fuera de la medición: llena el pool y el cache de referencias
+    manager.listar_todos()
+    gc.collect()
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    inicio = time.perf_counter()
+    alquileres = manager.listar_todos()
+    segundos = time.perf_counter() - inicio
+    gc.collect()
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    filas = len(alquileres)
+    retenido = actual - base
+    muestra = alquileres[0] if alquileres else None
+    return {
+        'filas': filas,
+        'retenido_bytes': retenido,
+        'pico_bytes': pico - base,
+        'bytes_por_alquiler': round(retenido / filas) if filas else None,
+        'segundos': round(segundos, 3),
+        'tamanio_instancia_alquiler': sys.getsizeof(muestra) if muestra else None,
+        'alquiler_con_dict': hasattr(muestra, '__dict__') if muestra else None,
+        'instancias': contar_instancias(alquileres),
+    }
+
+
+def _imprimir(resultado):
+    print(f"{resultado['filas']:,} alquileres: retenido {resultado['retenido_bytes'] / MB:.1f} MB "
+          f"({resultado['bytes_por_alquiler']} B/alquiler), pico {resultado['pico_bytes'] / MB:.1f} MB, "
+          f"{resultado['segundos']:.2f}s")
+    for clase, conteo in sorted(resultado['instancias'].items()):
+        print(f"  {clase:<25} {conteo['referencias']:>10,} referencias {conteo['distintas']:>10,} instancias")
+
+
+def _comparar(base, nueva):
+    print(f"\n{'':<22} {'base':>12} {'nueva':>12} {'variación':>10}")
+    for clave, etiqueta in [('retenido_bytes', 'retenido (MB)'), ('pico_bytes', 'pico (MB)')]:
+        antes, despues = base[clave] / MB, nueva[clave] / MB
+        print(f"{etiqueta:<22} {antes:>12.1f} {despues:>12.1f} {(despues - antes) / antes * 100:>+9.1f}%")
+    antes, despues = base['bytes_por_alquiler'], nueva['bytes_por_alquiler']
+    print(f"{'bytes por alquiler':<22} {antes:>12} {despues:>12} {(despues - antes) / antes * 100:>+9.1f}%")
+    if base['filas'] != nueva['filas']:
+        print(f"⚠️ Las cargas difieren: {base['filas']:,} vs {nueva['filas']:,} filas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de AlquilerManager.listar_todos().")
+    parser.add_argument('--salida', help="archivo JSON donde guardar el resultado")
+    parser.add_argument('--comparar', help="resultado JSON de otra corrida para comparar")
+    parser.add_argument('--forzar', action='store_true',
+                        help=f"permite correr contra la BD '{BD_PRINCIPAL}'")
+    args = parser.parse_args()
+
+    bd = DBConnection().config['database']
+    if bd == BD_PRINCIPAL and not args.forzar:
+        parser.error(f"La BD configurada es '{BD_PRINCIPAL}': use DB_NAME=<bd de prueba> o --forzar.")
+
+    resultado = medir()
+    _imprimir(resultado)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            _comparar(json.load(f)['resultado'], resultado)
+
+    if args.salida:
+        informe = {
+            'meta': {
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'commit': _commit_actual(),
+                'python': platform.python_version(),
+                'bd': bd,
+            },
+            'resultado': resultado,
+        }
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Compara la codificación de respuestas de la API: el proveedor JSON por
+defecto de Flask, ProveedorRespuestas (orjson) y MessagePack, sobre los
+datos reales de los endpoints de alquileres y de reportes. Informa la
+mediana del tiempo de codificación y el tamaño del cuerpo, sin comprimir y
+comprimido como lo haría BACK/compresion.py (gzip y, si está, brotli).
+
+Uso (desde la raíz del proyecto, con el dataset de benchmarks cargado):
+    pip install orjson msgpack
+    DB_NAME=alquiler_autos_bench python -m benchmarks.serializacion --salida serializacion.json
+"""
+import argparse
+import json
+import zlib
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from BACK import compresion, serializacion
+from BACK.GestorReportes import GestorReportes
+from BD.db_conection import DBConnection
+from BD.manager.AlquilerManager import AlquilerManager
+
+from .ejecutar import Contexto, medir
+from .generador import BD_PRINCIPAL, ESCALAS
+
+
+def cargas(ctx):
+    """Los cuerpos de respuesta a codificar: {endpoint: objeto}."""
+    alquileres = AlquilerManager()
+    reportes = GestorReportes()
+    desde, hasta = ctx.rango_al_azar(90)
+    return {
+        'GET /api/alquileres?limit=500': alquileres.listar_paginado_proyeccion(limite=500)[0],
+        'POST /api/reportes/periodo[90d]': reportes.obtener_reporte_periodo(desde, hasta),
+        'GET /api/reportes/cliente/<id>': reportes.obtener_historial_cliente(ctx.id_al_azar('CLIENTE')),
+        'GET /api/reportes/facturacion/<anio>': reportes.obtener_facturacion_anual(ctx.fecha_hasta.year),
+        'GET /api/dashboard/kpis': reportes.obtener_kpis_dashboard(),
+    }
+
+
+def codificadores():
+    app = Flask(__name__)
+    flask_json = DefaultJSONProvider(app)
+    codificadores = {'flask-json': lambda obj: flask_json.dumps(obj).encode()}
+    if serializacion.orjson is not None:
+        proveedor = serializacion.ProveedorRespuestas(app)
+        codificadores['orjson'] = lambda obj: proveedor.dumps(obj).encode()
+    else:
+        print("⚠️ orjson no está instalado: se omite.")
+    if serializacion.msgpack is not None:
+        codificadores['msgpack'] = serializacion.empaquetar
+    else:
+        print("⚠️ msgpack no está instalado: se omite.")
+    return codificadores
+
+
+def tamanios_comprimidos(datos):
+    """Bytes del cuerpo con gzip (y brotli) a los niveles por defecto del middleware."""
+    compresor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    tamanios = {'gzip': len(compresor.compress(datos) + compresor.flush())}
+    if compresion.brotli is not None:
+        tamanios['br'] = len(compresion.brotli.compress(datos, quality=4))
+    return tamanios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo y tamaño de codificación de respuestas.")
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='10k')
+    parser.add_argument('--semilla', type=int, default=13)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--salida', help="archivo JSON de resultados")
+    parser.add_argument('--forzar', action='store_true',
+                        help=f"permite correr contra la BD '{BD_PRINCIPAL}'")
+    args = parser.parse_args()
+
+    if DBConnection().config['database'] == BD_PRINCIPAL and not args.forzar:
+        parser.error(f"La BD configurada es '{BD_PRINCIPAL}': use DB_NAME=<bd de prueba> o --forzar.")
+
+    ctx = Contexto(ESCALAS[args.escala], args.semilla)
+    formatos = codificadores()
+    resultados = {}
+
+    for endpoint, cuerpo in cargas(ctx).items():
+        print(f"\n{endpoint} ({len(cuerpo) if isinstance(cuerpo, list) else 1} elemento(s))")
+        base = None
+        resultados[endpoint] = {}
+        for nombre, codificar in formatos.items():
+            medicion = medir(lambda: codificar(cuerpo), args.repeticiones)
+            datos = codificar(cuerpo)
+            medicion['bytes'] = len(datos)
+            medicion['bytes_comprimidos'] = tamanios_comprimidos(datos)
+            resultados[endpoint][nombre] = medicion
+            base = base or medicion
+            comprimidos = "  ".join(f"{c} {b:,}" for c, b in medicion['bytes_comprimidos'].items())
+            print(f"  {nombre:<12} mediana {medicion['mediana_ms']:>9.3f} ms "
+                  f"(x{base['mediana_ms'] / medicion['mediana_ms'] if medicion['mediana_ms'] else 0:>5.1f})"
+                  f"   {medicion['bytes']:>10,} bytes ({medicion['bytes'] / base['bytes'] * 100:>5.1f}%)"
+                  f"   {comprimidos}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()